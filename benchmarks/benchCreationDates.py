@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Worker count benchmark for concurrent creation_date harvesting
+
+Writes duplicate CDML headers to a temporary directory and times the
+trimModelList creation_date read (_mapWorkers over _readCreationDate) for a
+range of worker counts. Network filesystem latency is stood in for by a
+fixed delay per file open
+
+Usage:
+    python benchmarks/benchCreationDates.py [nFiles] [latencySeconds]
+
+|  PJD 18 Oct 2026  - Implemented
+"""
+import builtins, os, shutil, sys, tempfile, time
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from durolib import durolib as dd
+
+_header = ''.join(['<?xml version="1.0"?>\n<dataset id="tas" creation_date="2018-0',
+                   '%d-01T00:00:00Z">\n<axis id="time"/>\n</dataset>\n'])
+
+def writeFiles(dirPath,nFiles):
+    filePaths = []
+    for i in range(nFiles):
+        filePath = os.path.join(dirPath,''.join(['CMIP6.CMIP.historical.INST.MODEL.r1i1p1f1.mon.tas.atmos.glb-z1-gn.v2018010',
+                                                 str(i % 9+1),'.',str(i),'.xml']))
+        with open(filePath,'w') as f:
+            f.write(_header % (i % 9+1))
+        filePaths.append(filePath)
+    return filePaths
+
+def latentOpen(latency):
+    # Delay every open of a benchmark file, as on a high-latency mount
+    builtinOpen = builtins.open
+    def wrapped(file,*args,**kwargs):
+        if isinstance(file,str) and file.endswith('.xml'):
+            time.sleep(latency)
+        return builtinOpen(file,*args,**kwargs)
+    return builtinOpen,wrapped
+
+if __name__ == '__main__':
+    nFiles = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    dirPath = tempfile.mkdtemp()
+    try:
+        filePaths = writeFiles(dirPath,nFiles)
+        builtinOpen,wrapped = latentOpen(latency)
+        builtins.open = wrapped
+        try:
+            print('%8s %12s %10s' % ('workers','seconds','speedup'))
+            serial = None
+            for workers in (1,2,4,8,16,32):
+                startTime = time.perf_counter()
+                dd._mapWorkers(dd._readCreationDate,filePaths,workers)
+                elapsed = time.perf_counter()-startTime
+                serial = serial or elapsed
+                print('%8d %12.4f %10.2f' % (workers,elapsed,serial/elapsed))
+        finally:
+            builtins.open = builtinOpen
+    finally:
+        shutil.rmtree(dirPath)
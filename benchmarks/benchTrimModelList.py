@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark for durolib.trimModelList
+
+Times trimModelList on synthetic CMIP6 CDML listings of 10^3 to 10^6 files,
+the grouping is linear so time/file should stay roughly constant
+
+Usage:
+    python benchmarks/benchTrimModelList.py [maxPower]
+
+|  PJD 18 Oct 2026  - Implemented
+"""
+import os, sys, time
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from durolib.durolib import trimModelList
+
+def syntheticListing(n):
+    # n unique model/member keys, 50 members per model
+    return [''.join(['/work/cmip-dyn/CMIP6/CMIP/historical/atmos/mon/tas/CMIP6.CMIP.historical.INST.MODEL-',
+                     str(i//50),'.r',str(i % 50+1),'i1p1f1.mon.tas.atmos.glb-z1-gn.v20190101.0000000.0.xml'])
+            for i in range(n)]
+
+if __name__ == '__main__':
+    maxPower = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    print('%10s %12s %14s' % ('files','seconds','us/file'))
+    for power in range(3,maxPower+1):
+        fileList = syntheticListing(10**power)
+        startTime = time.perf_counter()
+        trimModelList(fileList)
+        elapsed = time.perf_counter()-startTime
+        print('%10d %12.4f %14.3f' % (10**power,elapsed,elapsed/10**power*1e6))
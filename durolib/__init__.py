@@ -1,5 +1,16 @@
 # Default imports
 from .durolib import *
-import colourLib
-import makeStericLib
-import oceanLib
+# Submodules depend on CDAT/seawater/scipy so are imported on first access
+import importlib as _importlib
+
+_submodules = ['colourLib','makeStericLib','oceanLib']
+
+def __getattr__(name):
+    if name in _submodules:
+        module = _importlib.import_module(''.join(['.',name]),__name__)
+        globals()[name] = module
+        return module
+    if name == 'durolib_egg_path':
+        from . import durolib as _durolib
+        return _durolib.durolib_egg_path
+    raise AttributeError(''.join(["module '",__name__,"' has no attribute '",name,"'"]))
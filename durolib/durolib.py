@@ -53,10 +53,31 @@ Paul J. Durack 27th May 2013
 |  PJD  2 Feb 2020  - Reverted urllib2 -> urllib change
 |  PJD 24 Jul 2020  - Updated readJsonCreateDict to take a second arg, the urlPrefix
 |  PJD 29 Jul 2020  - Updated readJsonCreateDict to correct case when urlPrefix not supplied
-|                   - TODO: Consider implementing multivariate polynomial regression:
-|                     https://github.com/mrocklin/multipolyfit
 |  PJD 11 Nov 2020  - Update for Py3 (getGitInfo, readJsonCreateDict)
 |  PJD 20 Jun 2023  - Updated getGitInfo to test gitTagErr.strip() == b'str' vs 'str' for py3
+|  PJD 18 Oct 2026  - Deferred numpy, CDAT, pkg_resources, ssl and urllib imports until first use
+|  PJD 18 Oct 2026  - Added makeBranchTimeStore, cmipBranchTime reads indexed binary store
+|  PJD 18 Oct 2026  - Added cmipBranchTimes ensemble (bulk) branch time query
+|  PJD 18 Oct 2026  - Added updateBranchTimeStore (CMIP6 branch times from file global attributes)
+|  PJD 18 Oct 2026  - Numeric functions (fitPolynomial, fixVarUnits, scrubNaNAndMask, writePacked) accept numpy arrays
+|  PJD 18 Oct 2026  - trimModelList groups duplicates with a dictionary (linear in number of files)
+|  PJD 18 Oct 2026  - Added readGlobalAttributes (header-only xml/netcdf reader) used by trimModelList
+|  PJD 18 Oct 2026  - Added workers argument to trimModelList and globAndTrim (concurrent creation_date reads)
+|  PJD 18 Oct 2026  - Added setMetadataCache (persistent global attribute cache keyed by path, mtime and size)
+|  PJD 18 Oct 2026  - Added parseDRS and parseDRSList (compiled DRS filename parser)
+|  PJD 18 Oct 2026  - Added makeCatalog and setCatalog, globAndTrim answers queries from the archive catalog
+|  PJD 18 Oct 2026  - Added refreshCatalog (incremental catalog update from directory mtimes)
+|  PJD 18 Oct 2026  - Added iterTrimModelList and iterTruncateVerInfo (streaming generators)
+|  PJD 18 Oct 2026  - Added FileCatalog (array-backed categorical file listing)
+|  PJD 18 Oct 2026  - Added convertRelTime (vectorised cdtime calendar conversion) used by santerTime
+|  PJD 18 Oct 2026  - makeCalendar computes times and bounds natively for any calendar (asAxis option)
+|  PJD 18 Oct 2026  - Added setCalendarCache (LRU cache of makeCalendar/fixInterpAxis arrays)
+|  PJD 18 Oct 2026  - daysBetween vectorised with calendar support (strptime call corrected)
+|  PJD 18 Oct 2026  - Added timeSlice (date range selection by binary search on time values)
+|  PJD 18 Oct 2026  - fitPolynomial fits any order over N-D fields (full=True returns coefficients and residuals)
+|  PJD 18 Oct 2026  - Added linearTrend (closed form per gridpoint trend, stderr and significance)
+|  PJD 18 Oct 2026  - Added fitPolynomialChunked (out-of-core tiled fitting for memmap/file fields)
+|  PJD 18 Oct 2026  - Added multiPolyFit (multivariate polynomial regression with interaction terms)
 
 This library contains all functions written to replicate matlab functionality in python
 
@@ -67,59 +88,143 @@ This library contains all functions written to replicate matlab functionality in
 from __future__ import print_function
 ## Import common modules ##
 # import pdb
-import calendar, code, datetime, errno, glob, inspect, json, os, pkg_resources, \
-       re, ssl, string, sys, time
-try:
-    from urllib2 import urlopen # py2
-except ImportError:
-    from urllib.request import urlopen # py3
+# Heavy dependencies (numpy, CDAT, pkg_resources, ssl, urllib, inspect ...) are
+# deferred until the function requiring them is first called, this keeps the
+# bare "import durolib" cheap for short batch jobs
+import collections, datetime, errno, glob, importlib, json, os, re, sys, \
+       threading, time
 #import matplotlib as plt
-import numpy as np
-import subprocess
 #import scipy as sp
-from numpy import isnan,shape
-from socket import gethostname
 # Consider modules listed in /work/durack1/Shared/130103_data_SteveGriffies/130523_mplib_tips/importNPB.py
 
-# Determine if local file or conda install
-#print 'sys.argv[0]:',os.path.realpath(sys.argv[0])
-#print '__file__:',os.path.realpath(__file__)
-if 'site-packages' in os.path.realpath(__file__):
-    durolib_egg_path = pkg_resources.resource_filename(pkg_resources.Requirement.parse('durolib'),'share/durolib/data')
-else:
-    #print os.path.realpath(__file__).split('/')[:-2]
-    #print os.path.join([os.path.realpath(__file__).split('/')[:-2],'data'])
-    srcPath = os.path.realpath(__file__).split('/')[:-2]
-    srcPath = os.path.join(*srcPath)
-    durolib_egg_path = os.path.join('/',srcPath,'data')
-#print durolib_egg_path
-
-# Move UV-CDAT packages into try block
-try:
-    import cdat_info
-    # Turn off cdat ping reporting - Does this speed up Spyder?
-    cdat_info.ping = False
-    import cdms2 as cdm
-    import cdtime as cdt
-    import cdutil as cdu
-    #import genutil as genu
-    import MV2 as mv
+#%% Lazy module loading
+class _LazyModule(object):
+    """
+    Documentation for _LazyModule:
+    -------
+    The _LazyModule class is a stand-in for a heavy module, the real module is
+    imported (and configured via an optional loader) on first attribute access
+
+    Usage:
+    ------
+        >>> np = _LazyModule('numpy')
+        >>> np.arange(3) ; # numpy is imported here
+    """
+    def __init__(self,name,loader=None):
+        self.__dict__['_name'] = name
+        self.__dict__['_loader'] = loader
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            if self._loader is not None:
+                module = self._loader()
+            else:
+                module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self,attr):
+        return getattr(self._load(),attr)
+
+    def __setattr__(self,attr,value):
+        setattr(self._load(),attr,value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        if self.__dict__['_module'] is None:
+            return ''.join(["<lazy module '",self._name,"' (not loaded)>"])
+        return repr(self.__dict__['_module'])
+
+def _loadCdms2():
+    # Move UV-CDAT packages into try block - now on first use of cdms2
+    try:
+        import cdat_info
+        # Turn off cdat ping reporting - Does this speed up Spyder?
+        cdat_info.ping = False
+    except ImportError:
+        print('* cdat_info not available, skipping UV-CDAT import *')
+    import cdms2
     ## Specify CDAT specific stuff ##
     # Set netcdf file criterion - turned on from default 0s
-    cdm.setCompressionWarnings(0) ; # Suppress warnings
-    cdm.setNetcdfShuffleFlag(0)
-    cdm.setNetcdfDeflateFlag(1)
-    cdm.setNetcdfDeflateLevelFlag(9)
+    cdms2.setCompressionWarnings(0) ; # Suppress warnings
+    cdms2.setNetcdfShuffleFlag(0)
+    cdms2.setNetcdfDeflateFlag(1)
+    cdms2.setNetcdfDeflateLevelFlag(9)
     # Hi compression: 1.4Gb file ; # Single salt variable
     # No compression: 5.6Gb ; Standard (compression/shuffling): 1.5Gb ; Hi compression w/ shuffling: 1.5Gb
-    cdm.setAutoBounds(1) ; # Ensure bounds on time and depth axes are generated
-    ##
-except:
-    print('* cdat_info not available, skipping UV-CDAT import *')
+    cdms2.setAutoBounds(1) ; # Ensure bounds on time and depth axes are generated
+    return cdms2
+
+def _loadCdatModule(name):
+    # Ensure cdms2 is configured before any dependent CDAT module is used
+    def loader():
+        cdm._load()
+        return importlib.import_module(name)
+    return loader
+
+np  = _LazyModule('numpy')
+cdm = _LazyModule('cdms2',_loadCdms2)
+cdt = _LazyModule('cdtime',_loadCdatModule('cdtime'))
+cdu = _LazyModule('cdutil',_loadCdatModule('cdutil'))
+#genu = _LazyModule('genutil',_loadCdatModule('genutil'))
+mv  = _LazyModule('MV2',_loadCdatModule('MV2'))
+
+# Determine if local file or conda install - resolved on first request
+#print 'sys.argv[0]:',os.path.realpath(sys.argv[0])
+#print '__file__:',os.path.realpath(__file__)
+_durolibDataPath = None
+def _getDataPath():
+    global _durolibDataPath
+    if _durolibDataPath is None:
+        if 'site-packages' in os.path.realpath(__file__):
+            import pkg_resources
+            _durolibDataPath = pkg_resources.resource_filename(pkg_resources.Requirement.parse('durolib'),'share/durolib/data')
+        else:
+            #print os.path.realpath(__file__).split('/')[:-2]
+            #print os.path.join([os.path.realpath(__file__).split('/')[:-2],'data'])
+            srcPath = os.path.realpath(__file__).split('/')[:-2]
+            srcPath = os.path.join(*srcPath)
+            _durolibDataPath = os.path.join('/',srcPath,'data')
+    #print _durolibDataPath
+    return _durolibDataPath
+
+def __getattr__(name):
+    # Preserve durolib_egg_path module attribute without paying for pkg_resources at import
+    if name == 'durolib_egg_path':
+        return _getDataPath()
+    raise AttributeError(''.join(["module '",__name__,"' has no attribute '",name,"'"]))
+
+#%% Array backend
+# Numeric functions accept either cdms2 variables or plain numpy (masked)
+# arrays. cdms2 input is split into numpy.ma data plus separate axis/attribute
+# metadata, the arithmetic runs on numpy and the result is redressed only at
+# the end. numpy input is returned as numpy and never touches CDAT
+def _isCdmsVariable(var):
+    # cdms2 TransientVariable/FileVariable carry axes and attributes
+    return hasattr(var,'getAxisList') and hasattr(var,'attributes')
+
+def _splitVariable(var):
+    # Return (numpy data, metadata) - metadata is None for numpy input
+    if _isCdmsVariable(var):
+        meta = {'id': var.id,'axes': var.getAxisList(),'attributes': dict(var.attributes)}
+        return np.ma.asarray(var),meta
+    if isinstance(var,np.ndarray):
+        return var,None
+    return np.asanyarray(var),None
+
+def _joinVariable(data,meta):
+    # Redress numpy data with split metadata (cdms2 only when metadata exists)
+    if meta is None:
+        return data
+    return cdm.createVariable(data,axes=meta['axes'],attributes=meta['attributes'],id=meta['id'])
 
 ## Define useful functions ##
  #%%
-def cmipBranchTime(model,experiment,r1i1p1):
+def cmipBranchTime(model,experiment,r1i1p1,storePath=None):
     """
     Documentation for cmipBranchTime():
     -------
@@ -128,47 +233,295 @@ def cmipBranchTime(model,experiment,r1i1p1):
 
     Author: Paul J. Durack : pauldurack@llnl.gov
 
+    Inputs:
+    -----
+
+    |  **model** - string model name (e.g. 'ACCESS1-0')
+    |  **experiment** - string experiment name (e.g. 'historical')
+    |  **r1i1p1** - string realisation identifier
+    |  **storePath <optional>** - string path to a branch time store, defaults
+    |    to the store distributed with durolib
+
+    Returns:
+    -------
+
+    |  **branchInfoDict** - dictionary {r1i1p1: {branch_time_relative: ...}}
+
     Usage:
     ------
         >>> from durolib import cmipBranchTime
-        >>> branchTime = cmipBranchTime('ACCESS1-0','historical,'r1i1p1')
+        >>> branchTime = cmipBranchTime('ACCESS1-0','historical','r1i1p1')
+        >>> branchTime = cmipBranchTime('CESM2','historical','r1i1p1f1',storePath='CMIP6.bts')
 
     Notes:
     -----
     - PJD 18 Jun 2018 - Implemented following existing historical database
-    - Currently only contains CMIP5 historical simulation branch information
-    """
-    # Load dictionary into memory
-    cmip5 = json.load(open(os.path.join(durolib_egg_path,'CMIP5BranchTimes.json'),'r'))
-    # Validate user input
-    cm5Models = ['model','ACCESS1-0','ACCESS1-3','BNU-ESM','CCSM4','CESM1-BGC',
-                 'CESM1-CAM5','CESM1-CAM5-1-FV2','CESM1-FASTCHEM','CESM1-WACCM',
-                 'CMCC-CESM','CMCC-CM','CMCC-CMS','CNRM-CM5','CSIRO-Mk3-6-0',
-                 'CanESM2','EC-EARTH','FGOALS-g2','FGOALS-s2','FIO-ESM','GFDL-CM3',
-                 'GFDL-ESM2M','GISS-E2-H-CC','GISS-E2-H','GISS-E2-R-CC','GISS-E2-R',
-                 'HadGEM2-AO','HadGEM2-CC','HadGEM2-ES','IPSL-CM5A-LR','IPSL-CM5A-MR',
-                 'IPSL-CM5B-LR','MIROC-ESM-CHEM','MIROC-ESM','MIROC4h','MIROC5',
-                 'MPI-ESM-LR','MPI-ESM-MR','MPI-ESM-P','MRI-CGCM3','NorESM1-M',
-                 'NorESM1-ME','bcc-csm1-1-m','bcc-csm1-1','inmcm4']
-    cm5Experiments = ['historical','historicalNat']
-    if model not in cm5Models:
-        print(''.join(['Model: ',model,' not a valid CMIP5 contributor']))
+    - PJD 18 Oct 2026 - Read from indexed binary store (see makeBranchTimeStore)
+      which is loaded once per process, rather than parsing json each call
+    - Distributed store contains CMIP5 historical simulation branch information,
+      CMIP6 entries can be added from file global attributes with updateBranchTimeStore
+    """
+    # Load store into memory - cached after first call
+    store = _loadBranchTimeStore(storePath)
+    if store is None:
+        return None
+    # Validate user input - names longer than the store key fields can not match
+    for name,value in zip(_branchTimeKeys,[model,experiment,r1i1p1]):
+        if len(value.encode('utf-8')) > store['records'].dtype[name].itemsize:
+            print(''.join(['** cmipBranchTime: ',name,' ',value,' longer than store field, exiting.. **']))
+            return None
+    if model not in store['models']:
+        print(''.join(['Model: ',model,' not a valid CMIP contributor (not currently indexed)']))
         return None
-    elif experiment not in cm5Experiments:
+    if (model,experiment) not in store['experiments'] and experiment == 'historicalNat':
+        experiment = 'historical' ; # Prior behaviour, historicalNat reports historical branch
+    if (model,experiment) not in store['experiments']:
         print(''.join(['Experiment: ',experiment,' not currently indexed']))
         return None
+    ind = store['index'].get((model,experiment,r1i1p1))
+    if ind is None:
+        print(''.join(['r1i1p1: ',r1i1p1,' not a valid ',model,' ',experiment,' simulation']))
+        return None
+    print(''.join(['Model: ',model,'; Exp: ',experiment,'; r1i1p1: ',r1i1p1,
+                   ' branch times found']))
+    branchInfoDict = {r1i1p1: _branchTimeRecordToDict(store['records'][ind])}
+
+    return branchInfoDict
+
+#%%
+def cmipBranchTimes(models,experiments=None,rips=None,storePath=None):
+    """
+    Documentation for cmipBranchTimes():
+    -------
+    The cmipBranchTimes() function is the ensemble version of cmipBranchTime,
+    returning branch information for many model/experiment/realisation
+    triples in a single call as a columnar (structured) numpy array
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **models** - list/array of model names, or a list of CMIP file paths
+    |    (e.g. trimModelList output) when experiments and rips are omitted
+    |  **experiments <optional>** - list/array of experiments, or single string,
+    |    None returns all indexed experiments (when rips is given)
+    |  **rips <optional>** - list/array of realisations, or single string, None
+    |    returns all indexed realisations (when experiments is given)
+    |  **storePath <optional>** - string path to a branch time store
+
+    Returns:
+    -------
+
+    |  **branchTimes** - structured array with fields model, experiment, rip,
+    |    branch_time_relative, branch_time_comp, branch_time_gregory,
+    |    parent_exp_rip, valid_method and valid (True where the member is indexed)
+
+    Usage:
+    ------
+        >>> from durolib import cmipBranchTimes
+        >>> bt = cmipBranchTimes(['ACCESS1-0','CCSM4'],'historical',['r1i1p1','r2i1p1'])
+        >>> bt = cmipBranchTimes(trimModelList(fileList))
+        >>> bt = cmipBranchTimes(['ACCESS1-0','CCSM4'],'historical') ; # All realisations
+        >>> bt['branch_time_relative'][bt['valid']]
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, lookups use a sorted key search over the
+      store rather than per-member dictionary walks; no per-member printing
+    - Names longer than the store key fields are never matched (valid False)
+    """
+    store = _loadBranchTimeStore(storePath)
+    if store is None:
+        return None
+    if experiments is None and rips is None:
+        models,experiments,rips = _fileListToMembers(models)
+    elif experiments is None or rips is None:
+        models,experiments,rips = _expandBranchTimeMembers(store['records'],models,experiments,rips)
+    models = np.atleast_1d(np.asarray(models,dtype=str))
+    experiments = np.asarray(experiments,dtype=str)
+    rips = np.asarray(rips,dtype=str)
+    models,experiments,rips = np.broadcast_arrays(models,experiments,rips)
+    records = store['records']
+
+    # Search sorted store keys, retrying historicalNat as historical (see cmipBranchTime)
+    storeKeys = _branchTimeKeyArray(store)
+    queryKeys = _branchTimeQueryKeys(records.dtype,models,experiments,rips)
+    ind,found = _searchSortedKeys(storeKeys,queryKeys)
+    # Names longer than the key fields would match on their truncated prefix
+    tooLong = np.zeros(len(models),dtype=bool)
+    for name,values in zip(_branchTimeKeys,[models,experiments,rips]):
+        tooLong |= np.char.str_len(np.char.encode(values,'utf-8')) > records.dtype[name].itemsize
+    found &= ~tooLong
+    retry = ~found & ~tooLong & (experiments == 'historicalNat')
+    if retry.any():
+        altKeys = _branchTimeQueryKeys(records.dtype,models[retry],
+                                       np.full(retry.sum(),'historical'),rips[retry])
+        altInd,altFound = _searchSortedKeys(storeKeys,altKeys)
+        ind[retry] = altInd
+        found[retry] = altFound
+
+    # Assemble columnar output
+    keyTypes = [''.join(['S',str(max(records.dtype[name].itemsize,
+                                     np.char.encode(values,'utf-8').dtype.itemsize))])
+                for name,values in zip(_branchTimeKeys,[models,experiments,rips])]
+    dtype = np.dtype([('model',keyTypes[0]),('experiment',keyTypes[1]),
+                      ('rip',keyTypes[2]),('branch_time_relative','f8'),
+                      ('branch_time_comp',records.dtype['branch_time_comp']),
+                      ('branch_time_gregory','f8'),
+                      ('parent_exp_rip',records.dtype['parent_exp_rip']),
+                      ('valid_method',records.dtype['valid']),('valid','?')])
+    branchTimes = np.zeros(len(models),dtype=dtype)
+    branchTimes['model'] = np.char.encode(models,'utf-8')
+    branchTimes['experiment'] = np.char.encode(experiments,'utf-8')
+    branchTimes['rip'] = np.char.encode(rips,'utf-8')
+    branchTimes['branch_time_relative'] = np.nan
+    branchTimes['branch_time_gregory'] = np.nan
+    matched = records[ind[found]]
+    for name in ['branch_time_relative','branch_time_comp','branch_time_gregory','parent_exp_rip']:
+        branchTimes[name][found] = matched[name]
+    branchTimes['valid_method'][found] = matched['valid']
+    branchTimes['valid'] = found
+
+    return branchTimes
+
+def _expandBranchTimeMembers(records,models,experiments,rips):
+    # Expand None experiments or rips to every indexed member, unmatched queries
+    # are kept as a single row with an empty field
+    given = experiments if rips is None else rips
+    givenName,openName = ('experiment','rip') if rips is None else ('rip','experiment')
+    models,given = np.broadcast_arrays(np.atleast_1d(np.asarray(models,dtype=str)),
+                                       np.asarray(given,dtype=str))
+    recordModels = np.char.decode(records['model'],'utf-8')
+    recordGiven = np.char.decode(records[givenName],'utf-8')
+    recordOpen = np.char.decode(records[openName],'utf-8')
+    outModels,outGiven,outOpen = [],[],[]
+    for model,value in zip(models,given):
+        matches = recordOpen[(recordModels == model) & (recordGiven == value)].tolist() or ['']
+        outModels += [model]*len(matches) ; outGiven += [value]*len(matches) ; outOpen += matches
+    if rips is None:
+        return outModels,outGiven,outOpen
+    return outModels,outOpen,outGiven
+
+def _branchTimeKeyArray(store):
+    # Fixed-width model+experiment+rip keys, byte order matches record sort order
+    if 'keys' not in store:
+        store['keys'] = _packKeyFields(store['records'],_branchTimeKeys)
+    return store['keys']
+
+def _branchTimeQueryKeys(dtype,models,experiments,rips):
+    query = np.zeros(len(models),dtype=[(k,dtype[k]) for k in _branchTimeKeys])
+    query['model'] = np.char.encode(models,'utf-8')
+    query['experiment'] = np.char.encode(experiments,'utf-8')
+    query['rip'] = np.char.encode(rips,'utf-8')
+    return _packKeyFields(query,_branchTimeKeys)
+
+def _packKeyFields(array,names):
+    # Concatenate fixed-width byte fields into a single S-type key per row
+    width = sum(array.dtype[k].itemsize for k in names)
+    keys = np.zeros(len(array),dtype=[(k,array.dtype[k]) for k in names])
+    for k in names:
+        keys[k] = array[k]
+    return keys.view(''.join(['S',str(width)]))
+
+def _searchSortedKeys(sortedKeys,queryKeys):
+    # Vectorised exact-match lookup, returns indices and found mask
+    ind = np.searchsorted(sortedKeys,queryKeys)
+    ind = np.minimum(ind,max(len(sortedKeys)-1,0))
+    if len(sortedKeys):
+        found = sortedKeys[ind] == queryKeys
     else:
-        experiment = 'historical'
-        branchInfo = cmip5.get('ACCESS1-0').get('historical')
-        if r1i1p1 not in branchInfo.keys():
-            print(''.join(['r1i1p1: ',r1i1p1,' not a valid ',model,' ',experiment,' simulation']))
-            return None
+        found = np.zeros(len(queryKeys),dtype=bool)
+    return ind,found
+
+def _fileListToMembers(fileList):
+    # Recover model, experiment and realisation from CMIP file names
+    records = parseDRSList(fileList)
+    return records['model'],records['experiment'],records['realisation']
+
+_branchTimeStoreMagic = b'DUROBTS\x00'
+_branchTimeStoreVersion = 2 ; # v2 adds parent_time_units and branch_time_in_child
+_branchTimeStoreName = 'CMIPBranchTimes.bts'
+_branchTimeKeys = ['model','experiment','rip']
+_branchTimeStoreDtype = [('model','S32'),('experiment','S32'),('rip','S16'),
+                         ('branch_time_relative','f8'),('branch_time_comp','S24'),
+                         ('branch_time_gregory','f8'),('parent_exp_rip','S48'),
+                         ('valid','S96'),('creation_date','S32'),('tracking_id','S64'),
+                         ('parent_time_units','S48'),('branch_time_in_child','f8')]
+_branchTimeStores = {}
+
+def _branchTimeStorePath(storePath=None):
+    # Default store ships in the durolib data directory, DUROLIB_BRANCHTIME_STORE
+    # points cmipBranchTime at a locally maintained store (see updateBranchTimeStore)
+    if storePath is None:
+        storePath = os.environ.get('DUROLIB_BRANCHTIME_STORE',
+                                   os.path.join(_getDataPath(),_branchTimeStoreName))
+    return storePath
+
+def _readBranchTimeStore(storePath):
+    # Read header and memory-map record block of a branch time store
+    import struct
+    with open(storePath,'rb') as f:
+        magic = f.read(len(_branchTimeStoreMagic))
+        if magic != _branchTimeStoreMagic:
+            raise IOError(''.join(['Not a durolib branch time store: ',storePath]))
+        headerLen = struct.unpack('<I',f.read(4))[0]
+        header = json.loads(f.read(headerLen).decode('utf-8'))
+    if header['version'] > _branchTimeStoreVersion:
+        raise IOError(''.join(['Branch time store version ',str(header['version']),
+                               ' newer than supported version ',str(_branchTimeStoreVersion)]))
+    dtype = np.dtype([tuple(x) for x in header['dtype']])
+    if header['count']:
+        records = np.memmap(storePath,dtype=dtype,mode='r',offset=header['offset'],
+                            shape=(header['count'],))
+    else:
+        records = np.zeros(0,dtype=dtype)
+    return header,records
+
+def _loadBranchTimeStore(storePath=None):
+    # Load (once per process) and index the branch time store, reloaded only
+    # if the file on disk is replaced
+    storePath = _branchTimeStorePath(storePath)
+    try:
+        stat = os.stat(storePath)
+    except OSError:
+        print(''.join(['** Branch time store not found: ',storePath,' **']))
+        return None
+    stamp = (stat.st_mtime,stat.st_size)
+    store = _branchTimeStores.get(storePath)
+    if store is not None and store['stamp'] == stamp:
+        return store
+    header,records = _readBranchTimeStore(storePath)
+    models = [x.decode('utf-8') for x in records['model']]
+    experiments = [x.decode('utf-8') for x in records['experiment']]
+    rips = [x.decode('utf-8') for x in records['rip']]
+    store = {'stamp': stamp, 'header': header, 'records': records,
+             'index': dict((key,ind) for ind,key in enumerate(zip(models,experiments,rips))),
+             'models': set(models), 'experiments': set(zip(models,experiments))}
+    _branchTimeStores[storePath] = store
+    return store
+
+def _branchTimeRecordToDict(record):
+    # Convert store record to json-style dictionary, '' marks missing values
+    recordDict = {}
+    for name in record.dtype.names:
+        if name in _branchTimeKeys:
+            continue
+        value = record[name]
+        if isinstance(value,bytes):
+            value = value.decode('utf-8')
+        elif np.isnan(value):
+            value = ''
         else:
-            print(''.join(['Model: ',model,'; Exp: ',experiment,'; r1i1p1: ',r1i1p1,
-                           ' branch times found']))
-            branchInfoDict = branchInfo
+            value = float(value)
+        recordDict[name] = value
+    return recordDict
 
-    return branchInfoDict
+def _branchTimeValue(value):
+    # json stores missing numeric values as ''
+    if value == '' or value is None:
+        return np.nan
+    return float(value)
 
 #%%
 def clearAll():
@@ -192,31 +545,444 @@ def clearAll():
         del globals()[uniquevariable]
 
 #%%
-def daysBetween(d1, d2):
+def convertRelTime(values,units,newUnits,calendar=None):
+    """
+    Documentation for convertRelTime(values,units,newUnits,calendar):
+    -------
+    The convertRelTime() function converts an array of relative time values
+    from units (e.g. 'days since 1850-1-1') to newUnits (e.g. 'months since
+    1800-1-1') in one vectorised pass, following cdtime reltime.torel
+
+    Supported calendars are those of the cdtime module, given as cdtime
+    constants or CF names:
+        GregorianCalendar - 'proleptic_gregorian' (default)
+        MixedCalendar - 'gregorian', 'standard', 'mixed'
+        JulianCalendar - 'julian'
+        NoLeapCalendar - 'noleap', '365_day'
+        Calendar360 - '360_day'
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Returns:
+    -------
+
+    |  **newValues** - numpy float64 array, same shape as values
+
+    Usage:
+    ------
+        >>> from durolib import convertRelTime
+        >>> convertRelTime(time[:],'days since 1850-1-1','months since 1800-1-1','noleap')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, units may be seconds, minutes, hours, days,
+      weeks, months, seasons or years; as cdtime month based units count whole
+      calendar months (the day within the month is ignored)
+    """
+    calendar = _calendarName(calendar)
+    values = np.asarray(values,dtype=np.float64)
+    unit,base = _parseTimeUnits(units)
+    newUnit,newBase = _parseTimeUnits(newUnits)
+    if unit in _timeUnitSeconds and newUnit in _timeUnitSeconds:
+        # Offset between base times, no component conversion required
+        baseDelta = _baseDays(base,calendar)-_baseDays(newBase,calendar)
+        return (baseDelta+values*(_timeUnitSeconds[unit]/86400.))*(86400./_timeUnitSeconds[newUnit])
+    days = _relTimeToDays(values,unit,base,calendar)
+    if newUnit in _timeUnitSeconds:
+        return (days-_baseDays(newBase,calendar))*(86400./_timeUnitSeconds[newUnit])
+    year,month,_ = _daysToComponent(np.floor(days).astype(np.int64),calendar)
+    months = 12*(year-newBase[0])+(month-newBase[1])
+    return months/float(_timeUnitMonths[newUnit])
+
+_timeUnitSeconds = {'seconds': 1.,'minutes': 60.,'hours': 3600.,'days': 86400.,'weeks': 604800.}
+_timeUnitMonths = {'months': 1,'seasons': 3,'years': 12}
+_timeUnitAliases = {'second': 'seconds','sec': 'seconds','secs': 'seconds','s': 'seconds',
+                    'minute': 'minutes','min': 'minutes','mins': 'minutes',
+                    'hour': 'hours','hr': 'hours','hrs': 'hours','h': 'hours',
+                    'day': 'days','d': 'days','week': 'weeks',
+                    'month': 'months','mon': 'months','season': 'seasons',
+                    'year': 'years','yr': 'years','yrs': 'years'}
+_timeUnitsTest = re.compile(r'^\s*(\w+)\s+since\s+(-?\d+)-(\d+)(?:-(\d+))?'
+                            r'(?:[ T]+(\d+)(?::(\d+)(?::(\d+(?:\.\d*)?))?)?)?')
+_calendarNames = {'proleptic_gregorian': 'proleptic_gregorian','gregorian': 'mixed',
+                  'standard': 'mixed','mixed': 'mixed','julian': 'julian','noleap': 'noleap',
+                  '365_day': 'noleap','360_day': '360_day'}
+_cdtimeCalendars = [('GregorianCalendar','proleptic_gregorian'),('MixedCalendar','mixed'),
+                    ('JulianCalendar','julian'),('NoLeapCalendar','noleap'),
+                    ('Calendar360','360_day')]
+_noLeapCumDays = [0,31,59,90,120,151,181,212,243,273,304,334,365]
+
+def _calendarName(calendar):
+    # cdtime calendar constant or CF calendar name to internal name
+    if calendar is None:
+        return 'proleptic_gregorian'
+    if isinstance(calendar,str):
+        name = _calendarNames.get(calendar.strip().lower())
+        if name is None:
+            raise ValueError(''.join(['Unsupported calendar: ',calendar]))
+        return name
+    for cdtName,name in _cdtimeCalendars:
+        if calendar == getattr(cdt,cdtName):
+            return name
+    raise ValueError(''.join(['Unsupported calendar: ',str(calendar)]))
+
+def _parseTimeUnits(units):
+    # 'days since 1850-1-1 12:00:00' to ('days',(1850,1,1,0.5))
+    match = _timeUnitsTest.match(units)
+    if match is None:
+        raise ValueError(''.join(['Invalid time units: ',units]))
+    unit = match.group(1).lower()
+    unit = _timeUnitAliases.get(unit,unit)
+    if unit not in _timeUnitSeconds and unit not in _timeUnitMonths:
+        raise ValueError(''.join(['Invalid time units: ',units]))
+    year,month,day,hour,minute,second = [match.group(i) for i in range(2,8)]
+    dayFraction = (float(hour or 0)*3600.+float(minute or 0)*60.+float(second or 0))/86400.
+    return unit,(int(year),int(month),int(day or 1),dayFraction)
+
+def _baseDays(base,calendar):
+    # Base time as (fractional) day number
+    return float(_componentToDays(base[0],base[1],base[2],calendar))+base[3]
+
+def _relTimeToDays(values,unit,base,calendar):
+    # Relative time values to (fractional) day numbers
+    if unit in _timeUnitSeconds:
+        return _baseDays(base,calendar)+values*(_timeUnitSeconds[unit]/86400.)
+    months = np.trunc(values*_timeUnitMonths[unit]).astype(np.int64)+(base[1]-1)
+    return _componentToDays(base[0]+months//12,months%12+1,base[2],calendar)+base[3]
+
+def _componentToDays(year,month,day,calendar):
+    # Calendar date (arrays) to integer day number (julian day number for the
+    # real world calendars)
+    year,month,day = [np.asarray(x,dtype=np.int64) for x in (year,month,day)]
+    if calendar == 'noleap':
+        return 365*year+np.asarray(_noLeapCumDays)[month-1]+day-1
+    if calendar == '360_day':
+        return 360*year+30*(month-1)+day-1
+    a = (14-month)//12
+    y = year+4800-a
+    m = month+12*a-3
+    days = day+(153*m+2)//5+365*y+y//4
+    gregorian = days-y//100+y//400-32045
+    julian = days-32083
+    if calendar == 'proleptic_gregorian':
+        return gregorian
+    if calendar == 'julian':
+        return julian
+    # Mixed - Julian before 1582-10-15
+    return np.where(year*10000+month*100+day >= 15821015,gregorian,julian)
+
+def _daysToComponent(days,calendar):
+    # Integer day numbers to (year, month, day) arrays
+    days = np.asarray(days,dtype=np.int64)
+    if calendar == 'noleap':
+        year,dayOfYear = days//365,days%365
+        month = np.searchsorted(_noLeapCumDays,dayOfYear,side='right')
+        return year,month,dayOfYear-np.asarray(_noLeapCumDays)[month-1]+1
+    if calendar == '360_day':
+        return days//360,(days%360)//30+1,days%30+1
+    if calendar == 'proleptic_gregorian':
+        gregorian = np.ones(days.shape,dtype=bool)
+    elif calendar == 'julian':
+        gregorian = np.zeros(days.shape,dtype=bool)
+    else:
+        gregorian = days >= 2299161 ; # 1582-10-15
+    a = days+32044
+    b = np.where(gregorian,(4*a+3)//146097,0)
+    c = np.where(gregorian,a-146097*b//4,days+32082)
+    d = (4*c+3)//1461
+    e = c-1461*d//4
+    m = (5*e+2)//153
+    return 100*b+d-4800+m//10,m+3-12*(m//10),e-(153*m+2)//5+1
+
+#%%
+def daysBetween(d1, d2, calendar=None):
     """
     Documentation for daysBetween():
     -------
-    The daysBetween() function calculates days between two dates (strings)
+    The daysBetween() function calculates days between two dates (strings), or
+    element-wise between arrays of ISO date strings ('YYYY-MM-DD') or numpy
+    datetime64 values, in any convertRelTime calendar
 
     Author: Paul J. Durack : pauldurack@llnl.gov
 
+    Returns:
+    -------
+
+    |  **days** - int absolute day difference, numpy int64 array for array input
+
     Usage:
     ------
         >>> from durolib import daysBetween
         >>> daysBetween('2015-11-17','2015-12-25')
+        >>> daysBetween(branchDates,endDates,calendar='noleap') ; # Whole ensemble
 
     Notes:
     -----
-        ...
+    - PJD 18 Oct 2026 - Vectorised, added calendar argument (default proleptic
+      gregorian as datetime) and corrected datetime.strptime call
+    - PJD 18 Oct 2026 - Months outside 1-12 and days outside the month length
+      of the calendar (e.g. '2015-02-30', '2001-02-29' noleap) raise ValueError
+    - PJD 18 Oct 2026 - Empty arrays give an empty int64 array, NaT datetime64
+      values raise ValueError
     """
-    d1 = datetime.strptime(d1, "%Y-%m-%d")
-    d2 = datetime.strptime(d2, "%Y-%m-%d")
-    return abs((d2 - d1).days)
+    calendar = _calendarName(calendar)
+    days = np.abs(_dateToDays(d2,calendar)-_dateToDays(d1,calendar))
+    if np.ndim(days) == 0:
+        return int(days)
+    return days
+
+def _dateToDays(dates,calendar):
+    # ISO date strings or datetime64 (arrays) to integer day numbers
+    dates = np.asarray(dates)
+    if dates.size == 0:
+        return np.zeros(dates.shape,dtype=np.int64)
+    if dates.dtype.kind == 'M':
+        if np.isnat(dates).any():
+            raise ValueError('Dates contain NaT (not a time)')
+        months = dates.astype('datetime64[M]')
+        year = months.astype(np.int64)//12+1970
+        month = months.astype(np.int64)%12+1
+        day = (dates.astype('datetime64[D]')-months).astype(np.int64)+1
+        _checkDateComponents(year,month,day,calendar)
+        return _componentToDays(year,month,day,calendar)
+    fixed = _fixedIsoDates(dates)
+    if fixed is None:
+        dates = np.char.strip(dates.astype(str))
+        year,_,rest = np.moveaxis(np.char.partition(dates,'-'),-1,0)
+        month,_,day = np.moveaxis(np.char.partition(rest,'-'),-1,0)
+        for sep in ['T',' ']:
+            day = np.moveaxis(np.char.partition(day,sep),-1,0)[0] ; # Drop time of day
+        fixed = [x.astype(np.int64) for x in (year,month,day)]
+    _checkDateComponents(fixed[0],fixed[1],fixed[2],calendar)
+    return _componentToDays(fixed[0],fixed[1],fixed[2],calendar)
+
+def _checkDateComponents(year,month,day,calendar):
+    # Raise ValueError for months outside 1-12 or days outside the month length
+    year,month,day = [np.asarray(x,dtype=np.int64) for x in (year,month,day)]
+    badMonth = (month < 1) | (month > 12)
+    if badMonth.any():
+        raise ValueError(''.join(['Month out of range (1-12): ',str(month[badMonth].ravel()[0])]))
+    if calendar == '360_day':
+        monthDays = np.full(month.shape,30,dtype=np.int64)
+    else:
+        monthDays = np.diff(_noLeapCumDays)[month-1]
+        if calendar != 'noleap':
+            julianLeap = year % 4 == 0
+            gregorianLeap = julianLeap & ((year % 100 != 0) | (year % 400 == 0))
+            if calendar == 'julian':
+                leap = julianLeap
+            elif calendar == 'proleptic_gregorian':
+                leap = gregorianLeap
+            else:
+                leap = np.where(year > 1582,gregorianLeap,julianLeap)
+            monthDays = monthDays+((month == 2) & leap)
+    badDay = (day < 1) | (day > monthDays)
+    if calendar == 'mixed':
+        badDay |= (year == 1582) & (month == 10) & (day > 4) & (day < 15) ; # Gregorian reform gap
+    if badDay.any():
+        bad = np.flatnonzero(badDay.ravel())[0]
+        raise ValueError(''.join(['Day out of range for ',calendar,' calendar: ',
+                                  '-'.join([str(year.ravel()[bad]),str(month.ravel()[bad]),
+                                            str(day.ravel()[bad])])]))
+
+def _fixedIsoDates(dates):
+    # Fast path for 'YYYY-MM-DD[T ...]' strings - digits read from the character codes
+    if dates.dtype.kind == 'U':
+        charType = np.uint32
+    elif dates.dtype.kind == 'S':
+        charType = np.uint8
+    else:
+        return None
+    width = dates.dtype.itemsize//np.dtype(charType).itemsize
+    if width < 10 or dates.size == 0:
+        return None
+    chars = np.ascontiguousarray(dates).reshape(-1).view(charType).reshape(-1,width)
+    digits = chars[:,[0,1,2,3,5,6,8,9]].astype(np.int64)-48
+    if not ((chars[:,4] == 45).all() and (chars[:,7] == 45).all() and
+            ((digits >= 0) & (digits <= 9)).all()):
+        return None
+    if width > 10 and not np.isin(chars[:,10],[0,32,84]).all(): # end, ' ' or 'T'
+        return None
+    year = digits[:,0]*1000+digits[:,1]*100+digits[:,2]*10+digits[:,3]
+    month = digits[:,4]*10+digits[:,5]
+    day = digits[:,6]*10+digits[:,7]
+    return [x.reshape(dates.shape) for x in (year,month,day)]
 
 #%%
 def environment():
     return False
 
+#%%
+class FileCatalog(object):
+    """
+    Documentation for FileCatalog(fileList,varId,modelSuite):
+    -------
+    The FileCatalog class holds a listing of CMIP files as numpy columns, the
+    directory and each DRS component (parseDRS) are stored once as categorical
+    columns (sorted unique values plus small integer codes) and file paths are
+    rebuilt from them. The truncateVerInfo noVar/noVer/noRealm keys are derived
+    on demand, and filters are vectorised comparisons on the codes
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **fileList** - iterable of file paths
+    |  **varId <optional>** - string variable for key derivation (default each
+    |    file's own variable)
+    |  **modelSuite <optional>** - string suite for key derivation (default each
+    |    file's mip_era)
+
+    Usage:
+    ------
+        >>> from durolib import FileCatalog,matchAndTrimBlanks
+        >>> cat = FileCatalog(glob.glob('/work/cmip-dyn/CMIP6/CMIP/historical/atmos/mon/tas/*.xml'),'tas','CMIP6')
+        >>> gfdl = cat.filter(institution='NOAA-GFDL',realisation=['r1i1p1f1','r2i1p1f1'])
+        >>> gfdl[0].model,gfdl[0].noRealm
+        >>> cat[cat.column('grid') == 'glb-z1-gr1'].paths()
+        >>> matchAndTrimBlanks(['tas','areacella'],[cat.asList(),fxCat.asList()],'tasMatch')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, asList() gives the truncateVerInfo layout;
+      names not following the DRS are kept whole in the 'other' column
+    - PJD 18 Oct 2026 - Codes filled row by row (no fixed-width string arrays),
+      non-DRS keys with varId=None only lose their extension
+    """
+    __slots__ = ('_length','_codes','_categories','varId','modelSuite')
+
+    def __init__(self,fileList=(),varId=None,modelSuite=None):
+        self.varId = varId
+        self.modelSuite = modelSuite
+        fileList = list(fileList)
+        names = ('dir','other')+DRSRecord._fields
+        empty = DRSRecord(*['']*len(DRSRecord._fields))
+        # Codes are filled row by row against per-column lookups, no string matrix is built
+        lookups = dict((name,{}) for name in names)
+        codes = dict((name,np.empty(len(fileList),dtype=np.int64)) for name in names)
+        for i,filePath in enumerate(fileList):
+            record = parseDRS(filePath)
+            other = '' if record is not None else os.path.basename(filePath)
+            values = (os.path.dirname(filePath),other)+tuple(record or empty)
+            for name,value in zip(names,values):
+                lookup = lookups[name]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                codes[name][i] = code
+        self._length = len(fileList)
+        self._codes,self._categories = {},{}
+        for name in names:
+            # Sort categories (mask uses searchsorted) and remap codes to sorted order
+            lookup = lookups[name]
+            categories = np.array(sorted(lookup),dtype=object)
+            order = np.empty(len(lookup),dtype=np.int64)
+            order[[lookup[x] for x in categories]] = np.arange(len(lookup))
+            self._categories[name] = categories
+            self._codes[name] = order[codes[name]].astype(np.min_scalar_type(max(len(lookup)-1,0)))
+            codes[name] = None
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return (_FileCatalogRow(self,i) for i in range(len(self)))
+
+    def __getitem__(self,index):
+        # Integer gives a row view, boolean mask/index array/slice a sub-catalog
+        if isinstance(index,(int,np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('FileCatalog index out of range')
+            return _FileCatalogRow(self,int(index))
+        subset = FileCatalog.__new__(FileCatalog)
+        subset.varId,subset.modelSuite = self.varId,self.modelSuite
+        subset._categories = self._categories
+        subset._codes = dict((k,v[index]) for k,v in self._codes.items())
+        subset._length = len(subset._codes['dir'])
+        return subset
+
+    def __repr__(self):
+        return ''.join(['<FileCatalog: ',str(len(self)),' files>'])
+
+    def column(self,name):
+        # Decoded column values (path, a DRS field, noVar, noVer or noRealm)
+        if name == 'path':
+            return np.array(self.paths(),dtype=object)
+        if name in self._codes:
+            return self._categories[name][self._codes[name]]
+        if name in _truncateKeyNames:
+            return np.array([getattr(x,name) for x in self])
+        raise KeyError(name)
+
+    def mask(self,name,values):
+        # Boolean mask of rows whose DRS field is one of values
+        if isinstance(values,str):
+            values = [values]
+        categories = self._categories[name]
+        positions = np.searchsorted(categories,values)
+        codes = [p for p,v in zip(positions,values) if p < len(categories) and categories[p] == v]
+        return np.isin(self._codes[name],codes)
+
+    def filter(self,**criteria):
+        # Sub-catalog matching all field=value(s) criteria
+        keep = np.ones(len(self),dtype=bool)
+        for name,values in criteria.items():
+            keep &= self.mask(name,values)
+        return self[keep]
+
+    def paths(self):
+        return [x.path for x in self]
+
+    def asList(self):
+        # truncateVerInfo layout [fileList, noVar, noVer, noRealm]
+        keys = [x.keys() for x in self]
+        return [self.paths()]+[[x[i] for x in keys] for i in range(3)]
+
+class _FileCatalogRow(object):
+    # Lightweight view of one FileCatalog row
+    __slots__ = ('_catalog','_index')
+
+    def __init__(self,catalog,index):
+        self._catalog = catalog
+        self._index = index
+
+    def __getattr__(self,name):
+        catalog = object.__getattribute__(self,'_catalog')
+        index = object.__getattribute__(self,'_index')
+        if name in catalog._codes:
+            return str(catalog._categories[name][catalog._codes[name][index]])
+        if name in _truncateKeyNames:
+            return self.keys()[_truncateKeyNames.index(name)]
+        raise AttributeError(name)
+
+    @property
+    def path(self):
+        # Rebuild file name from DRS components (cmip5 or CMIP5/CMIP6 layout)
+        fields = [self.mip_era]
+        if not fields[0]:
+            return os.path.join(self.dir,self.other)
+        if fields[0] == 'cmip5':
+            fields += [self.model,self.experiment,self.realisation,self.frequency,self.realm,
+                       self.table,self.variable,''.join(['ver-',self.version]),self.suffix]
+        else:
+            fields += [self.activity,self.experiment,self.institution,self.model,self.realisation,
+                       self.frequency,self.variable,self.realm,self.grid,self.version,self.suffix]
+        return os.path.join(self.dir,'.'.join(fields))
+
+    def keys(self):
+        # (noVar, noVer, noRealm) as truncateVerInfo
+        varId = self._catalog.varId or self.variable
+        modelSuite = self._catalog.modelSuite or self.mip_era
+        return _truncateKeys(self.path,varId,modelSuite)
+
+    def __repr__(self):
+        return ''.join(['<FileCatalog row: ',self.path,'>'])
+
+_truncateKeyNames = ['noVar','noVer','noRealm']
+
 #%%
 def fillHoles(var):
     return var
@@ -258,7 +1024,7 @@ def fillHoles(var):
     """
 
 #%%
-def fitPolynomial(var,time,polyOrder):
+def fitPolynomial(var,time,polyOrder,full=False):
     """
     Documentation for fitPolynomial(var):
     -------
@@ -267,31 +1033,297 @@ def fitPolynomial(var,time,polyOrder):
 
     Author: Paul J. Durack : pauldurack@llnl.gov
 
+    Inputs:
+    -----
+
+    |  **var** - cdms2 variable or numpy (masked) array, time is dimension 0,
+    |    any number of further dimensions
+    |  **time** - time coordinate values
+    |  **polyOrder** - int polynomial order
+    |  **full <optional>** - boolean also return coefficients and residuals
+
+    Returns:
+    -----
+
+    |  **varFitted** - fitted field, same type and shape as var
+    |  **coefs** - (full=True) numpy array (polyOrder+1,)+var.shape[1:], highest
+    |    power first as numpy.polyfit
+    |  **residuals** - (full=True) numpy array var.shape[1:], sum of squared residuals
+
     Usage:
     ------
         >>> from durolib import fitPolynomial
         >>> var_cubic = fitPolynomial(var,time,polyOrder=3)
+        >>> varFit,coefs,residuals = fitPolynomial(thetao,time,polyOrder=5,full=True) ; # time,lev,lat,lon
 
     Notes:
     -----
     - PJD  5 Aug 2013 - Implemented following examples from Pete G.
-    - TODO: only works on 2D arrays, improve to work on 3D
+    - PJD 18 Oct 2026 - var can be a cdms2 variable or numpy (masked) array,
+      the output type follows the input
+    - PJD 18 Oct 2026 - Any order and any number of dimensions, all grid points
+      are solved in one least-squares call (columns scaled as numpy.polyfit) and
+      evaluated with one Vandermonde product
+    - PJD 18 Oct 2026 - Masked and NaN values are excluded from the fit, grid
+      points sharing a missing-time pattern are solved together; points with
+      polyOrder or fewer valid times return NaN coefficients (masked fit)
     http://docs.scipy.org/doc/numpy/reference/generated/numpy.polyfit.html
     """
-    if polyOrder > 3:
-        print(''.join(['** fitPolynomial Error: >cubic fits not supported **',]))
+    time = np.asarray(time,dtype='float64')
+    if int(polyOrder) != polyOrder or polyOrder < 0 or polyOrder >= len(time):
+        print(''.join(['** fitPolynomial Error: polyOrder must be an int between 0 and len(time)-1 **',]))
+        return
+    polyOrder = int(polyOrder)
+    data,meta = _splitVariable(var)
+    if np.shape(data)[0] != len(time):
+        print(''.join(['** fitPolynomial Error: time and var dimension 0 lengths differ **',]))
         return
-    varFitted = mv.multiply(var,0.) ; # Preallocate output array
-    coefs,residuals,rank,singularValues,rcond = np.polyfit(time,var,polyOrder,full=True)
-    for timeIndex in range(len(time)):
-        timeVal = time[timeIndex]
-        if polyOrder == 1:
-            varFitted[timeIndex] = (coefs[0]*timeVal + coefs[1])
-        elif polyOrder == 2:
-            varFitted[timeIndex] = (coefs[0]*(timeVal**2) + coefs[1]*timeVal + coefs[2])
-        elif polyOrder == 3:
-            varFitted[timeIndex] = (coefs[0]*(timeVal**3) + coefs[1]*(timeVal**2) + coefs[2]*timeVal + coefs[3])
-    return varFitted
+    values = np.reshape(np.ma.getdata(data),(len(time),-1))
+    valid = _validPoints(data,values)
+    if valid is None:
+        coefs = _polyfitColumns(time,values,polyOrder)
+    else:
+        coefs = _polyfitMaskedColumns(time,values,valid,polyOrder)
+    # Evaluate fit for all time indices in a single product
+    fitted = np.dot(np.vander(time,polyOrder+1),coefs)
+    varFitted = fitted.reshape(np.shape(data))
+    if np.issubdtype(data.dtype,np.floating):
+        varFitted = varFitted.astype(data.dtype)
+    if np.ma.isMaskedArray(data):
+        mask = np.ma.getmaskarray(data) | np.isnan(varFitted) ; # Unfittable points
+        varFitted = np.ma.masked_array(varFitted,mask=mask)
+    varFitted = _joinVariable(varFitted,meta)
+    if not full:
+        return varFitted
+    squares = (values-fitted)**2
+    if valid is not None:
+        squares = np.where(valid,squares,0.)
+    residuals = squares.sum(axis=0)
+    residuals[np.isnan(coefs[0])] = np.nan
+    residuals = residuals.reshape(np.shape(data)[1:])
+    return varFitted,coefs.reshape((polyOrder+1,)+np.shape(data)[1:]),residuals
+
+def _validPoints(data,values):
+    # (time, points) boolean array of usable values, None if all are usable
+    valid = ~np.isnan(values) if np.issubdtype(values.dtype,np.floating) else None
+    if np.ma.isMaskedArray(data) and np.ma.getmask(data) is not np.ma.nomask:
+        mask = np.reshape(np.ma.getmaskarray(data),values.shape)
+        valid = ~mask if valid is None else valid & ~mask
+    if valid is None or valid.all():
+        return None
+    return valid
+
+def _polyfitMaskedColumns(time,values,valid,polyOrder):
+    # _polyfitColumns for columns with missing values
+    return _lstsqMaskedColumns(np.vander(time,polyOrder+1),values,valid)
+
+def _polyfitColumns(time,values,polyOrder):
+    # Least-squares polynomial coefficients (highest power first) for every
+    # column of values, one solve as numpy.polyfit (scaled Vandermonde columns)
+    return _lstsqColumns(np.vander(time,polyOrder+1),values)
+
+def _lstsqMaskedColumns(design,values,valid):
+    # _lstsqColumns for columns with missing values - columns are grouped by
+    # missing-time pattern and each group solved in one call
+    coefs = np.full((design.shape[1],values.shape[1]),np.nan)
+    patterns = np.ascontiguousarray(np.packbits(valid,axis=0).T)
+    patterns = patterns.view(np.dtype((np.void,patterns.shape[1]))).ravel()
+    _,groups = np.unique(patterns,return_inverse=True)
+    groups = groups.ravel()
+    order = np.argsort(groups,kind='stable')
+    starts = np.flatnonzero(np.diff(groups[order]))+1
+    for columns in np.split(order,starts):
+        rows = valid[:,columns[0]]
+        if rows.sum() < design.shape[1]:
+            continue ; # Too few values (includes fully masked points)
+        coefs[:,columns] = _lstsqColumns(design[rows],values[np.ix_(rows,columns)])
+    return coefs
+
+def _lstsqColumns(design,values):
+    # Least-squares coefficients for every column of values against one design
+    # matrix, columns scaled to unit norm for conditioning
+    scale = np.sqrt((design*design).sum(axis=0))
+    scale[scale == 0] = 1.
+    lhs = design/scale
+    values = np.asarray(values,dtype='float64')
+    # Thin QR of the small design matrix, then one matrix product for all columns
+    q,r = np.linalg.qr(lhs)
+    diagonal = np.abs(np.diag(r))
+    if diagonal.min() > diagonal.max()*len(design)*np.finfo(float).eps:
+        coefs = np.linalg.solve(r,np.dot(q.T,values))
+    else: # Rank deficient - minimum norm solution
+        coefs = np.linalg.lstsq(lhs,values,rcond=None)[0]
+    return coefs/scale[:,np.newaxis]
+
+#%%
+def fitPolynomialChunked(source,time,polyOrder,variable=None,outCoefs=None,outFitted=None,
+                         missingValue=None,maxMemory=512*2**20):
+    """
+    Documentation for fitPolynomialChunked(source,time,polyOrder,...):
+    -------
+    The fitPolynomialChunked() function fits polyOrder polynomials along
+    dimension 0 of fields larger than memory. Spatial tiles (blocks of the
+    flattened grid points) are streamed through the fit in time blocks,
+    accumulating the per grid point normal equations, then coefficients (and
+    optionally fitted values) are written tile by tile, so memory use stays
+    below maxMemory
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **source** - array-like sliceable field (numpy.memmap, netCDF4/h5py or
+    |    cdms2 file variable) or a file path (read with cdms2, see variable)
+    |  **time** - time coordinate values
+    |  **polyOrder** - int polynomial order (1 gives linear trends)
+    |  **variable <optional>** - string variable name when source is a path
+    |  **outCoefs <optional>** - array-like (polyOrder+1,)+spatial shape to
+    |    write coefficients into (e.g. numpy.memmap), default a new array
+    |  **outFitted <optional>** - array-like source shaped, fitted values are
+    |    written into it (e.g. numpy.memmap opened 'w+')
+    |  **missingValue <optional>** - value treated as missing (NaN and masked
+    |    values always are)
+    |  **maxMemory <optional>** - int approximate working memory ceiling in bytes
+
+    Returns:
+    -------
+
+    |  **coefs** - outCoefs, highest power first as fitPolynomial; NaN where
+    |    polyOrder or fewer valid times
+    |  **residuals** - numpy array spatial shape, sum of squared residuals
+
+    Usage:
+    ------
+        >>> from durolib import fitPolynomialChunked
+        >>> thetao = np.memmap('thetao.dat',dtype='float32',mode='r',shape=(73000,50,300,360))
+        >>> fitted = np.memmap('thetaoFit.dat',dtype='float32',mode='w+',shape=thetao.shape)
+        >>> coefs,residuals = fitPolynomialChunked(thetao,time,3,outFitted=fitted,maxMemory=2**30)
+        >>> coefs,residuals = fitPolynomialChunked('thetao.xml',time,1,variable='thetao')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, time is scaled to [-1, 1] for the normal
+      equations and coefficients converted back to time units
+    - PJD 18 Oct 2026 - Tiles span the flattened grid points (not only
+      dimension 1), singular points alone fall back to least squares
+    """
+    fileHandle = None
+    if isinstance(source,str):
+        fileHandle = cdm.open(source)
+        source = fileHandle[variable]
+    try:
+        return _fitPolynomialTiles(source,np.asarray(time,dtype='float64'),int(polyOrder),outCoefs,
+                                   outFitted,missingValue,maxMemory)
+    finally:
+        if fileHandle is not None:
+            fileHandle.close()
+
+def _fitPolynomialTiles(source,time,polyOrder,outCoefs,outFitted,missingValue,maxMemory):
+    # Tile loop for fitPolynomialChunked
+    shape = tuple(source.shape)
+    if len(shape) < 2 or shape[0] != len(time) or not 0 <= polyOrder < len(time):
+        print('** fitPolynomialChunked error: source must be (time,...) and 0 <= polyOrder < len(time) **')
+        return None
+    nTimes,nPoints = shape[0],int(np.prod(shape[1:]))
+    nCoefs = polyOrder+1
+    if outCoefs is None:
+        outCoefs = np.empty((nCoefs,)+shape[1:])
+    residuals = np.empty(nPoints)
+    # Scaled time basis, x in [-1, 1]
+    centre = (time.max()+time.min())/2.
+    half = max((time.max()-time.min())/2.,np.finfo(float).tiny)
+    basis = np.vander((time-centre)/half,nCoefs,increasing=True)
+    toTime = _scaledToTimeCoefs(centre,half,nCoefs)
+    # Tile sizes from the memory ceiling, ~48 bytes of working arrays per
+    # value plus the per point normal equations and their solve copies
+    pointBytes = (4*nCoefs*nCoefs+6*nCoefs+4)*8
+    points = int(np.clip(int(maxMemory)//(48*min(nTimes,256)+pointBytes),1,nPoints))
+    timeBlock = int(np.clip((int(maxMemory)-points*pointBytes)//(48*points),1,nTimes))
+    for index,tileShape,point0,point1 in _spatialTiles(shape[1:],points):
+        tilePoints = point1-point0
+        normal = np.zeros((tilePoints,nCoefs*nCoefs))
+        rhs = np.zeros((tilePoints,nCoefs))
+        sumSquares = np.zeros(tilePoints)
+        count = np.zeros(tilePoints)
+        # Accumulate normal equations over time blocks
+        for time0 in range(0,nTimes,timeBlock):
+            time1 = min(time0+timeBlock,nTimes)
+            values,weights = _tileValues(source[(slice(time0,time1),)+index],missingValue)
+            block = basis[time0:time1]
+            products = (block[:,:,np.newaxis]*block[:,np.newaxis,:]).reshape(len(block),-1)
+            normal += np.dot(weights.T,products)
+            rhs += np.dot(values.T,block)
+            sumSquares += (values*values).sum(axis=0)
+            count += weights.sum(axis=0)
+            del values,weights
+        fit = count > polyOrder
+        scaled = np.full((tilePoints,nCoefs),np.nan)
+        if fit.any():
+            scaled[fit] = _solveNormal(normal[fit].reshape(-1,nCoefs,nCoefs),rhs[fit])
+        sse = sumSquares-2.*(scaled*rhs).sum(axis=1)+np.einsum('pi,pij,pj->p',scaled,
+                                                              normal.reshape(-1,nCoefs,nCoefs),scaled)
+        residuals[point0:point1] = np.maximum(sse,0.)
+        outCoefs[(slice(None),)+index] = np.dot(toTime,scaled.T)[::-1].reshape((nCoefs,)+tileShape)
+        if outFitted is not None:
+            for time0 in range(0,nTimes,timeBlock):
+                time1 = min(time0+timeBlock,nTimes)
+                fitted = np.dot(basis[time0:time1],scaled.T)
+                outFitted[(slice(time0,time1),)+index] = fitted.reshape((time1-time0,)+tileShape)
+    return outCoefs,residuals.reshape(shape[1:])
+
+def _spatialTiles(spatialShape,points):
+    # (index, tile shape, first, last flat point) of C-ordered tiles of at most points
+    # grid points; dimensions whose trailing block exceeds points are indexed singly
+    inner = int(np.prod(spatialShape))
+    for axis,length in enumerate(spatialShape):
+        inner //= length
+        if inner <= points:
+            break
+    block = max(points//inner,1)
+    for lead in np.ndindex(*spatialShape[:axis]):
+        first = int(np.ravel_multi_index(lead,spatialShape[:axis])) if axis else 0
+        for start in range(0,length,block):
+            stop = min(start+block,length)
+            index = tuple(int(x) for x in lead)+(slice(start,stop),)
+            yield (index,(stop-start,)+tuple(spatialShape[axis+1:]),(first*length+start)*inner,
+                   (first*length+stop)*inner)
+
+def _tileValues(tile,missingValue):
+    # (time, points) float64 values with missing set to 0 and matching weights
+    data = np.asarray(np.ma.getdata(tile),dtype='float64').reshape(tile.shape[0],-1)
+    valid = ~np.isnan(data)
+    if np.ma.isMaskedArray(tile):
+        valid &= ~np.ma.getmaskarray(tile).reshape(data.shape)
+    if missingValue is not None:
+        valid &= data != missingValue
+    return np.where(valid,data,0.),valid.astype('float64')
+
+def _solveNormal(normal,rhs):
+    # Batched solve of per point normal equations, least squares for the singular points only
+    try:
+        return np.linalg.solve(normal,rhs[...,np.newaxis])[...,0]
+    except np.linalg.LinAlgError:
+        pass
+    singular = np.linalg.det(normal) == 0 ; # Same LU pivots as solve
+    result = np.empty(rhs.shape)
+    if not singular.all():
+        try:
+            result[~singular] = np.linalg.solve(normal[~singular],rhs[~singular][...,np.newaxis])[...,0]
+        except np.linalg.LinAlgError:
+            singular[:] = True
+    for point in np.flatnonzero(singular):
+        result[point] = np.linalg.lstsq(normal[point],rhs[point],rcond=None)[0]
+    return result
+
+def _scaledToTimeCoefs(centre,half,nCoefs):
+    # Matrix taking ascending coefficients in x=(t-centre)/half to ascending
+    # coefficients in t
+    matrix = np.zeros((nCoefs,nCoefs))
+    for power in range(nCoefs):
+        expanded = np.polynomial.polynomial.polypow([-centre/half,1./half],power)
+        matrix[:len(expanded),power] = expanded
+    return matrix
 
 #%%
 def fixInterpAxis(var):
@@ -310,17 +1342,25 @@ def fixInterpAxis(var):
 
     Notes:
     - PJD  6 Sep 2018 - Corrected time units 0-1-1 to 1-1-1
+    - PJD 18 Oct 2026 - Yearly index and bounds built directly and cached (see setCalendarCache)
+    - PJD 18 Oct 2026 - See linearTrend for per year trends without CDAT
     -----
         ...
     """
-    tind = range(shape(var)[0]) ; # Assume time axis is dimension 0
-    t = cdm.createAxis(tind,id='time')
+    nTimes = np.shape(var)[0] ; # Assume time axis is dimension 0
+    # Explicitly set time bounds to yearly
+    tind,bounds = _cachedCalendar(('fixInterpAxis',nTimes),lambda: _yearlyIndexArrays(nTimes))
+    t = cdm.createAxis(tind.copy(),bounds=bounds.copy(),id='time')
     t.units = 'years since 1-01-01 0:0:0.0'
     t.calendar = var.getTime().calendar
-    cdu.times.setTimeBoundsYearly(t) ; # Explicitly set time bounds to yearly
     var.setAxis(0,t)
     return var
 
+def _yearlyIndexArrays(nTimes):
+    # 0..n-1 years with [k, k+1] bounds
+    tind = np.arange(nTimes,dtype=np.float64)
+    return tind,np.column_stack((tind,tind+1.))
+
 #%%
 def fixVarUnits(var,varName,report=False,logFile=None):
     """
@@ -337,7 +1377,7 @@ def fixVarUnits(var,varName,report=False,logFile=None):
 
     Notes:
     -----
-        ...
+    - PJD 18 Oct 2026 - var can be a cdms2 variable or numpy (masked) array
     """
     var_fixed = False
     if varName in ['so','sos']:
@@ -347,10 +1387,8 @@ def fixVarUnits(var,varName,report=False,logFile=None):
             if logFile is not None:
                 writeToLog(logFile,"".join(['*SO mean:     {:+06.2f}'.format(var.mean()),'; min: {:+06.2f}'.format(var.min().astype('float64')),'; max: {:+06.2f}'.format(var.max().astype('float64'))]))
             var_ = var*1000
-            var_.id = var.id
-            var_.name = var.id
-            for k in var.attributes.keys():
-                setattr(var_,k,var.attributes[k])
+            if _isCdmsVariable(var):
+                _copyAttributes(var,var_)
             var = var_
             var_fixed = True
             if report:
@@ -364,10 +1402,8 @@ def fixVarUnits(var,varName,report=False,logFile=None):
             if logFile is not None:
                 writeToLog(logFile,"".join(['*THETAO mean: {:+06.2f}'.format(var.mean()),'; min: {:+06.2f}'.format(var.min().astype('float64')),'; max: {:+06.2f}'.format(var.max().astype('float64'))]))
             var_ = var-273.15
-            var_.id = var.id
-            var_.name = var.id
-            for k in var.attributes.keys():
-                setattr(var_,k,var.attributes[k])
+            if _isCdmsVariable(var):
+                _copyAttributes(var,var_)
             var = var_
             var_fixed = True
             if report:
@@ -377,6 +1413,13 @@ def fixVarUnits(var,varName,report=False,logFile=None):
 
     return var,var_fixed
 
+def _copyAttributes(var,newVar):
+    # Carry id and attributes across cdms2 arithmetic
+    newVar.id = var.id
+    newVar.name = var.id
+    for k in var.attributes.keys():
+        setattr(newVar,k,var.attributes[k])
+
 #%%
 def getGitInfo(filePath):
     """
@@ -418,6 +1461,7 @@ def getGitInfo(filePath):
     * PJD 20 Jun 2023 - Updated getGitInfo to test gitTagErr.strip() == b'str' vs 'str' for py3
     ...
     """
+    import subprocess
     # Test current work dir
     if os.path.isfile(filePath) or os.path.isdir(filePath):
         currentWorkingDir = os.path.split(filePath)[0]
@@ -558,6 +1602,7 @@ def globalAttWrite(file_handle,options):
     * PJD 19 Apr 2018 - Corrected UTC offset, now correct times are reported - https://github.com/stub42/pytz/issues/12
     """
     import cdat_info,pytz
+    from socket import gethostname
     # Create timestamp, using UTC for history
     utcNow      = datetime.datetime.utcnow();
     utcNow      = utcNow.replace(tzinfo=pytz.utc)
@@ -586,11 +1631,16 @@ def globalAttWrite(file_handle,options):
         file_handle.institution     = "Program for Climate Model Diagnosis and Intercomparison (LLNL), Livermore, CA, U.S.A."
 
 #%%
-def globAndTrim(path):
+def globAndTrim(path=None,workers=None,experiment=None,variable=None,frequency=None,
+                realm=None,catalog=None,fileExt='.xml'):
     """
     Documentation for globAndTrim():
     -------
-    The globAndTrim() function wraps trimModelList to take a single path argument
+    The globAndTrim() function wraps trimModelList to take a single path argument.
+    If a catalog is available (catalog argument, setCatalog or DUROLIB_CATALOG)
+    and covers path, the answer is read from the catalog index rather than
+    globbing and trimming the directory; experiment, variable, frequency and
+    realm queries (across the whole catalog if path is None) require a catalog
 
     Author: Paul J. Durack : pauldurack@llnl.gov
 
@@ -601,6 +1651,8 @@ def globAndTrim(path):
     ------
         >>> from durolib import globAndTrim
         >>> globAndTrim('/path/to/data')
+        >>> globAndTrim('/path/to/data',workers=16) ; # Concurrent creation_date reads
+        >>> globAndTrim(experiment='historical',variable='tas',frequency='mon',catalog='cmip6.sqlite')
 
     Examples:
     ---------
@@ -608,10 +1660,23 @@ def globAndTrim(path):
 
     Notes:
     -----
-        ...
+    - PJD 18 Oct 2026 - Added workers argument, passed to trimModelList
+    - PJD 18 Oct 2026 - Added catalog queries, see makeCatalog
+    - PJD 18 Oct 2026 - Added fileExt argument, a catalog built for another
+      extension raises ValueError rather than returning its files
     """
-    outList = glob.glob(os.path.join(path,'*.xml'))
-    outList = trimModelList(outList) ; # only need to match model, no version info required
+    query = dict((k,v) for k,v in (('experiment',experiment),('variable',variable),
+                                    ('frequency',frequency),('realm',realm)) if v is not None)
+    catalogPath = _catalogPath(catalog)
+    if catalogPath is not None:
+        outList = _queryCatalog(catalogPath,path,query,fileExt)
+        if outList is not None:
+            return outList
+    if path is None or query:
+        print('** globAndTrim: path (without query) or a catalog covering the query is required **')
+        return []
+    outList = glob.glob(os.path.join(path,''.join(['*',fileExt])))
+    outList = trimModelList(outList,workers=workers) ; # only need to match model, no version info required
     outList.sort()
     return outList
 
@@ -620,6 +1685,89 @@ def inpaint(array,method):
     #/work/durack1/csiro/Backup/110808/Z_dur041_linux/bin/inpaint_nans/inpaint_nans.m
     return False
 
+#%%
+def iterTrimModelList(modelFiles,workers=None):
+    """
+    Documentation for iterTrimModelList(modelFiles,workers):
+    -------
+    The iterTrimModelList() function is the streaming form of trimModelList, it
+    consumes any iterable of file paths and yields the latest file of each model
+    group as soon as the group is complete. Memory is bounded by the largest
+    directory rather than the listing
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **modelFiles** - iterable of file paths, files of a directory must be
+    |    contiguous (e.g. os.scandir or os.walk order), any order within it
+    |  **workers <optional>** - int concurrent creation_date reads within a group
+
+    Usage:
+    ------
+        >>> from durolib import iterTrimModelList
+        >>> for filePath in iterTrimModelList(x.path for x in os.scandir(filePath)):
+        ...     print(filePath)
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented
+    - PJD 18 Oct 2026 - An invalid file name raises ValueError (trimModelList
+      returns ''), no file of its directory is yielded
+    - PJD 18 Oct 2026 - Each directory run is sorted by model group key before
+      grouping, so unsorted listings are trimmed as trimModelList trims them;
+      files are yielded in key order within a directory
+    """
+    import itertools
+    for dirPath,dirFiles in itertools.groupby(modelFiles,key=os.path.dirname):
+        keyed = []
+        for filePath in dirFiles:
+            key = _trimModelKey(filePath)
+            if key[0] is None:
+                # trimModelList returns '' (no files), files already yielded can not
+                # be withdrawn so the iteration fails instead of stopping short
+                raise ValueError(''.join(['iterTrimModelList: invalid file name ',filePath]))
+            keyed.append((key,filePath))
+        keyed.sort(key=lambda x: x[0][0])
+        for _,group in itertools.groupby(keyed,key=lambda x: x[0][0]):
+            group = list(group)
+            if len(group) == 1:
+                yield group[0][1]
+                continue
+            filePaths = [x[1] for x in group]
+            creationDates = _mapWorkers(_readCreationDate,filePaths,workers)
+            yield _latestVersionIndex(filePaths,[x[0][1] for x in group],creationDates)
+
+#%%
+def iterTruncateVerInfo(fileList,varId,modelSuite):
+    """
+    Documentation for iterTruncateVerInfo(fileList,varId,modelSuite):
+    -------
+    The iterTruncateVerInfo() function is the streaming form of truncateVerInfo,
+    it consumes any iterable of file paths and yields one tuple per file rather
+    than building four full lists
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Returns:
+    -------
+
+    |  **tuple** - (file, noVar, noVer, noRealm) per input file
+
+    Usage:
+    ------
+        >>> from durolib import iterTrimModelList,iterTruncateVerInfo
+        >>> for filePath,noVar,noVer,noRealm in iterTruncateVerInfo(iterTrimModelList(fileIter),'tas','CMIP6'):
+        ...     print(noRealm)
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented
+    """
+    for infile in fileList:
+        yield (infile,)+_truncateKeys(infile,varId,modelSuite)
+
 #%%
 def keyboard(banner=None):
     """
@@ -646,6 +1794,7 @@ def keyboard(banner=None):
     -----
         ...
     """
+    import code
     # use exception trick to pick up the current frame
     try:
         raise None
@@ -661,7 +1810,193 @@ def keyboard(banner=None):
         return
 
 #%%
-def makeCalendar(timeStart,timeEnd,calendarStep='months',monthStart=1,monthEnd=12,dayStep=1):
+def linearTrend(var,time=None,units=None,calendar=None):
+    """
+    Documentation for linearTrend(var,time,units,calendar):
+    -------
+    The linearTrend() function computes the ordinary least squares linear trend
+    along dimension 0 of var for every grid point in closed form, returning per
+    year slopes with standard errors and significance adjusted for lag-1
+    autocorrelation of the residuals (effective sample size, Santer et al. 2000)
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **var** - cdms2 variable or numpy (masked) array, time is dimension 0
+    |  **time <optional>** - time values (default var time axis); in years if
+    |    units is not given
+    |  **units <optional>** - string time units e.g. 'days since 1850-1-1'
+    |  **calendar <optional>** - calendar of time (default var time axis, else gregorian)
+
+    Returns:
+    -------
+
+    |  **trend** - dict of arrays shaped var.shape[1:]: slope (per year),
+    |    intercept (at the units base date, or time zero), stderr (of slope),
+    |    pvalue (two sided), r1 (lag-1 residual autocorrelation), neff
+    |    (effective sample size); NaN where fewer than 3 valid times, stderr
+    |    and pvalue are also NaN where neff <= 2
+
+    Usage:
+    ------
+        >>> from durolib import linearTrend
+        >>> trend = linearTrend(tos) ; # cdms2 variable, any calendar
+        >>> trend = linearTrend(sst,time=timeValues,units='days since 1850-1-1',calendar='noleap')
+        >>> significant = trend['pvalue'] < 0.05
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented as a native replacement for the fixInterpAxis
+      and genutil.statistics.linearregression route; masked/NaN values are
+      excluded per point, scipy (t distribution) is only imported here
+    """
+    from scipy import stats
+    data,meta = _splitVariable(var)
+    if meta is not None and time is None:
+        timeAxis = var.getTime()
+        time = timeAxis[:]
+        units = timeAxis.units if units is None else units
+        calendar = getattr(timeAxis,'calendar',None) if calendar is None else calendar
+    if time is None:
+        print('** linearTrend error: time required for numpy input, exiting..')
+        return None
+    years = np.asarray(time,dtype='float64')
+    if units is not None:
+        calendar = _calendarName('gregorian' if calendar is None else calendar)
+        days = convertRelTime(years,units,'days since 1-1-1',calendar)
+        years = (days-convertRelTime(0.,units,'days since 1-1-1',calendar))/_yearLength[calendar]
+    values = np.reshape(np.ma.getdata(data),(len(years),-1)).astype('float64')
+    valid = _validPoints(data,values)
+    if valid is None:
+        valid = np.ones(values.shape,dtype=bool)
+    values = np.where(valid,values,0.)
+    weights = valid.astype('float64')
+    # Closed form OLS per point
+    with np.errstate(invalid='ignore',divide='ignore'):
+        n = weights.sum(axis=0)
+        tMean = np.dot(years,weights)/n
+        yMean = values.sum(axis=0)/n
+        tAnom = (years[:,np.newaxis]-tMean)*weights
+        sxx = (tAnom*tAnom).sum(axis=0)
+        slope = (tAnom*values).sum(axis=0)/sxx
+        intercept = yMean-slope*tMean
+        residuals = (values-intercept-slope*years[:,np.newaxis])*weights
+        sse = (residuals*residuals).sum(axis=0)
+        # Lag-1 autocorrelation of residuals and effective sample size
+        r1 = (residuals[1:]*residuals[:-1]).sum(axis=0)/sse
+        neff = np.minimum(n*(1.-r1)/(1.+r1),n)
+        stderr = np.sqrt(sse/(neff-2.)/sxx)
+        pvalue = 2.*stats.t.sf(np.abs(slope/stderr),neff-2.)
+    unfit = (n < 3) | ~(sxx > 0)
+    noSignificance = unfit | ~(neff > 2.) ; # Strongly autocorrelated residuals, fit kept
+    trend = {'slope': slope,'intercept': intercept,'stderr': stderr,'pvalue': pvalue,'r1': r1,'neff': neff}
+    for key,array in trend.items():
+        mask = noSignificance if key in ('stderr','pvalue') else unfit
+        trend[key] = np.where(mask,np.nan,array).reshape(np.shape(data)[1:])
+    return trend
+
+_yearLength = {'proleptic_gregorian': 365.2425,'mixed': 365.2425,'julian': 365.25,
+               'noleap': 365.,'360_day': 360.}
+
+#%%
+def makeBranchTimeStore(jsonPath=None,storePath=None):
+    """
+    Documentation for makeBranchTimeStore():
+    -------
+    The makeBranchTimeStore() function converts the CMIP branch time json
+    database into a compact, versioned and memory-mappable binary store which
+    is read by cmipBranchTime
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **jsonPath <optional>** - string path to json database, defaults to
+    |    data/CMIP5BranchTimes.json
+    |  **storePath <optional>** - string output path, defaults to
+    |    data/CMIPBranchTimes.bts
+
+    Returns:
+    -------
+
+    |  **storePath** - string path of the written store
+
+    Usage:
+    ------
+        >>> from durolib import makeBranchTimeStore
+        >>> makeBranchTimeStore('CMIP5BranchTimes.json','CMIPBranchTimes.bts')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented to replace per-call json parsing
+    - Store layout: magic, uint32 header length, json header (version, dtype,
+      count, offset) then fixed-width records sorted by model, experiment, rip
+    """
+    if jsonPath is None:
+        jsonPath = os.path.join(_getDataPath(),'CMIP5BranchTimes.json')
+    storePath = _branchTimeStorePath(storePath)
+    with open(jsonPath,'r') as f:
+        cmip5 = json.load(f)
+    rows = []
+    for model in cmip5.keys():
+        if model == 'model':
+            continue ; # Skip template entry
+        for experiment in cmip5[model].keys():
+            for rip,info in cmip5[model][experiment].items():
+                rows.append({'model': model,'experiment': experiment,'rip': rip,
+                             'branch_time_relative': _branchTimeValue(info.get('branch_time_relative')),
+                             'branch_time_comp': info.get('branch_time_comp',''),
+                             'branch_time_gregory': _branchTimeValue(info.get('branch_time_gregory')),
+                             'parent_exp_rip': info.get('parent_exp_rip',''),
+                             'valid': info.get('valid',''),
+                             'creation_date': info.get('creation_date',''),
+                             'tracking_id': info.get('tracking_id','')})
+    _writeBranchTimeStore(rows,storePath)
+    return storePath
+
+def _writeBranchTimeStore(rows,storePath,dtype=None,sources=None):
+    # Write sorted records and header, replace existing store atomically
+    import struct
+    if dtype is None:
+        dtype = _branchTimeStoreDtype
+    dtype = np.dtype(dtype)
+    rows = sorted(rows,key=lambda x: tuple(x[k] for k in _branchTimeKeys))
+    records = np.zeros(len(rows),dtype=dtype)
+    for count,row in enumerate(rows):
+        for name in dtype.names:
+            value = row.get(name,np.nan if dtype[name].kind == 'f' else '')
+            if dtype[name].kind == 'S':
+                value = value.encode('utf-8')
+                if len(value) > dtype[name].itemsize:
+                    print(''.join(['** makeBranchTimeStore: ',name,' truncated for ',
+                                   row['model'],' ',row['experiment'],' ',row['rip'],' **']))
+            records[count][name] = value
+    header = {'version': _branchTimeStoreVersion,'dtype': dtype.descr,
+              'count': len(records),'offset': 0}
+    if sources is not None:
+        header['sources'] = sources
+    # Align record block on 64 bytes, two passes as offset length varies
+    for _ in range(2):
+        headerBytes = json.dumps(header,sort_keys=True).encode('utf-8')
+        prefixLen = len(_branchTimeStoreMagic)+4+len(headerBytes)
+        header['offset'] = prefixLen+(-prefixLen % 64)
+    headerBytes = json.dumps(header,sort_keys=True).encode('utf-8')
+    padding = header['offset']-(len(_branchTimeStoreMagic)+4+len(headerBytes))
+    tmpPath = ''.join([storePath,'.tmp',str(os.getpid())])
+    with open(tmpPath,'wb') as f:
+        f.write(_branchTimeStoreMagic)
+        f.write(struct.pack('<I',len(headerBytes)))
+        f.write(headerBytes)
+        f.write(b' '*padding)
+        f.write(records.tobytes())
+    os.rename(tmpPath,storePath)
+
+#%%
+def makeCalendar(timeStart,timeEnd,calendarStep='months',monthStart=1,monthEnd=12,dayStep=1,
+                 calendar='gregorian',asAxis=True):
     """
     Documentation for makeCalendar():
     -----
@@ -674,20 +2009,24 @@ def makeCalendar(timeStart,timeEnd,calendarStep='months',monthStart=1,monthEnd=1
 
     |  **timeStart** - string start time (e.g. '2001' or '2001-1-1 0:0:0.0')
     |  **timeEnd** - string end time
-    |  **calendarStep <optional>** - string either 'months' or 'days'
+    |  **calendarStep <optional>** - string either 'months', 'days' or 'years'
     |  **monthStart <optional>** - int
     |  **monthEnd <optional>** - int
     |  **dayStep <optional>** - int
+    |  **calendar <optional>** - string CF calendar name or cdtime calendar (see convertRelTime)
+    |  **asAxis <optional>** - boolean False returns numpy arrays rather than an axis
 
     Returns:
     -----
 
-    |  **time** - cdms2 transient axis
+    |  **time** - cdms2 transient axis, or with asAxis=False a tuple of
+    |    (times, bounds, units) numpy arrays and units string
 
     Usage:
     -----
     >>> from durolib import makeCalendar
     >>> time = makeCalendar('2001','2014',calendarStep='months')
+    >>> times,bounds,units = makeCalendar('1850','2014',calendarStep='days',calendar='noleap',asAxis=False)
 
     Notes:
     -----
@@ -695,8 +2034,12 @@ def makeCalendar(timeStart,timeEnd,calendarStep='months',monthStart=1,monthEnd=1
     * PJD  7 Jun 2016 - Corrected doc string for calendarStep argument
     * PJD  7 Jul 2016 - Fixed makeCalendar('1854','2016',monthStart='01',monthEnd='06',calendarStep='months') off by one error
     * PJD 25 Aug 2016 - Added 'years' calendarStep argument
+    * PJD 18 Oct 2026 - Times and bounds computed directly as arrays for any calendar
+      (convertRelTime calendars) and dayStep, the axis is only created at the end;
+      the final step (month, day or year) remains excluded as before
+    * PJD 18 Oct 2026 - Arrays are cached (see setCalendarCache), asAxis=False
+      returns read-only views
     * TODO: Update to take full date identifier '2001-1-1 0:0:0.0', not just year
-    * Issues with the daily calendar creation - likely require tweaks to cdutil.times.setAxisTimeBoundsDaily (range doesn't accept fractions, only ints)
     * Consider reviewing calendar assignment in /work/durack1/Shared/obs_data/AQUARIUS/read_AQ_SSS.py
     """
     # First check inputs
@@ -713,96 +2056,223 @@ def makeCalendar(timeStart,timeEnd,calendarStep='months',monthStart=1,monthEnd=1
         print('** makeCalendar error: monthStart or monthEnd invalid, exiting..')
         return
     try:
-        timeStartTest   = cdt.comptime(int(timeStart))
-        timeEndTest     = cdt.comptime(int(timeEnd))
-    except SystemExit as err:
-        print('** makeCalendar error: timeStart invalid - ',err)
+        yearStart,yearEnd = int(timeStart),int(timeEnd)
+        calendarName = _calendarName(calendar)
+    except ValueError as err:
+        print('** makeCalendar error: timeStart, timeEnd or calendar invalid - ',err)
         return
-
-    # Create comptime objects
-    if monthStart != 1:
-        timeStart = cdt.comptime(int(timeStart),int(monthStart))
-    else:
-        timeStart = cdt.comptime(int(timeStart))
-    test = re.compile('^[0-9]{4}$')
-    if monthEnd == 2:
-        if calendar.isleap(int(timeEnd)):
-            timeEnd = cdt.comptime(int(timeEnd),2,29,23,59,59)
-        else:
-            timeEnd = cdt.comptime(int(timeEnd),2,28,23,59,59)
-    elif monthEnd in [4,6,9,11]:
-        timeEnd = cdt.comptime(int(timeEnd),int(monthEnd),30,23,59,59)
-    else:
-        timeEnd = cdt.comptime(int(timeEnd),int(monthEnd),31,23,59,59)
-    # Set units for value conversion
-    timeUnitsStr = ''.join([calendarStep,' since ',str(timeStart.year)])
-    # Set times
-
-    #print 'timeStart',timeStart
-    #print 'timeEnd',timeEnd
-
-    timeStart   = int(timeStart.torelative(timeUnitsStr).value)
-    timeEnd     = int(timeEnd.torelative(timeUnitsStr).value)
-
-    #print 'timeStart',timeStart
-    #print 'timeEnd',timeEnd
-    #print timeUnitsStr
-    #print 'timeStart',cdt.r2c(timeStart,timeUnitsStr)
-    #print 'timeEnd',cdt.r2c(timeEnd,timeUnitsStr)
-
-    if 'dayStep' in locals() and calendarStep == 'days':
-        times = np.float32(range(timeStart,timeEnd,dayStep)) ; # timeEnd/range requires +1 to reach end points (invalid correction 160707)
-    else:
-        times = np.float32(range(timeStart,timeEnd)) ; # timeEnd/range requires +1 to reach end points (invalid correction 160707)
-
-    #print len(times)
-
-    times                   = cdm.createAxis(times)
-
-    #print times.shape
-
+    key = ('makeCalendar',yearStart,yearEnd,calendarStep,int(monthStart),int(monthEnd),dayStep,calendarName)
+    times,bounds = _cachedCalendar(key,lambda: _calendarArrays(yearStart,yearEnd,calendarStep,int(monthStart),
+                                                               int(monthEnd),dayStep,calendarName))
+    timeUnitsStr = ''.join(['days since ',str(yearStart),'-1-1'])
+    if not asAxis:
+        return times,bounds,timeUnitsStr
+
+    times                   = cdm.createAxis(times.copy(),bounds=bounds.copy())
     times.designateTime()
     times.id                = 'time'
     times.units             = timeUnitsStr
     times.long_name         = 'time'
     times.standard_name     = 'time'
-    times.calendar          = 'gregorian'
+    times.calendar          = calendar if isinstance(calendar,str) else _cfCalendarNames[calendarName]
     times.axis              = 'T'
 
-    #print times.asComponentTime()[0]
-    #print times.asComponentTime()[-1]
+    return times
+
+_cfCalendarNames = {'proleptic_gregorian': 'proleptic_gregorian','mixed': 'gregorian',
+                    'julian': 'julian','noleap': 'noleap','360_day': '360_day'}
 
+def _calendarArrays(yearStart,yearEnd,calendarStep,monthStart,monthEnd,dayStep,calendar):
+    # Midpoint times and bounds in days since yearStart-1-1, final step excluded
+    baseDays = _componentToDays(yearStart,1,1,calendar)
     if calendarStep == 'days':
-        #cdu.setTimeBoundsDaily(times,frequency=(1./dayStep))
-        pass
-    elif calendarStep == 'months':
-        cdu.setTimeBoundsMonthly(times)
-    elif calendarStep == 'years':
-        cdu.setTimeBoundsYearly(times)
-    #print times.asComponentTime()[0]
-    #print times.asComponentTime()[-1]
-
-    times.toRelativeTime(''.join(['days since ',str(times.asComponentTime()[0].year),'-1-1']))
-    timeBounds  = times.getBounds()
-    times[:]    = (timeBounds[:,0]+timeBounds[:,1])/2.
-    #times[:]    = times[:]-1 ; # Correct off by one error (invalid correction 160707)
-
-    return times
+        dayStart = _componentToDays(yearStart,monthStart,1,calendar)-baseDays
+        nextMonth = 12*yearEnd+monthEnd ; # First of month after monthEnd
+        dayEnd = _componentToDays(nextMonth//12,nextMonth%12+1,1,calendar)-1-baseDays
+        times = np.arange(dayStart,dayEnd,dayStep,dtype=np.float64)
+        bounds = np.column_stack((times-dayStep/2.,times+dayStep/2.))
+        return times,bounds
+    if calendarStep == 'months':
+        steps = np.arange(monthStart-1,12*(yearEnd-yearStart)+monthEnd-1)
+        edges = np.append(steps,steps[-1]+1) if len(steps) else steps
+        edges = _componentToDays(yearStart+edges//12,edges%12+1,1,calendar)-baseDays
+    else:
+        edges = _componentToDays(np.arange(yearStart,yearEnd+1),1,1,calendar)-baseDays
+    edges = edges.astype(np.float64)
+    bounds = np.column_stack((edges[:-1],edges[1:]))
+    return (bounds[:,0]+bounds[:,1])/2.,bounds
 
 #%%
-def matchAndTrimBlanks(varList,listFilesList,newVarId):
+def makeCatalog(archivePath,catalogPath=None,workers=8,fileExt='.xml'):
     """
-    Documentation for matchAndTrimBlanks():
+    Documentation for makeCatalog(archivePath,catalogPath,workers,fileExt):
     -------
-    The matchAndTrimBlanks() function takes a nested list of files, a
-    corresponding list of variable names and a new variable name and returns a
-    nested list containing matched files for differing variables
+    The makeCatalog() function scans a CMIP archive (e.g. /work/cmip-dyn) once,
+    parses each file name (parseDRS) and resolves the latest version of each
+    model group within each directory (as globAndTrim would), storing the
+    result in an SQLite catalog that globAndTrim then queries
 
     Author: Paul J. Durack : pauldurack@llnl.gov
 
-    Returns:
-    -------
-           Nested list containing input list and trimmed sublists
+    Inputs:
+    -----
+
+    |  **archivePath** - string root directory of the archive
+    |  **catalogPath** - string catalog file (default setCatalog/DUROLIB_CATALOG)
+    |  **workers <optional>** - int concurrent directory listings and
+    |    creation_date reads (network filesystems are latency bound)
+    |  **fileExt <optional>** - string file extension to catalog
+
+    Returns:
+    -------
+
+    |  **count** - int number of files catalogued, None on failure
+
+    Usage:
+    ------
+        >>> from durolib import makeCatalog,globAndTrim
+        >>> makeCatalog('/work/cmip-dyn/CMIP6','/p/user_pub/work/durack1/cmip6.sqlite',workers=32)
+        >>> globAndTrim('/work/cmip-dyn/CMIP6/CMIP/historical/atmos/mon/tas') ; # Catalog lookup
+        >>> globAndTrim(experiment='historical',variable='tas',realm='atmos')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, the catalog is written to a temporary file
+      and renamed so readers always see a complete catalog, see refreshCatalog
+      for incremental updates
+    - Files not following the DRS are catalogued but never returned as latest
+    """
+    import sqlite3
+    catalogPath = _catalogPath(catalogPath)
+    if catalogPath is None:
+        print('** makeCatalog: catalogPath required (or setCatalog/DUROLIB_CATALOG) **')
+        return None
+    archivePath = _normPath(archivePath)
+    if not os.path.isdir(archivePath):
+        print(''.join(['** makeCatalog: ',archivePath,' not found **']))
+        return None
+    dirs,files = _walkArchive([archivePath],workers,fileExt)
+    latest = _resolveLatest(files,workers)
+    tmpPath = ''.join([catalogPath,'.tmp',str(os.getpid())])
+    if os.path.exists(tmpPath):
+        os.remove(tmpPath)
+    conn = sqlite3.connect(tmpPath)
+    try:
+        with conn:
+            for statement in _catalogSchema:
+                conn.execute(statement)
+            conn.executemany('INSERT INTO meta VALUES (?,?)',
+                             [('root',archivePath),('fileExt',fileExt),
+                              ('version',str(_catalogVersion)),('created',str(time.time()))])
+            conn.executemany('INSERT INTO dirs VALUES (?,?)',sorted(dirs.items()))
+            conn.executemany('INSERT INTO files VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
+                             [_catalogRow(x,x in latest) for x in files])
+    finally:
+        conn.close()
+    os.rename(tmpPath,catalogPath)
+    _catalog['path'] = catalogPath
+    return len(files)
+
+_catalogVersion = 1
+_catalogSchema = ['CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)',
+                  'CREATE TABLE dirs (path TEXT PRIMARY KEY, mtime REAL)',
+                  'CREATE TABLE files (path TEXT PRIMARY KEY, dir TEXT, mip_era TEXT, '
+                  'experiment TEXT, institution TEXT, model TEXT, realisation TEXT, '
+                  'frequency TEXT, variable TEXT, realm TEXT, grid TEXT, version TEXT, '
+                  'groupKey TEXT, latest INTEGER)',
+                  'CREATE INDEX files_dir ON files (dir, latest)',
+                  'CREATE INDEX files_query ON files (variable, experiment, frequency, realm)']
+
+def _catalogRow(filePath,latest):
+    # files table row - DRS fields and trim group key
+    record = parseDRS(filePath)
+    key = _trimModelKey(filePath,report=False)[0] if record is not None else None
+    if record is None:
+        record = DRSRecord(*['']*len(DRSRecord._fields))
+    return (filePath,os.path.dirname(filePath),record.mip_era,record.experiment,
+            record.institution,record.model,record.realisation,record.frequency,
+            record.variable,record.realm,record.grid,record.version,key or '',int(latest))
+
+def _normPath(path):
+    # Absolute path without trailing separator
+    return os.path.normpath(os.path.abspath(path))
+
+def _scanDirectory(dirPath):
+    # One directory listing: (path, mtime, subdirectories, file names)
+    subdirs,files = [],[]
+    try:
+        mtime = os.stat(dirPath).st_mtime
+        with os.scandir(dirPath) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                    else:
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError as err:
+        print(''.join(['** Directory listing failed: ',dirPath,' - ',str(err),' **']))
+        return dirPath,None,[],[]
+    return dirPath,mtime,subdirs,files
+
+def _walkArchive(topDirs,workers,fileExt):
+    # Breadth first walk, each level of directories listed concurrently
+    dirs,files,seen = {},[],set()
+    level = list(topDirs)
+    while level:
+        nextLevel = []
+        for dirPath,mtime,subdirs,names in _mapWorkers(_scanDirectory,level,workers):
+            if mtime is None:
+                continue
+            dirs[dirPath] = mtime
+            files.extend([os.path.join(dirPath,x) for x in names if x.endswith(fileExt)])
+            for subdir in subdirs:
+                realPath = os.path.realpath(subdir)
+                if realPath not in seen: # Symlink loops
+                    seen.add(realPath)
+                    nextLevel.append(subdir)
+        level = nextLevel
+    files.sort()
+    return dirs,files
+
+def _resolveLatest(fileList,workers):
+    # Latest file of each (directory, model group), as trimModelList per directory
+    groups,versions = {},{}
+    for filePath in fileList:
+        key,ver1 = _trimModelKey(filePath,report=False)
+        if key is None:
+            continue
+        versions[filePath] = ver1
+        groups.setdefault((os.path.dirname(filePath),key),[]).append(filePath)
+    duplicates = [x for group in groups.values() if len(group) > 1 for x in group]
+    creationDates = dict(zip(duplicates,_mapWorkers(_readCreationDate,duplicates,workers)))
+    latest = set()
+    for group in groups.values():
+        if len(group) == 1:
+            latest.add(group[0])
+        else:
+            group = sorted(group)
+            latest.add(_latestVersionIndex(group,[versions[x] for x in group],
+                                           [creationDates[x] for x in group]))
+    return latest
+
+#%%
+def matchAndTrimBlanks(varList,listFilesList,newVarId,asArray=False):
+    """
+    Documentation for matchAndTrimBlanks():
+    -------
+    The matchAndTrimBlanks() function takes a nested list of files, a
+    corresponding list of variable names and a new variable name and returns a
+    nested list containing matched files for differing variables
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Returns:
+    -------
+           Nested list containing input list and trimmed sublists, or with
+           asArray=True a numpy structured array with one field per variable
+           plus outFile ('' where no match)
     Usage:
     ------
         >>> from durolib import matchAndTrimBlanks
@@ -814,47 +2284,74 @@ def matchAndTrimBlanks(varList,listFilesList,newVarId):
         >>> listFilesList = [so_fileList,tos_fileList,tas_fileList,wfo_fileList,fx_fileList]
         >>> newVarId = 'soMatches'
         >>> soMatches = matchAndTrimBlanks(varList,listFilesList,newVarId)
+        >>> soMatches = matchAndTrimBlanks(varList,listFilesList,newVarId,asArray=True)
+        >>> soMatches[soMatches['areacello'] != '']['so']
 
     Notes:
     -----
-        ...
+    - PJD 18 Oct 2026 - Match through per variable dictionaries (built once) rather
+      than list.index per master file, linear in files; first match still wins
     """
     masterVar = varList[0]
     outSlots = len(varList)+1
     varMatchList = [[None] * outSlots for i in range(len(listFilesList[0][0][:]))]
+    masterVarDot = ''.join(['.',masterVar,'.'])
+    newVarDot = ''.join(['.',newVarId,'.'])
+    # Index each variable list once - noRealm key, or model only for fixed fields
+    fxVars = [varId in _fxVariables for varId in varList]
+    varIndex = []
+    for y,fileList in enumerate(listFilesList):
+        if fxVars[y]:
+            keys = [_fxModelKey(fileList[0][z],noRealm) for z,noRealm in enumerate(fileList[3])]
+        else:
+            keys = fileList[3]
+        index = {}
+        for z,key in enumerate(keys):
+            index.setdefault(key,z)
+        varIndex.append(index)
     # For each model_noRealm in master List
     for x,modelNoRealm in enumerate(listFilesList[0][3][:]):
         varMatchList[x][0] = listFilesList[0][0][x]
-        masterVarDot = ''.join(['.',masterVar,'.'])
-        newVarDot = ''.join(['.',newVarId,'.'])
+        masterFx = None
         # For each variable list - Pair masterVar with matches
         for y in range(0,len(varList)):
             # Test if fixed field - only match model
-            if varList[y] in ['areacella','areacello','basin','deptho','orog','sftlf','sftof','volcello']:
-                masterTest = modelNoRealm.split('.')[0]
-                modOnly = True
+            if fxVars[y]:
+                if masterFx is None:
+                    masterFx = _fxModelKey(listFilesList[0][0][x],modelNoRealm)
+                masterTest = masterFx
             else:
                 masterTest = modelNoRealm
-                modOnly = False
-            # Use try to deal with non-index
-            try:
-                modTest = []
-                if modOnly:
-                    for z,model in enumerate(listFilesList[y][3]):
-                        modTest += [listFilesList[y][3][z].split('.')[0]]
-                else:
-                    modTest = listFilesList[y][3]
-                index = modTest.index(masterTest)
-                varMatchList[x][y] = listFilesList[y][0][index]
-            except:
+            index = varIndex[y].get(masterTest)
+            if index is None:
                 print(format(x,'03d'),''.join(['No ',varList[y],' match for ',masterVar,': ',modelNoRealm]))
+            else:
+                varMatchList[x][y] = listFilesList[y][0][index]
         # Create output fileName
         tmpStr = varMatchList[x][0].split('/')[-1]
         tmpStr = tmpStr.replace(masterVarDot,newVarDot).replace('.latestX.xml','.nc')
         varMatchList[x][outSlots-1] = tmpStr
         #varMatchList[x][outSlots-1] = replace(replace(varMatchList[x][0].split('/')[-1],masterVarDot,newVarDot),'.latestX.xml','.nc')
+    if asArray:
+        return _matchListToArray(varList,varMatchList)
     return varMatchList
 
+_fxVariables = set(['areacella','areacello','basin','deptho','orog','sftlf','sftof','volcello'])
+
+def _matchListToArray(varList,varMatchList):
+    # Nested match list to structured array, '' for no match
+    names = list(varList)+['outFile']
+    rows = [tuple(x or '' for x in row) for row in varMatchList]
+    widths = [max([len(row[i]) for row in rows]+[1]) for i in range(len(names))]
+    return np.array(rows,dtype=[(name,''.join(['U',str(width)])) for name,width in zip(names,widths)])
+
+def _fxModelKey(filePath,noRealm):
+    # Model-only match key for fixed fields
+    record = parseDRS(filePath)
+    if record is not None:
+        return record.model
+    return noRealm.split('.')[0]
+
 #%%
 def mkDirNoOSErr(newdir,mode=777):
 #def mkDirNoOSErr(newdir,mode=0777): Py3 doesn't accept leading zeros for numbers
@@ -884,10 +2381,337 @@ def mkDirNoOSErr(newdir,mode=777):
         if err.errno != errno.EEXIST or not os.path.isdir(newdir):
             raise
 
+#%%
+def multiPolyFit(var,predictors,order=1,interactions=True,full=False):
+    """
+    Documentation for multiPolyFit(var,predictors,order,interactions,full):
+    -------
+    The multiPolyFit() function regresses every grid point of var against
+    several predictors (e.g. time, a forcing index and an ENSO index) with
+    polynomial terms up to order, and their interaction (cross) terms, solved
+    as one batched least-squares problem over all grid points
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **var** - cdms2 variable or numpy (masked) array, time is dimension 0
+    |  **predictors** - list of 1D arrays, or a (time, predictor) array; a
+    |    (predictor, time) array is transposed (when the number of predictors
+    |    differs from the number of times)
+    |  **order <optional>** - int maximum total degree of each term
+    |  **interactions <optional>** - boolean include cross terms (x1*x2 ...),
+    |    otherwise only powers of single predictors
+    |  **full <optional>** - boolean also return fitted values and residuals
+
+    Returns:
+    -------
+
+    |  **coefs** - numpy array (nTerms,)+var.shape[1:]
+    |  **terms** - list of exponent tuples, one per coefficient, (0,0,...) is
+    |    the intercept, (1,0,...) the first predictor, (1,1,...) x1*x2 ...
+    |  **fitted** - (full=True) fitted field, same type and shape as var, NaN
+    |    (masked for masked/cdms2 input) at times with a missing predictor
+    |  **residuals** - (full=True) numpy array var.shape[1:], sum of squared residuals
+
+    Usage:
+    ------
+        >>> from durolib import multiPolyFit
+        >>> coefs,terms = multiPolyFit(tos,[years,forcing,nino34],order=2)
+        >>> ensoCoef = coefs[terms.index((0,0,1))]
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented following https://github.com/mrocklin/multipolyfit
+      with the fitPolynomial solver; masked/NaN values (and times with missing
+      predictors) are excluded, points with too few valid times return NaN
+    - PJD 18 Oct 2026 - Masked predictor values are treated as missing, order
+      is validated as fitPolynomial polyOrder
+    """
+    import itertools
+    if int(order) != order or order < 0:
+        print('** multiPolyFit error: order must be an int >= 0, exiting..')
+        return None
+    # Masked (and cdms2) predictors become NaN, i.e. missing times
+    if isinstance(predictors,np.ndarray):
+        design = np.ma.filled(np.ma.asarray(predictors,dtype='float64'),np.nan)
+    else:
+        design = np.array([np.ma.filled(np.ma.asarray(x,dtype='float64'),np.nan) for x in predictors])
+    data,meta = _splitVariable(var)
+    if design.ndim == 1:
+        design = design[:,np.newaxis]
+    elif not isinstance(predictors,np.ndarray):
+        design = design.T ; # List of predictor series
+    elif design.ndim == 2 and design.shape[0] != np.shape(data)[0] and design.shape[1] == np.shape(data)[0]:
+        design = design.T ; # (predictor, time) array
+    if design.ndim != 2 or design.shape[0] != np.shape(data)[0]:
+        print('** multiPolyFit error: predictors must each have var dimension 0 length, exiting..')
+        return None
+    terms = [x for x in itertools.product(range(int(order)+1),repeat=design.shape[1])
+             if sum(x) <= order and (interactions or sum(1 for y in x if y) <= 1)]
+    terms.sort(key=lambda x: (sum(x),[-y for y in x]))
+    basis = np.column_stack([np.prod(design**np.asarray(x),axis=1) for x in terms])
+    values = np.reshape(np.ma.getdata(data),(len(basis),-1))
+    valid = _validPoints(data,values)
+    predictorsValid = np.isfinite(basis).all(axis=1)
+    if not predictorsValid.all():
+        valid = (np.ones(values.shape,dtype=bool) if valid is None else valid) & predictorsValid[:,np.newaxis]
+        basis = np.where(predictorsValid[:,np.newaxis],basis,0.)
+    if valid is None:
+        coefs = _lstsqColumns(basis,values)
+    else:
+        coefs = _lstsqMaskedColumns(basis,values,valid)
+    coefShape = (len(terms),)+np.shape(data)[1:]
+    if not full:
+        return coefs.reshape(coefShape),terms
+    fitted = np.dot(basis,coefs)
+    squares = (values-fitted)**2
+    if valid is not None:
+        squares = np.where(valid,squares,0.)
+    residuals = squares.sum(axis=0)
+    residuals[np.isnan(coefs[0])] = np.nan
+    fitted[~predictorsValid] = np.nan ; # No fit where a predictor is missing
+    varFitted = fitted.reshape(np.shape(data))
+    if np.issubdtype(data.dtype,np.floating):
+        varFitted = varFitted.astype(data.dtype)
+    if np.ma.isMaskedArray(data):
+        varFitted = np.ma.masked_array(varFitted,mask=np.ma.getmaskarray(data) | np.isnan(varFitted))
+    return (coefs.reshape(coefShape),terms,_joinVariable(varFitted,meta),
+            residuals.reshape(np.shape(data)[1:]))
+
 #%%
 def outerLocals(depth=0):
+    import inspect
     return inspect.getouterframes(inspect.currentframe())[depth+1][0].f_locals
 
+#%%
+def parseDRS(filePath):
+    """
+    Documentation for parseDRS(filePath):
+    -------
+    The parseDRS() function parses a CMIP file path/name following the Data
+    Reference Syntax used in the CMIP xml/netcdf archives (cmip5, CMIP5 and
+    CMIP6 layouts) in a single compiled-regex pass
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Returns:
+    -------
+
+    |  **record** - DRSRecord (mip_era, activity, experiment, institution, model,
+    |    realisation, frequency, variable, realm, table, grid, version, suffix),
+    |    fields not present in a layout are '', None if the name is not DRS
+
+    Usage:
+    ------
+        >>> from durolib import parseDRS
+        >>> rec = parseDRS('CMIP6.CMIP.historical.NOAA-GFDL.GFDL-CM4.r1i1p1f1.mon.tas.atmos.glb-z1-gr1.v20180301.0000000.0.xml')
+        >>> rec.model,rec.version
+        ('GFDL-CM4', 'v20180301')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, shared by trimModelList, truncateVerInfo and matchAndTrimBlanks
+    cmip5: cmip5.ACCESS1-0.historical.r1i1p1.mo.atm.Amon.tas.ver-v20120329.latestX.xml
+    CMIP5/CMIP6: CMIP6.CMIP.piControl.IPSL.IPSL-CM6A-LR.r1i1p1f1.mon.hur.atmos.glb-l-gr.v20180314.0000000.0.xml
+    """
+    fileName = filePath[filePath.rfind('/')+1:]
+    match = _drsCmip5Old.match(fileName) or _drsCmip.match(fileName)
+    if match is None:
+        return None
+    fields = match.groupdict()
+    return DRSRecord(*[fields.get(x) or '' for x in DRSRecord._fields])
+
+DRSRecord = collections.namedtuple('DRSRecord',['mip_era','activity','experiment','institution',
+                                                 'model','realisation','frequency','variable',
+                                                 'realm','table','grid','version','suffix'])
+DRSRecord.__doc__ = 'Parsed CMIP Data Reference Syntax components, see parseDRS'
+_drsCmip5Old = re.compile(r'^(?P<mip_era>cmip5)\.(?P<model>[^.]+)\.(?P<experiment>[^.]+)\.'
+                          r'(?P<realisation>[^.]+)\.(?P<frequency>[^.]+)\.(?P<realm>[^.]+)\.'
+                          r'(?P<table>[^.]+)\.(?P<variable>[^.]+)\.ver-(?P<version>[^.]+)\.(?P<suffix>.+)$')
+_drsCmip = re.compile(r'^(?P<mip_era>CMIP[56])\.(?P<activity>[^.]+)\.(?P<experiment>[^.]+)\.'
+                      r'(?P<institution>[^.]+)\.(?P<model>[^.]+)\.(?P<realisation>[^.]+)\.'
+                      r'(?P<frequency>[^.]+)\.(?P<variable>[^.]+)\.(?P<realm>[^.]+)\.'
+                      r'(?P<grid>[^.]+)\.(?P<version>[^.]+)\.(?P<suffix>.+)$')
+
+#%%
+def parseDRSList(fileList):
+    """
+    Documentation for parseDRSList(fileList):
+    -------
+    The parseDRSList() function parses a whole listing with parseDRS and
+    returns a numpy structured array with one row per file
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Returns:
+    -------
+
+    |  **records** - structured array with a path field plus the DRSRecord
+    |    fields, non-DRS files have an empty mip_era
+
+    Usage:
+    ------
+        >>> from durolib import parseDRSList
+        >>> records = parseDRSList(glob.glob('/work/cmip-dyn/CMIP6/CMIP/historical/atmos/mon/tas/*.xml'))
+        >>> records[records['model'] == 'GFDL-CM4']['path']
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented
+    """
+    empty = DRSRecord(*['']*len(DRSRecord._fields))
+    rows = [(x,)+tuple(parseDRS(x) or empty) for x in fileList]
+    names = ('path',)+DRSRecord._fields
+    widths = [max([len(row[i]) for row in rows]+[1]) for i in range(len(names))]
+    dtype = [(name,''.join(['U',str(width)])) for name,width in zip(names,widths)]
+    return np.array(rows,dtype=dtype)
+
+#%%
+def readGlobalAttributes(filePath,attributes=None):
+    """
+    Documentation for readGlobalAttributes(filePath,attributes):
+    -------
+    The readGlobalAttributes() function returns the global attributes of a
+    CDML (xml) or netcdf file reading only the file header, the axes,
+    variables and file lists are never parsed
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **filePath** - string path to a .xml (CDML) or .nc file
+    |  **attributes <optional>** - list of attribute names, reading stops as
+    |    soon as these have been found
+
+    Returns:
+    -------
+
+    |  **atts** - dictionary of global attributes
+
+    Usage:
+    ------
+        >>> from durolib import readGlobalAttributes
+        >>> readGlobalAttributes(xmlFile,['creation_date']).get('creation_date')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented for trimModelList duplicate version resolution
+    - CDML is parsed incrementally and parsing stops at the first axis/variable
+    - netCDF classic (CDF1/CDF2/CDF5) headers are decoded directly, netCDF4/HDF5
+      files use netCDF4 (or cdms2 if netCDF4 is unavailable)
+    - PJD 18 Oct 2026 - If a metadata cache is configured (setMetadataCache or
+      DUROLIB_CACHE_DIR) attributes are served from it while file mtime/size are unchanged
+    """
+    conn = _metadataCacheConnection()
+    if conn is not None:
+        atts = _cachedGlobalAttributes(conn,filePath)
+    else:
+        atts = _readHeaderAttributes(filePath,attributes)
+    if attributes is not None:
+        atts = dict((k,atts[k]) for k in attributes if k in atts)
+    return atts
+
+def _readHeaderAttributes(filePath,attributes=None):
+    # Dispatch on file signature
+    with open(filePath,'rb') as f:
+        magic = f.read(8)
+    if magic[0:3] == b'CDF' and magic[3:4] in (b'\x01',b'\x02',b'\x05'):
+        atts = _readNetcdfClassicAttributes(filePath)
+    elif magic == b'\x89HDF\r\n\x1a\n':
+        atts = _readNetcdfLibraryAttributes(filePath)
+    else:
+        atts = _readCdmlAttributes(filePath,attributes)
+    return atts
+
+def _readCdmlAttributes(filePath,attributes=None):
+    # Stream CDML, collect dataset element attributes and leading <attr> children
+    import xml.etree.ElementTree as ET
+    atts = {} ; depth = 0
+    wanted = set(attributes) if attributes is not None else None
+    for event,elem in ET.iterparse(filePath,events=('start','end')):
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                atts.update(elem.attrib)
+                if wanted is not None and wanted.issubset(atts):
+                    break
+            elif depth == 2 and elem.tag != 'attr':
+                break ; # First axis/variable - header complete
+        else:
+            if depth == 2 and elem.tag == 'attr':
+                atts[elem.get('name')] = (elem.text or '').strip()
+                elem.clear()
+                if wanted is not None and wanted.issubset(atts):
+                    break
+            depth -= 1
+    return atts
+
+# netCDF classic type codes: (struct format, size)
+_netcdfTypes = {1: ('b',1),2: ('c',1),3: ('h',2),4: ('i',4),5: ('f',4),6: ('d',8),
+                7: ('B',1),8: ('H',2),9: ('I',4),10: ('q',8),11: ('Q',8)}
+
+def _readNetcdfClassicAttributes(filePath):
+    # Decode netCDF classic header up to the end of the global attribute list
+    import struct
+    with open(filePath,'rb') as f:
+        version = ord(f.read(4)[3:4])
+        countFmt,countSize = ('>q',8) if version == 5 else ('>i',4)
+        readCount = lambda: struct.unpack(countFmt,f.read(countSize))[0]
+        def readName():
+            n = readCount()
+            name = f.read(n+(-n % 4))[0:n]
+            return name.decode('utf-8')
+        readCount() ; # numrecs
+        # dim_list - skip dimensions
+        tag = struct.unpack('>i',f.read(4))[0] ; nelems = readCount()
+        for _ in range(nelems):
+            readName() ; readCount()
+        # gatt_list
+        atts = {}
+        tag = struct.unpack('>i',f.read(4))[0] ; nelems = readCount()
+        if tag != 12: # NC_ATTRIBUTE, else ABSENT
+            return atts
+        for _ in range(nelems):
+            name = readName()
+            ncType = struct.unpack('>i',f.read(4))[0]
+            n = readCount()
+            fmt,size = _netcdfTypes[ncType]
+            raw = f.read(n*size+(-(n*size) % 4))[0:n*size]
+            if fmt == 'c':
+                atts[name] = raw.decode('utf-8','replace').rstrip('\x00')
+            else:
+                values = struct.unpack(''.join(['>',str(n),fmt]),raw)
+                atts[name] = values[0] if n == 1 else list(values)
+    return atts
+
+# netCDF4/HDF5 (and cdms2) are not thread-safe, library opens from worker
+# threads are serialized on this lock
+_netcdfLock = threading.RLock()
+
+def _readNetcdfLibraryAttributes(filePath):
+    # netCDF4/HDF5 header via netCDF4, cdms2 used if netCDF4 is unavailable
+    try:
+        import netCDF4
+    except ImportError:
+        netCDF4 = None
+    with _netcdfLock:
+        if netCDF4 is not None:
+            f_h = netCDF4.Dataset(filePath,'r')
+            try:
+                atts = dict((x,f_h.getncattr(x)) for x in f_h.ncattrs())
+            finally:
+                f_h.close()
+        else:
+            f_h = cdm.open(filePath)
+            try:
+                atts = dict(f_h.attributes)
+            finally:
+                f_h.close()
+    return atts
+
 #%%
 def readJsonCreateDict(buildList, urlPrefix=''):
     """
@@ -918,6 +2742,11 @@ def readJsonCreateDict(buildList, urlPrefix=''):
         PJD 29 Jul 2020  - Updated to correct case when urlPrefix not supplied
         PJD 13 Nov 2020  - Updated for Py3
     """
+    import ssl
+    try:
+        from urllib2 import urlopen # py2
+    except ImportError:
+        from urllib.request import urlopen # py3
     # Test for list input of length == 2
     if len(buildList[0]) != 2:
         print('Invalid inputs, exiting..')
@@ -965,6 +2794,122 @@ def readJsonCreateDict(buildList, urlPrefix=''):
 
     return jsonDict
 
+#%%
+def refreshCatalog(catalogPath=None,workers=8):
+    """
+    Documentation for refreshCatalog(catalogPath,workers):
+    -------
+    The refreshCatalog() function brings an archive catalog (see makeCatalog) up
+    to date without rescanning the archive. Stored directories are stat'ed and
+    only those whose mtime changed are listed again, new subdirectories are
+    walked and vanished ones dropped. File inserts/deletes are applied and the
+    latest version is re-resolved only for the affected model groups
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **catalogPath** - string catalog file (default setCatalog/DUROLIB_CATALOG)
+    |  **workers <optional>** - int concurrent stat/listing/creation_date reads
+
+    Returns:
+    -------
+
+    |  **changes** - dict counts of changed directories, added and removed
+    |    files and re-resolved groups, None on failure
+
+    Usage:
+    ------
+        >>> from durolib import refreshCatalog
+        >>> refreshCatalog('/p/user_pub/work/durack1/cmip6.sqlite',workers=32) ; # After a publication batch
+        {'dirs': 12, 'added': 130, 'removed': 4, 'groups': 97}
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, changes are applied in a single transaction
+      after all directory listings and creation_date reads have completed
+    - A directory mtime only changes when entries are added, removed or renamed,
+      files rewritten in place need makeCatalog
+    """
+    import sqlite3
+    catalogPath = _catalogPath(catalogPath)
+    if catalogPath is None or not os.path.exists(catalogPath):
+        print(''.join(['** refreshCatalog: catalog not found: ',str(catalogPath),' **']))
+        return None
+    conn = sqlite3.connect(catalogPath,timeout=60.)
+    try:
+        fileExt = conn.execute("SELECT value FROM meta WHERE name='fileExt'").fetchone()[0]
+        storedDirs = dict(conn.execute('SELECT path,mtime FROM dirs').fetchall())
+        # Stat stored directories, list again only those that changed
+        dirPaths = sorted(storedDirs)
+        mtimes = dict(zip(dirPaths,_mapWorkers(_dirMtime,dirPaths,workers)))
+        removedDirs = [x for x in dirPaths if mtimes[x] is None]
+        changedDirs = [x for x in dirPaths if mtimes[x] is not None and mtimes[x] != storedDirs[x]]
+        newDirs,listedFiles,newSubdirs = {},{},[]
+        for dirPath,mtime,subdirs,names in _mapWorkers(_scanDirectory,changedDirs,workers):
+            if mtime is None:
+                removedDirs.append(dirPath)
+                continue
+            newDirs[dirPath] = mtime
+            listedFiles[dirPath] = set(os.path.join(dirPath,x) for x in names if x.endswith(fileExt))
+            newSubdirs.extend([x for x in subdirs if x not in storedDirs])
+        walkedDirs,walkedFiles = _walkArchive(newSubdirs,workers,fileExt)
+        newDirs.update(walkedDirs)
+        # Diff listings against stored files
+        added,removed = list(walkedFiles),[]
+        for dirPath in removedDirs:
+            removed.extend(x[0] for x in conn.execute(
+                'SELECT path FROM files WHERE dir=? OR (dir>? AND dir<?)',(dirPath,)+_subtreeRange(dirPath)))
+        for dirPath,files in listedFiles.items():
+            stored = set(x[0] for x in conn.execute('SELECT path FROM files WHERE dir=?',(dirPath,)))
+            added.extend(sorted(files-stored))
+            removed.extend(sorted(stored-files))
+        removed = sorted(set(removed)) ; # Nested removed directories overlap
+        # Model groups touched by the changes
+        groups = set()
+        for filePath in removed:
+            row = conn.execute('SELECT dir,groupKey FROM files WHERE path=?',(filePath,)).fetchone()
+            if row is not None and row[1]:
+                groups.add(row)
+        addedRows = [_catalogRow(x,False) for x in added]
+        groups.update((x[1],x[12]) for x in addedRows if x[12])
+        # Re-resolve latest version for affected groups only, file reads happen
+        # before the write transaction so the writer lock is held briefly
+        removedSet = set(removed)
+        groupFiles = set(x[0] for x in addedRows if x[12])
+        for dirPath,key in sorted(groups):
+            groupFiles.update(x[0] for x in conn.execute(
+                'SELECT path FROM files WHERE dir=? AND groupKey=?',(dirPath,key)) if x[0] not in removedSet)
+        groupFiles = sorted(groupFiles)
+        latest = _resolveLatest(groupFiles,workers)
+        with conn:
+            for dirPath in removedDirs:
+                conn.execute('DELETE FROM dirs WHERE path=? OR (path>? AND path<?)',(dirPath,)+_subtreeRange(dirPath))
+            conn.executemany('DELETE FROM files WHERE path=?',[(x,) for x in removed])
+            conn.executemany('INSERT OR REPLACE INTO files VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)',addedRows)
+            conn.executemany('INSERT OR REPLACE INTO dirs VALUES (?,?)',sorted(newDirs.items()))
+            conn.executemany('UPDATE files SET latest=? WHERE path=?',
+                             [(int(x in latest),x) for x in groupFiles])
+    except sqlite3.Error as err:
+        print(''.join(['** refreshCatalog failed: ',catalogPath,' - ',str(err),' **']))
+        return None
+    finally:
+        conn.close()
+    return {'dirs': len(changedDirs)+len(removedDirs),'added': len(added),
+            'removed': len(removed),'groups': len(groups)}
+
+def _dirMtime(dirPath):
+    # Directory mtime, None if it has gone
+    try:
+        return os.stat(dirPath).st_mtime
+    except OSError:
+        return None
+
+def _subtreeRange(dirPath):
+    # Ordered string bounds of the paths below dirPath ('0' follows '/')
+    return ''.join([dirPath,'/']),''.join([dirPath,'0'])
+
 #%%
 def santerTime(array,calendar=None):
         """
@@ -994,18 +2939,12 @@ def santerTime(array,calendar=None):
 
         Notes:
         -----
+        - PJD 18 Oct 2026 - Converts the whole axis with convertRelTime (vectorised),
+          calendar may also be a CF calendar name
         """
-        # Test calendar
-        if calendar:
-            cdtCalendar  = calendar
-        else:
-            cdtCalendar  = cdt.GregorianCalendar
         # Set time_since - months 1800-1-1
         time                = array.getTime()
-        time_new            = []
-        for tt in time:
-            reltime = cdt.reltime(tt,time.units)
-            time_new.append(reltime.torel('months since 1800-1-1',cdtCalendar).value)
+        time_new            = convertRelTime(time[:],time.units,'months since 1800-1-1',calendar)
         time_axis           = cdm.createAxis(time_new)
         time_axis.id        = 'time'
         time_axis.units     = 'months since 1800-1-1'
@@ -1032,13 +2971,269 @@ def scrubNaNAndMask(var,maskVar):
 
     Notes:
     -----
+    - PJD 18 Oct 2026 - numpy (masked) array inputs return a numpy.ma array
+      without CDAT, cdms2 inputs return MV2 variables as before
     """
-    # Check for NaNs
-    nanvals = isnan(var)
-    var[nanvals] = 1e+20
-    var = mv.masked_where(maskVar>=1e+20,var)
-    var = mv.masked_where(maskVar.mask,var)
-    return var
+    if _isCdmsVariable(var) or _isCdmsVariable(maskVar):
+        # Check for NaNs
+        nanvals = np.isnan(var)
+        var[nanvals] = 1e+20
+        var = mv.masked_where(maskVar>=1e+20,var)
+        var = mv.masked_where(maskVar.mask,var)
+        return var
+    # numpy backend - same result without modifying var in place
+    data = np.ma.getdata(var)
+    data = np.where(np.isnan(data),1e+20,data)
+    mask = np.ma.getmaskarray(var) | (np.ma.getdata(maskVar) >= 1e+20) | np.ma.getmaskarray(maskVar)
+    return np.ma.masked_array(data,mask=mask,fill_value=1e+20)
+
+#%%
+def setCalendarCache(maxEntries=128):
+    """
+    Documentation for setCalendarCache(maxEntries):
+    -------
+    The setCalendarCache() function sets the size of the in-memory LRU cache of
+    time and bounds arrays built by makeCalendar and fixInterpAxis, repeat calls
+    with the same arguments reuse the cached arrays. Cached arrays are read-only,
+    axes are created from copies
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **maxEntries** - int number of cached calendars, 0 disables the cache
+
+    Usage:
+    ------
+        >>> from durolib import setCalendarCache
+        >>> setCalendarCache(512)
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented
+    """
+    with _calendarCache['lock']:
+        _calendarCache['maxEntries'] = max(int(maxEntries),0)
+        entries = _calendarCache['entries']
+        while len(entries) > _calendarCache['maxEntries']:
+            entries.popitem(last=False)
+
+_calendarCache = {'maxEntries': 128,'entries': collections.OrderedDict(),'lock': threading.Lock()}
+
+def _cachedCalendar(key,builder):
+    # LRU lookup of read-only arrays, builder() called on a miss
+    with _calendarCache['lock']:
+        arrays = _calendarCache['entries'].get(key)
+        if arrays is not None:
+            _calendarCache['entries'].move_to_end(key)
+            return tuple(x.view() for x in arrays) ; # Views can not be made writeable
+    arrays = tuple(builder())
+    for array in arrays:
+        array.flags.writeable = False
+    with _calendarCache['lock']:
+        if _calendarCache['maxEntries'] > 0:
+            _calendarCache['entries'][key] = arrays
+            while len(_calendarCache['entries']) > _calendarCache['maxEntries']:
+                _calendarCache['entries'].popitem(last=False)
+    return tuple(x.view() for x in arrays)
+
+#%%
+def setCatalog(catalogPath=None):
+    """
+    Documentation for setCatalog(catalogPath):
+    -------
+    The setCatalog() function sets the default archive catalog (see makeCatalog)
+    used by globAndTrim
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **catalogPath** - string catalog file, None disables the catalog (unless
+    |    DUROLIB_CATALOG is set in the environment)
+
+    Usage:
+    ------
+        >>> from durolib import setCatalog,globAndTrim
+        >>> setCatalog('/p/user_pub/work/durack1/cmip6.sqlite')
+        >>> fileList = globAndTrim('/work/cmip-dyn/CMIP6/CMIP/historical/atmos/mon/tas')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented
+    """
+    _catalog['path'] = catalogPath
+
+_catalog = {'path': None}
+
+def _catalogPath(catalogPath=None):
+    # Explicit catalog, else setCatalog, else environment
+    return catalogPath or _catalog['path'] or os.environ.get('DUROLIB_CATALOG')
+
+def _queryCatalog(catalogPath,path,query,fileExt='.xml'):
+    # Latest files from the catalog, None if the catalog can not answer
+    import sqlite3
+    if not os.path.exists(catalogPath):
+        return None
+    try:
+        conn = sqlite3.connect(''.join(['file:',catalogPath,'?mode=ro']),uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        catalogExt = conn.execute("SELECT value FROM meta WHERE name='fileExt'").fetchone()
+        if catalogExt is None or catalogExt[0] != fileExt:
+            raise ValueError(''.join(['Catalog ',catalogPath,' indexes ',str(catalogExt and catalogExt[0]),
+                                      ' files, not ',fileExt,' - rebuild with makeCatalog(...,fileExt=',
+                                      repr(fileExt),')']))
+        where,args = ['latest=1'],[]
+        if path is not None:
+            path = _normPath(path)
+            if conn.execute('SELECT 1 FROM dirs WHERE path=?',(path,)).fetchone() is None:
+                return None ; # Directory not catalogued
+            where.append('dir=?') ; args.append(path)
+        for name in sorted(query):
+            where.append(''.join([name,'=?'])) ; args.append(query[name])
+        rows = conn.execute(''.join(['SELECT path FROM files WHERE ',' AND '.join(where),
+                                     ' ORDER BY path']),args).fetchall()
+    except sqlite3.Error as err:
+        print(''.join(['** Catalog query failed: ',catalogPath,' - ',str(err),' **']))
+        return None
+    finally:
+        conn.close()
+    return [x[0] for x in rows]
+
+#%%
+def setMetadataCache(cacheDir=None,maxEntries=1000000):
+    """
+    Documentation for setMetadataCache(cacheDir,maxEntries):
+    -------
+    The setMetadataCache() function configures the persistent (SQLite) cache of
+    file global attributes used by readGlobalAttributes, and so trimModelList.
+    Entries are keyed by file path and are only valid while the file mtime and
+    size are unchanged, the least recently used entries are evicted once the
+    cache holds more than maxEntries files
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **cacheDir** - string directory for metadata.sqlite, None disables the
+    |    cache (unless DUROLIB_CACHE_DIR is set in the environment)
+    |  **maxEntries <optional>** - int maximum number of cached files
+
+    Usage:
+    ------
+        >>> from durolib import setMetadataCache,trimModelList
+        >>> setMetadataCache('/p/user_pub/work/durack1/.durolibCache')
+        >>> fileListTrim = trimModelList(fileList) ; # Repeat trims read the cache
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, safe for concurrent batch jobs (SQLite
+      locking with a busy timeout) and for threads (one connection per thread)
+    - cdms_filemap is not cached
+    - PJD 18 Oct 2026 - maxEntries is enforced on every insert (row count kept by
+      triggers), numpy attribute values are restored with their dtype on a hit
+    """
+    _metadataCache['dir'] = cacheDir
+    _metadataCache['maxEntries'] = int(maxEntries)
+    _metadataCache['generation'] += 1 ; # Threads reconnect on next use
+
+_metadataCache = {'dir': None,'maxEntries': 1000000,'generation': 0,
+                  'local': None,'touchInterval': 3600.}
+
+def _metadataCacheConnection():
+    # Per-thread SQLite connection to the configured cache, None if disabled
+    cacheDir = _metadataCache['dir'] or os.environ.get('DUROLIB_CACHE_DIR')
+    if not cacheDir:
+        return None
+    import sqlite3, threading
+    if _metadataCache['local'] is None:
+        _metadataCache['local'] = threading.local()
+    local = _metadataCache['local']
+    dbPath = os.path.join(cacheDir,'metadata.sqlite')
+    if getattr(local,'key',None) == (dbPath,_metadataCache['generation']):
+        return local.conn
+    try:
+        mkDirNoOSErr(cacheDir,0o755)
+        conn = sqlite3.connect(dbPath,timeout=60.)
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS attributes (path TEXT PRIMARY KEY, '
+                         'mtime REAL, size INTEGER, atts TEXT, accessed REAL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS attributes_accessed ON attributes (accessed)')
+            # Row count kept by triggers, so the LRU bound is checked on every insert
+            conn.execute('CREATE TABLE IF NOT EXISTS entries (n INTEGER)')
+            if conn.execute('SELECT n FROM entries').fetchone() is None:
+                conn.execute('INSERT INTO entries SELECT count(*) FROM attributes')
+            conn.execute('CREATE TRIGGER IF NOT EXISTS attributes_insert AFTER INSERT ON attributes '
+                         'BEGIN UPDATE entries SET n=n+1; END')
+            conn.execute('CREATE TRIGGER IF NOT EXISTS attributes_delete AFTER DELETE ON attributes '
+                         'BEGIN UPDATE entries SET n=n-1; END')
+    except (OSError,sqlite3.Error) as err:
+        print(''.join(['** Metadata cache unavailable: ',dbPath,' - ',str(err),' **']))
+        return None
+    local.conn = conn
+    local.key = (dbPath,_metadataCache['generation'])
+    return conn
+
+def _cachedGlobalAttributes(conn,filePath):
+    # Read attributes through the cache, (path, mtime, size) must match
+    import sqlite3
+    filePath = os.path.abspath(filePath)
+    stat = os.stat(filePath)
+    now = time.time()
+    try:
+        row = conn.execute('SELECT mtime,size,atts,accessed FROM attributes WHERE path=?',
+                           (filePath,)).fetchone()
+        if row is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            # LRU bookkeeping, coarse to avoid a write per hit
+            if now-row[3] > _metadataCache['touchInterval']:
+                with conn:
+                    conn.execute('UPDATE attributes SET accessed=? WHERE path=?',(now,filePath))
+            return dict((k,_fromJsonValue(v)) for k,v in json.loads(row[2]).items())
+    except sqlite3.Error:
+        return _readHeaderAttributes(filePath)
+    atts = _readHeaderAttributes(filePath)
+    atts = dict((k,v) for k,v in atts.items() if k != 'cdms_filemap')
+    try:
+        with conn:
+            conn.execute('DELETE FROM attributes WHERE path=?',(filePath,))
+            conn.execute('INSERT INTO attributes VALUES (?,?,?,?,?)',
+                         (filePath,stat.st_mtime,stat.st_size,
+                          json.dumps(dict((k,_jsonValue(v)) for k,v in atts.items())),now))
+            _evictMetadataCache(conn)
+    except sqlite3.Error:
+        pass
+    return atts
+
+def _evictMetadataCache(conn):
+    # Drop least recently used entries beyond maxEntries, within the insert transaction
+    excess = conn.execute('SELECT n FROM entries').fetchone()[0]-_metadataCache['maxEntries']
+    if excess > 0:
+        conn.execute('DELETE FROM attributes WHERE path IN '
+                     '(SELECT path FROM attributes ORDER BY accessed LIMIT ?)',(excess,))
+
+def _jsonValue(value):
+    # Attribute values to json, numpy arrays/scalars tagged with their dtype so
+    # cache hits rebuild the types a direct read returns
+    if isinstance(value,bytes):
+        return value.decode('utf-8','replace')
+    if type(value).__module__ == 'numpy':
+        if hasattr(value,'shape') and value.shape != ():
+            return {'ndarray': value.tolist(),'dtype': value.dtype.str}
+        return {'scalar': value.item(),'dtype': value.dtype.str}
+    return value
+
+def _fromJsonValue(value):
+    # Inverse of _jsonValue
+    if isinstance(value,dict):
+        if 'ndarray' in value:
+            return np.array(value['ndarray'],dtype=value['dtype'])
+        return np.dtype(value['dtype']).type(value['scalar'])
+    return value
 
 #%%
 def smooth(array,method):
@@ -1064,6 +3259,7 @@ def sysCallTimeout(cmd,timeout):
     Notes:
     -----
     """
+    import subprocess
     start = time.time()
     p = subprocess.Popen(cmd,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE)
     while time.time() - start < timeout:
@@ -1074,13 +3270,98 @@ def sysCallTimeout(cmd,timeout):
     raise OSError('sysCallTimeout: System call timed out')
 
 #%%
-def trimModelList(modelFileList):
+def timeSlice(var,start,end,times=None,units=None,calendar=None,asSlice=False):
     """
-    Documentation for trimModelList(modelFileList):
+    Documentation for timeSlice(var,start,end,times,units,calendar,asSlice):
+    -------
+    The timeSlice() function selects the period start to end (inclusive) along
+    the time axis (dimension 0) of var. The dates are converted once into the
+    time units and calendar of var (convertRelTime) and located by binary search
+    on the raw time values, rather than converting every time value
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **var** - cdms2 variable, or numpy array with times and units
+    |  **start, end** - date strings ('1850', '1850-6', '1850-6-1 12:00:00') or
+    |    numbers already in the time units; an end date covers the whole of its
+    |    period ('2014' to the end of 2014, '2014-12' to the end of December)
+    |  **times <optional>** - increasing time values (default var time axis)
+    |  **units <optional>** - string time units (default var time axis)
+    |  **calendar <optional>** - calendar (default var time axis, else gregorian)
+    |  **asSlice <optional>** - boolean return the slice rather than the data
+
+    Returns:
+    -------
+
+    |  **subset** - var[slice], a view for numpy arrays, or the slice
+
+    Usage:
+    ------
+        >>> from durolib import timeSlice
+        >>> tas = timeSlice(tas,'1979','2014') ; # Jan 1979 to Dec 2014 inclusive
+        >>> sst = timeSlice(sstArray,'1979-1','2014-12',times=timeValues,units='days since 1850-1-1',calendar='noleap')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented
+    - PJD 18 Oct 2026 - End dates resolve to the end of their period (exclusive
+      start of the next), a full date-time end (with seconds) is inclusive
+    """
+    if times is None or units is None:
+        if not _isCdmsVariable(var):
+            print('** timeSlice error: times and units required for numpy input, exiting..')
+            return None
+        timeAxis = var.getTime()
+        times = timeAxis[:] if times is None else times
+        units = timeAxis.units if units is None else units
+        calendar = getattr(timeAxis,'calendar',None) if calendar is None else calendar
+    calendar = 'gregorian' if calendar is None else calendar
+    startValue,_ = _dateToRelTime(start,units,calendar)
+    endValue,endOpen = _dateToRelTime(end,units,calendar,periodEnd=True)
+    times = np.asarray(times)
+    index = slice(int(np.searchsorted(times,startValue,side='left')),
+                  int(np.searchsorted(times,endValue,side='left' if endOpen else 'right')))
+    if asSlice:
+        return index
+    return var[index]
+
+def _dateToRelTime(date,units,calendar,periodEnd=False):
+    # Date string to (value in units, open bound), numbers are returned unchanged.
+    # With periodEnd the value is the start of the next year/month/day/hour/minute
+    # given by the date precision, an open (exclusive) bound
+    if not isinstance(date,str):
+        return date,False
+    match = _dateTest.match(date.strip())
+    if match is None:
+        raise ValueError(''.join(['Invalid date: ',date]))
+    fields = [x for x in match.groups() if x is not None]
+    if len(fields) == 6 or not periodEnd:
+        base = ''.join(['-'.join((fields+['1','1'])[0:3]),' ',':'.join((fields[3:]+['0','0','0'])[0:3])])
+        return convertRelTime(0.,''.join(['days since ',base]),units,calendar),False
+    day = '-'.join((fields+['1','1'])[0:3])
+    if len(fields) <= 3:
+        unit = ['years','months','days'][len(fields)-1]
+        return convertRelTime(1.,''.join([unit,' since ',day]),units,calendar),True
+    # Hour/minute ends counted in whole seconds from the day start, avoids
+    # rounding the bound past a time value that falls exactly on it
+    seconds = int(fields[3])*3600+(int(fields[4])*60+60 if len(fields) == 5 else 3600)
+    return convertRelTime(float(seconds),''.join(['seconds since ',day]),units,calendar),True
+
+_dateTest = re.compile(r'^(-?\d+)(?:-(\d+)(?:-(\d+)(?:[ T]+(\d+)(?::(\d+)(?::(\d+(?:\.\d*)?))?)?)?)?)?$')
+
+#%%
+def trimModelList(modelFileList,workers=None):
+    """
+    Documentation for trimModelList(modelFileList,workers):
     -------
     The trimModelList(modelFileList) function takes a python list of model files
     and trims these for duplicates using file creation_date attribute along with
-    temporal ordering info obtained from the file version identifier
+    temporal ordering info obtained from the file version identifier. If workers
+    is set, creation_date attributes for all duplicate groups are read
+    concurrently by a pool of that many threads
 
     Author: Paul J. Durack : pauldurack@llnl.gov
 
@@ -1089,6 +3370,7 @@ def trimModelList(modelFileList):
         >>> modelFileList = glob.glob(os.path.join(filePath,'*.nc')) ; # provides full directory/file path
         >>> from durolib import trimModelList
         >>> modelFileListTrimmed = trimModelList(modelFileList)
+        >>> modelFileListTrimmed = trimModelList(modelFileList,workers=16) ; # e.g. GPFS/NFS mounts
 
     Notes:
     -----
@@ -1096,6 +3378,11 @@ def trimModelList(modelFileList):
     - PJD  1 Apr 2014 - Removed hard-coded ver- position
     - PJD  1 Apr 2014 - Added realisation test to ensure expected format
     - PJD 10 Oct 2018 - Updated to deal with new CMIPLib paths and filenames (CMIP6/CMIP5/cmip5 data)
+    - PJD 18 Oct 2026 - Added workers argument, creation_date reads are latency bound
+      on network filesystems so are overlapped; selection is unchanged
+    - PJD 18 Oct 2026 - Only CDML and netCDF classic headers are parsed concurrently,
+      netCDF4/HDF5 and cdms2 opens are serialized (those libraries are not thread-safe)
+    - PJD 18 Oct 2026 - creation_date strings are compared natively (cdtime not required)
 
     CMIP6:
 
@@ -1187,120 +3474,38 @@ Out[8]:
 
     # Sort list and declare output
     modelFileList.sort()
-    modelFileListTmp = []
     modelFileIndex = []
 
-    # Create test defaults
-    cmip5,cmip6 = [False for _ in range(2)]
-
-    # Create subset modelFileList
-    for file1 in modelFileList:
-        file1   = file1.split('/')[-1]
-        if 'cmip5' == file1.split('.')[0]:
-            cmip5 = True
-            #cmip5-test/historical/atm/mo/tas/
-            #cmip5.ACCESS1-0.historical.r1i1p1.mo.atm.Amon.tas.ver-1.latestX.xml
-            #cmip5.ACCESS1-0.historical.r1i1p1.mo.atm.Amon.tas.ver-v20120329.latestX.xml
-            mod     = file1.split('.')[1]
-            exp     = file1.split('.')[2]
-            rea     = file1.split('.')[3]
-            gridLab = 'x'
-            # Test rea for r1i1p111 format match
-            reaTest = re.compile('^r\d{1,2}i\d{1,2}p\d{1,3}')
-        elif file1.split('.')[0] in ['CMIP5','CMIP6']:
-            cmip6 = True
-            #cmip-dyn/CMIP6/CMIP/historical/atmos/mon/tas/
-            #CMIP6.CMIP.historical.NOAA-GFDL.GFDL-CM4.r1i1p1f1.mon.tas.atmos.glb-z1-gr1.v20180301.0000000.0.xml
-            mod     = file1.split('.')[4]
-            #print('mod:',mod)
-            exp     = file1.split('.')[2]
-            #print('exp:',exp)
-            rea     = file1.split('.')[5]
-            #print('rea:',rea)
-            gridLab = file1.split('.')[9]
-            #print('gridLab:',gridLab)
-            # Test rea for r1i1pf1 format match
-            if file1.split('.')[0] == 'CMIP5':
-                reaTest = re.compile('^r\d{1,2}i\d{1,2}p\d{1,3}')
-            elif file1.split('.')[0] == 'CMIP6':
-                reaTest = re.compile('^r\d{1,2}i\d{1,2}p\d{1,3}f\d{1,3}')
-
-        # Evaluate components
-        if not reaTest.match(rea):
-            #pdb.set_trace()
-            print('** Filename format invalid - rea: ',rea,', exiting.. **')
+    # Group file indices by model key (mod.exp.rea.gridLab) - single pass, linear in files
+    modelFileListTmpIndex = {}
+    modelFileListVersion = []
+    for index,file1 in enumerate(modelFileList):
+        key,ver1 = _trimModelKey(file1)
+        if key is None:
             return ''
-        modelFileListTmp.append('.'.join([mod,exp,rea,gridLab]))
-
-    # Create unique list and index
-    modelFileListTmpUnique = list(set(modelFileListTmp)) ; modelFileListTmpUnique.sort()
-    findMatches = lambda searchList,elem: [[i for i, x in enumerate(searchList) if x == e] for e in elem]
-    modelFileListTmpIndex = findMatches(modelFileListTmp,modelFileListTmpUnique)
-    #print 'tmp:',modelFileListTmp
-    #print 'Unique:',modelFileListTmpUnique
+        modelFileListVersion.append(ver1)
+        indexList = modelFileListTmpIndex.get(key)
+        if indexList is None:
+            modelFileListTmpIndex[key] = [index]
+        else:
+            indexList.append(index)
     #print 'Index:',modelFileListTmpIndex
 
-    # Loop through unique list
-    for count,modelNum in enumerate(modelFileListTmpIndex):
-        if len(modelFileListTmpIndex[count]) == 1: # Case single version
-            modelFileIndex.append(int(str(modelNum).strip('[]')))
+    # Get creation_date info from file headers for all duplicate groups
+    duplicateIndex = [index for indexList in modelFileListTmpIndex.values() if len(indexList) > 1
+                      for index in indexList]
+    creationDates = dict(zip(duplicateIndex,
+                             _mapWorkers(_readCreationDate,[modelFileList[i] for i in duplicateIndex],workers)))
+
+    # Loop through unique keys
+    for key in sorted(modelFileListTmpIndex):
+        indexList = modelFileListTmpIndex[key]
+        if len(indexList) == 1: # Case single version
+            modelFileIndex.append(indexList[0])
         else: # Case multiple versions
-            # Get version and creation_date info from file
-            modelFileListVersion = [] ; modelFileListCreationDate = [] ; modelFileListIndex = []
-            for index in modelFileListTmpIndex[count]:
-                f_h = cdm.open(modelFileList[index])
-                if cmip5:
-                    file1 = modelFileList[index].split('/')[-1]
-                    #print file1
-                    #print 'new:',str([count for count,x in enumerate(file1.split('.')) if 'ver-' in x]).strip('[]')
-                    verInd = int(str([count for count,x in enumerate(file1.split('.')) if 'ver-' in x]).strip('[]'))
-                    ver1 = file1.split('.')[verInd].replace('ver-','')
-                    CD = f_h.creation_date
-                    modelFileListVersion.append(ver1)
-                    modelFileListCreationDate.append(CD)
-                    modelFileListIndex.append(index)
-                elif cmip6:
-                    ver1 = file1.split('.')[10]
-                    CD = f_h.creation_date
-                    modelFileListVersion.append(ver1)
-                    modelFileListCreationDate.append(CD)
-                    modelFileListIndex.append(index)
-                else:
-                    print('** mip_era unidentified, exiting.. **')
-                f_h.close()
-            #print modelFileListVersion
-            #print modelFileListCreationDate
-
-            # Use creation_date to determine latest file
-            listLen = len(modelFileListCreationDate)
-            modelFileListCreationDate = map(string.replace,modelFileListCreationDate,['T',]*listLen, [' ',]*listLen)
-            modelFileListCreationDate = map(cdt.s2c,modelFileListCreationDate)
-            modelFileListCreationDate = map(cdt.c2r,modelFileListCreationDate,['days since 1-1-1',]*listLen)
-            modelFileListCreationDate = [x.value for x in modelFileListCreationDate]
-            maxes = [i for i,x in enumerate(modelFileListCreationDate) if x == max(modelFileListCreationDate)]
-            ver = [modelFileListVersion[i] for i in maxes]
-            ind = [modelFileListIndex[i] for i in maxes]
-            #print modelFileListCreationDate
-            #print maxes,ver,ind
-
-            # If creation_dates match check version info to determine latest file
-            indTest = '-' ; #verTest = '-'
-            if len(maxes) > 1:
-                pubTest = 0 ; dateTest = 0;
-                for count,ver1 in reversed(list(enumerate(ver))):
-                    # Take datestamp versioned data
-                    if 'v' in ver1 and ver1 > dateTest:
-                        #verTest = ver[count]
-                        indTest = ind[count]
-                        dateTest = ver1
-                    # Use published data preferentially: 1,2,3,4, ...
-                    if ver1.isdigit() and ver1 > pubTest:
-                        indTest = ind[count]
-                        pubTest = ver1
-                modelFileIndex.append(int(str(indTest).strip('[]')))
-            else:
-                modelFileIndex.append(int(str(ind).strip('[]')))
-            #print pubTest,dateTest
+            modelFileIndex.append(_latestVersionIndex(indexList,
+                                                      [modelFileListVersion[i] for i in indexList],
+                                                      [creationDates[i] for i in indexList]))
 
     # Trim original list with new index
     modelFileListTrimmed = [modelFileList[i] for i in modelFileIndex]
@@ -1308,6 +3513,85 @@ Out[8]:
     #return modelFileListTrimmed,modelFileIndex,modelFileListTmp,modelFileListTmpUnique,modelFileListTmpIndex ; # Debugging
     return modelFileListTrimmed
 
+# Realisation formats - compiled once rather than per file
+_reaTestCmip5 = re.compile(r'^r\d{1,2}i\d{1,2}p\d{1,3}')
+_reaTestCmip6 = re.compile(r'^r\d{1,2}i\d{1,2}p\d{1,3}f\d{1,3}')
+
+def _trimModelKey(filePath,report=True):
+    # Return trimModelList grouping key (mod.exp.rea.gridLab) and version string
+    record = parseDRS(filePath)
+    if record is None:
+        if report:
+            print('** mip_era unidentified - file: ',filePath.split('/')[-1],', exiting.. **')
+        return None,None
+    # Evaluate components - test rea for r1i1p1 (cmip5/CMIP5) or r1i1p1f1 (CMIP6) format match
+    reaTest = _reaTestCmip6 if record.mip_era == 'CMIP6' else _reaTestCmip5
+    if not reaTest.match(record.realisation):
+        if report:
+            print('** Filename format invalid - rea: ',record.realisation,', exiting.. **')
+        return None,None
+    gridLab = record.grid or 'x'
+    return '.'.join([record.model,record.experiment,record.realisation,gridLab]),record.version
+
+def _mapWorkers(func,items,workers=None):
+    # Ordered map, through a thread pool when workers > 1
+    if workers is None or workers <= 1 or len(items) < 2:
+        return [func(x) for x in items]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=int(workers)) as pool:
+        return list(pool.map(func,items))
+
+def _readCreationDate(filePath):
+    # Header-only creation_date read, full cdms2 open only if the header lacks it
+    creationDate = readGlobalAttributes(filePath,['creation_date']).get('creation_date')
+    if creationDate is None:
+        with _netcdfLock:
+            f_h = cdm.open(filePath)
+            try:
+                creationDate = f_h.creation_date
+            finally:
+                f_h.close()
+    return creationDate
+
+def _latestVersionIndex(indexList,versions,creationDates):
+    # Pick latest file from a duplicate group: latest creation_date, then version info
+    # Use creation_date to determine latest file
+    creationDates = [_creationDateKey(x) for x in creationDates]
+    maxDate = max(creationDates)
+    maxes = [i for i,x in enumerate(creationDates) if x == maxDate]
+    ver = [versions[i] for i in maxes]
+    ind = [indexList[i] for i in maxes]
+
+    # If creation_dates match check version info to determine latest file
+    if len(maxes) > 1:
+        return _versionTieBreak(ind,ver)
+    return ind[0]
+
+def _creationDateKey(creationDate):
+    # Sortable (year, month, day, hour, minute, second) from an ISO creation_date
+    # ('2012-07-27T12:34:56Z', '2012-7-27 12:34:56'), unparseable dates sort first
+    match = _creationDateTest.match(str(creationDate).strip())
+    if match is None:
+        return (-float('inf'),)
+    return tuple(float(x) if x else 0. for x in match.groups())
+
+_creationDateTest = re.compile(r'^(-?\d+)-(\d+)-(\d+)(?:[ T]+(\d+)(?::(\d+)(?::(\d+(?:\.\d*)?))?)?)?')
+
+def _versionTieBreak(ind,ver):
+    # Latest of equal creation_date files: published integer versions (compared
+    # numerically, 10 > 9) take precedence over datestamp (v...) versions
+    indTest = ind[0] ; pubTest = -1 ; dateTest = ''
+    for count,ver1 in reversed(list(enumerate(ver))):
+        # Take datestamp versioned data
+        if 'v' in ver1 and ver1 > dateTest:
+            indTest = ind[count]
+            dateTest = ver1
+        # Use published data preferentially: 1,2,3,4, ...
+        if ver1.isdigit() and int(ver1) > pubTest:
+            indTest = ind[count]
+            pubTest = int(ver1)
+    return indTest
+
 #%%
 def truncateVerInfo(fileList,varId,modelSuite):
     """
@@ -1332,20 +3616,185 @@ def truncateVerInfo(fileList,varId,modelSuite):
 
     Notes:
     -----
-        ...
+        PJD 18 Oct 2026 - Keys for cmip5, CMIP5 and CMIP6 names are built from
+                          parseDRS fields (version, then realm/frequency dropped)
     """
     fileList_noVar,fileList_noVer,fileList_noRealm = [[] for _ in range(3)]
-    varId = ''.join(['.',varId])
     for infile in fileList:
-        #tmp = replace(replace(replace(infile.split('/')[-1],varId,''),''.join([modelSuite,'.']),''),'.latestX.xml','')
-        tmp = infile.split('/')[-1].replace(varId,'').replace(''.join([modelSuite,'.']),'').replace('.latestX.xml','')
-        fileList_noVar += [tmp];
-        tmp = '.'.join(tmp.split('.')[0:-1]) ; # truncate version info
-        fileList_noVer += [tmp]
-        tmp = '.'.join(tmp.split('.')[0:-3]) ; # truncate realm and temporal info
-        fileList_noRealm += [tmp]
+        noVar,noVer,noRealm = _truncateKeys(infile,varId,modelSuite)
+        fileList_noVar.append(noVar)
+        fileList_noVer.append(noVer)
+        fileList_noRealm.append(noRealm)
     return [fileList,fileList_noVar,fileList_noVer,fileList_noRealm]
 
+def _truncateKeys(infile,varId,modelSuite):
+    # noVar, noVer and noRealm keys for truncateVerInfo, built from parsed DRS fields
+    #  cmip5.ACCESS1-0.historical.r1i1p1.mo.atm.Amon.tas.ver-1.latestX.xml ->
+    #   ACCESS1-0.historical.r1i1p1.mo.atm.Amon.ver-1, ....mo.atm.Amon, ACCESS1-0.historical.r1i1p1
+    #  CMIP6.CMIP.historical.NOAA-GFDL.GFDL-CM4.r1i1p1f1.mon.tas.atmos.glb-z1-gr1.v20180301.0000000.0.xml ->
+    #   GFDL-CM4.historical.r1i1p1f1.mon.atmos.glb-z1-gr1.v20180301, ....mon.atmos.glb-z1-gr1, GFDL-CM4.historical.r1i1p1f1
+    record = parseDRS(infile)
+    if record is not None and record.mip_era == modelSuite and record.variable == varId:
+        noRealm = '.'.join([record.model,record.experiment,record.realisation])
+        if record.mip_era == 'cmip5':
+            noVer = '.'.join([noRealm,record.frequency,record.realm,record.table])
+            noVar = '.'.join([noVer,''.join(['ver-',record.version])])
+        else:
+            noVer = '.'.join([noRealm,record.frequency,record.realm,record.grid])
+            noVar = '.'.join([noVer,record.version])
+        return noVar,noVer,noRealm
+    # Non-DRS names - strip variable, suite and suffix from file name
+    noVar = infile.split('/')[-1]
+    if varId:
+        noVar = noVar.replace(''.join(['.',varId]),'')
+    if modelSuite:
+        noVar = noVar.replace(''.join([modelSuite,'.']),'')
+    noVar = noVar.replace('.latestX.xml','')
+    if not varId or not modelSuite:
+        noVar = os.path.splitext(noVar)[0] ; # nothing to strip (FileCatalog varId=None), drop extension only
+    noVer = '.'.join(noVar.split('.')[0:-1]) ; # truncate version info
+    noRealm = '.'.join(noVer.split('.')[0:-3]) ; # truncate realm and temporal info
+    return noVar,noVer,noRealm
+
+#%%
+def updateBranchTimeStore(cmipPath,storePath=None,workers=8,fileExt='.nc'):
+    """
+    Documentation for updateBranchTimeStore():
+    -------
+    The updateBranchTimeStore() function walks a CMIP6 directory tree, reads
+    the branch global attributes of each file and adds/updates the matching
+    (source_id, experiment_id, variant_label) entries in the branch time store
+    read by cmipBranchTime
+
+    Author: Paul J. Durack : pauldurack@llnl.gov
+
+    Inputs:
+    -----
+
+    |  **cmipPath** - string root of directory tree to scan
+    |  **storePath <optional>** - string path of store to update, defaults to
+    |    DUROLIB_BRANCHTIME_STORE; the distributed store is never written
+    |  **workers <optional>** - int size of the attribute reading thread pool
+    |  **fileExt <optional>** - string file extension to scan
+
+    Returns:
+    -------
+
+    |  **counts** - dictionary of scanned, updated and removed file counts
+
+    Usage:
+    ------
+        >>> from durolib import updateBranchTimeStore
+        >>> updateBranchTimeStore('/p/css03/esgf_publish/CMIP6/CMIP','CMIP6.bts',workers=16)
+        >>> cmipBranchTime('CESM2','historical','r1i1p1f1',storePath='CMIP6.bts')
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Implemented, only files whose mtime or size changed since
+      the last update are re-read (state is kept in storePath.sources.json)
+    - A new store is seeded with the distributed CMIP5 entries
+    - PJD 18 Oct 2026 - netCDF4/HDF5 files are opened under a module lock as
+      those libraries are not thread-safe, classic headers are read in parallel
+    - PJD 18 Oct 2026 - storePath (or DUROLIB_BRANCHTIME_STORE) is required, the
+      store installed with durolib is shared (and may be read-only)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    if storePath is None:
+        storePath = os.environ.get('DUROLIB_BRANCHTIME_STORE')
+    if storePath is None:
+        print('** updateBranchTimeStore: storePath (or DUROLIB_BRANCHTIME_STORE) required, exiting.. **')
+        return None
+    sourcesPath = ''.join([storePath,'.sources.json'])
+
+    # Load existing store or seed from distributed store
+    seedPath = storePath if os.path.exists(storePath) else os.path.join(_getDataPath(),_branchTimeStoreName)
+    rows = {}
+    if os.path.exists(seedPath):
+        header,records = _readBranchTimeStore(seedPath)
+        for record in records:
+            row = dict((name,record[name].decode('utf-8') if isinstance(record[name],bytes) else float(record[name]))
+                       for name in records.dtype.names)
+            rows[tuple(row[k] for k in _branchTimeKeys)] = row
+        del(records)
+    sources = {}
+    if os.path.exists(sourcesPath) and seedPath == storePath:
+        with open(sourcesPath,'r') as f:
+            sources = json.load(f)
+
+    # Walk tree, note new or changed files
+    found = {} ; changed = []
+    for dirPath,dirNames,fileNames in os.walk(cmipPath):
+        dirNames.sort()
+        for fileName in sorted(fileNames):
+            if not fileName.endswith(fileExt):
+                continue
+            filePath = os.path.join(dirPath,fileName)
+            try:
+                stat = os.stat(filePath)
+            except OSError:
+                continue
+            found[filePath] = [stat.st_mtime,stat.st_size]
+            old = sources.get(filePath)
+            if old is None or old[0:2] != found[filePath]:
+                changed.append(filePath)
+
+    # Read global attributes of changed files with bounded thread pool
+    with ThreadPoolExecutor(max_workers=max(int(workers),1)) as pool:
+        attributes = list(pool.map(_readBranchAttributes,changed))
+
+    # Drop entries sourced only from removed or changed files
+    removed = [x for x in sources if x not in found]
+    for filePath in removed+changed:
+        sources.pop(filePath,None)
+    liveKeys = set(tuple(x[2]) for x in sources.values())
+    staleKeys = set(key for key,row in rows.items()
+                    if row.get('valid') == _branchTimeAttributeSource and key not in liveKeys)
+    # Merge new entries, latest creation_date wins where files share a member
+    for filePath,row in zip(changed,attributes):
+        if row is None:
+            continue
+        key = tuple(row[k] for k in _branchTimeKeys)
+        sources[filePath] = found[filePath]+[list(key)]
+        staleKeys.discard(key)
+        if key in rows and rows[key].get('valid') == _branchTimeAttributeSource and \
+           rows[key].get('creation_date','') > row['creation_date']:
+            continue
+        rows[key] = row
+    for key in staleKeys:
+        rows.pop(key,None)
+
+    # Write store and file state
+    _writeBranchTimeStore(list(rows.values()),storePath)
+    tmpPath = ''.join([sourcesPath,'.tmp',str(os.getpid())])
+    with open(tmpPath,'w') as f:
+        json.dump(sources,f)
+    os.rename(tmpPath,sourcesPath)
+
+    return {'scanned': len(found),'updated': len(changed),'removed': len(removed)}
+
+_branchTimeAttributeSource = 'file global attributes'
+
+def _readBranchAttributes(filePath):
+    # Convert CMIP6 branch global attributes to a branch time store row
+    try:
+        atts = readGlobalAttributes(filePath)
+    except Exception as err:
+        print(''.join(['** updateBranchTimeStore: unable to read ',filePath,' - ',str(err),' **']))
+        return None
+    if 'source_id' not in atts or 'experiment_id' not in atts or 'variant_label' not in atts:
+        return None
+    parentExp = str(atts.get('parent_experiment_id',''))
+    parentRip = str(atts.get('parent_variant_label',''))
+    return {'model': str(atts['source_id']),'experiment': str(atts['experiment_id']),
+            'rip': str(atts['variant_label']),
+            'branch_time_relative': _branchTimeValue(atts.get('branch_time_in_parent')),
+            'branch_time_in_child': _branchTimeValue(atts.get('branch_time_in_child')),
+            'parent_time_units': str(atts.get('parent_time_units','')),
+            'parent_exp_rip': '.'.join([parentExp,parentRip]) if parentExp else '',
+            'valid': _branchTimeAttributeSource,
+            'creation_date': str(atts.get('creation_date','')),
+            'tracking_id': str(atts.get('tracking_id',''))}
+
 #%%
 def writeToLog(logFilePath,textToWrite):
     """
@@ -1387,19 +3836,61 @@ def writePacked(var,fileObject='tmp.nc'):
     ------
         >>> from durolib import writePacked
         >>> writePacked(var,'16bitPacked.nc')
+        >>> packed,scale_factor,add_offset = writePacked(numpyArray,None)
 
     Notes:
     -----
-        TODO: clean up fileObject existence..
+        PJD 18 Oct 2026 - numpy (masked) array input with fileObject=None returns
+                          the packed int16 array, scale_factor and add_offset
+        PJD 18 Oct 2026 - Values are rounded (not truncated) to the nearest packed
+                          level, scale_factor = (max-min)/(2**16-1)
+        PJD 18 Oct 2026 - Masked or non-finite values are written as _FillValue
+                          (-32768), the valid range is then -32767..32767
+        PJD 18 Oct 2026 - cdms2 input with fileObject=None returns the packed
+                          cdms2 variable, string fileObject paths are opened/closed
         TODO: deal with incredibly slow write-times
         TODO: deal with input data precision
     """
     #varType             = var.dtype
-    varMin              = var.min()
-    varMax              = var.max()
-    var.scale_factor    = np.float32((varMax-varMin)/(2**16)-1)
-    var.add_offset      = np.float32(varMin+var.scale_factor*(2**15))
-    if 'tmp.nc' in fileObject:
-        fileObject = cdm.open(fileObject,'w')
-    fileObject.write((var-var.add_offset)/var.scale_factor,dtype=np.int16)
+    data,meta           = _splitVariable(var)
+    data                = np.ma.masked_invalid(data)
+    missing             = np.ma.getmaskarray(data).any()
+    packedMin           = -2**15+1 if missing else -2**15 ; # Reserve _FillValue level
+    varMin              = data.min()
+    varMax              = data.max()
+    if varMin is np.ma.masked:
+        varMin = varMax = 0. ; # All missing
+    scale_factor        = np.float32((varMax-varMin)/(2**15-1-packedMin))
+    add_offset          = np.float32(varMin-scale_factor*packedMin)
+    if scale_factor == 0:
+        scale_factor    = np.float32(1.) ; # Constant field packs to 0
+        add_offset      = np.float32(varMin)
+    packed              = np.clip(np.round((data-add_offset)/scale_factor),packedMin,2**15-1)
+    packed              = np.ma.filled(packed,_packedFillValue).astype(np.int16)
+    if missing:
+        packed = np.ma.masked_equal(packed,_packedFillValue)
+        packed.set_fill_value(_packedFillValue)
+    if meta is None and fileObject is None:
+        return packed,scale_factor,add_offset
+    if meta is None:
+        meta = {'id': 'var','axes': None,'attributes': {}}
+    for key in ('_FillValue','missing_value'):
+        meta['attributes'].pop(key,None) ; # Unpacked missing values do not apply
+    meta['attributes'].update({'scale_factor': scale_factor,'add_offset': add_offset})
+    if missing:
+        meta['attributes'].update({'_FillValue': np.int16(_packedFillValue),
+                                   'missing_value': np.int16(_packedFillValue)})
+    var = _joinVariable(packed,meta)
+    if fileObject is None:
+        return var,scale_factor,add_offset
+    if isinstance(fileObject,str):
+        f_h = cdm.open(fileObject,'w')
+        try:
+            f_h.write(var,dtype=np.int16)
+        finally:
+            f_h.close()
+    else:
+        fileObject.write(var,dtype=np.int16)
     return
+
+_packedFillValue = -2**15
@@ -1,28 +1,17 @@
 # -*- coding: utf-8 -*-
 import gc,os,pdb #,sys
-import cdms2 as cdm
-import cdutil as cdu
-import MV2 as mv
 import numpy as np
 np.seterr(all='ignore') ; # Cautious use of this turning all error reporting off - shouldn't be an issue as using masked arrays
 import seawater as sw ; # was seawater.csiro - 180730 installed python-seawater into cdat80py2 (ocean)
-from durolib import getGitInfo,globalAttWrite,scrubNaNAndMask
+# cdms2/cdutil/MV2 are imported on first use - netcdf file criterion (compression,
+# autobounds) are set by durolib when cdms2 is first loaded
+from durolib import cdm,cdu,mv,getGitInfo,globalAttWrite,scrubNaNAndMask
 from numpy import array,tile,shape,transpose ; #mod
 from scipy import interpolate
-from string import replace
 #import matplotlib as plt
 #from matplotlib.cm import RdBu_r
 #import seawater.gibbs as teos10
 
-#%% Set netcdf file criterion - turned on from default 0s
-cdm.setCompressionWarnings(0) ; # Suppress warnings
-cdm.setNetcdfShuffleFlag(0)
-cdm.setNetcdfDeflateFlag(1)
-cdm.setNetcdfDeflateLevelFlag(9)
-# Hi compression: 1.4Gb file ; # Single salt variable
-# No compression: 5.6Gb ; Standard (compression/shuffling): 1.5Gb ; Hi compression w/ shuffling: 1.5Gb
-cdm.setAutoBounds(1) ; # Ensure bounds on time and depth axes are generated
-
 #%%
 def makeSteric(salinity,salinityChg,temp,tempChg,outFileName,thetao,pressure):
     """
@@ -68,6 +57,7 @@ def makeSteric(salinity,salinityChg,temp,tempChg,outFileName,thetao,pressure):
     - PJD 13 Oct 2014 - FIXED: bug with calculation of rho_halo variable was calculating gpan
     - PJD 13 Oct 2014 - Added alternate calculation of halosteric anomaly (direct salinity anomaly calculation, rather than total-thermosteric)
     - PJD 13 Oct 2014 - Added makeSteric_version as a global attribute
+    - PJD 18 Oct 2026 - Numeric core split into makeStericFields (plain numpy, no CDAT)
     - TODO: Better deal with insitu vs thetao variables
     - TODO: Query Charles on why *.name attributes are propagating
     - TODO: validate outputs and compare to matlab versions - 10e-7 errors.
@@ -129,69 +119,26 @@ def makeSteric(salinity,salinityChg,temp,tempChg,outFileName,thetao,pressure):
     temp_chg.setAxis(0,depth)
     del(depth)
 
-    # Convert using python-seawater library (v3.3.1 - 130807)
-    if thetao:
-        # Process potential temperature to in-situ - default conversion sets reference pressure to 0 (surface)
-        #temp_chg                = sw.temp(np.array(so),np.array(temp_chg),np.array(pressure_levels)); # units degrees C
-        #temp                    = sw.temp(np.array(so),np.array(temp),np.array(pressure_levels)); # units degrees C
-        #temp_chg                = sw.ptmp(np.array(so),np.array(temp_chg),np.array(pressure_levels),np.array(pressure_levels)); # units degrees C
-        #temp                    = sw.ptmp(np.array(so),np.array(temp),np.array(pressure_levels),np.array(pressure_levels)); # units degrees C
-        temp_chg                = np.array(temp_chg); # units degrees C
-        temp                    = np.array(temp); # units degrees C
-
-    # Climatologies - rho,cp,steric_height
-    rho                         = sw.dens(np.array(so),np.array(temp),np.array(pressure_levels)) ; # units kg m-3
-    cp                          = sw.cp(np.array(so),np.array(temp),np.array(pressure_levels)) ; # units J kg-1 C-1
-    steric_height               = sw.gpan(np.array(so),np.array(temp),np.array(pressure_levels)) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-
-    # Halosteric - rho,cp
-    ss                          = map(array,(so+so_chg))
-    rho_halo                    = sw.dens(np.array(ss),np.array(temp),np.array(pressure_levels)) ; # units kg m-3
-    cp_halo                     = sw.cp(np.array(ss),np.array(temp),np.array(pressure_levels)) ; # units J kg-1 C-1
-    tmp                         = sw.gpan(np.array(ss),np.array(temp),np.array(pressure_levels)) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-    steric_height_halo_anom2    = tmp-steric_height ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-
-    # Full steric - steric_height
-    tt                          = map(array,(temp+temp_chg))
-    tmp                         = sw.gpan(np.array(ss),np.array(tt),np.array(pressure_levels)) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-    steric_height_anom          = tmp-steric_height ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-    del(ss,tmp) ; gc.collect()
-
-    # Thermosteric - rho,cp,steric_height
-    rho_thermo                  = sw.dens(np.array(so),np.array(tt),np.array(pressure_levels)) ; # units kg m-3
-    cp_thermo                   = sw.cp(np.array(so),np.array(tt),np.array(pressure_levels)) ; # units J kg-1 C-1
-    tmp                         = sw.gpan(np.array(so),np.array(tt),np.array(pressure_levels)) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-    steric_height_thermo_anom   = tmp-steric_height ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-    del(tt,tmp) ; gc.collect()
-
-    # Halosteric - steric_height
-    steric_height_halo_anom     = steric_height_anom-steric_height_thermo_anom ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
-
-    # Create heat content
-    heat_content                = np.array(temp)*np.array(rho)*np.array(cp) ; # units J
-    heat_content_sanom          = np.array(temp)*np.array(rho_halo)*np.array(cp_halo) ; # units J
-    heat_content_tanom          = np.array(temp_chg)*np.array(rho)*np.array(cp) ; # units J
-    #heat_content_tanom          = np.array(temp_chg)*np.array(1020)*np.array(4187) ; # units J - try hard-coded - AR5 numbers
-    heat_content_tsanom         = np.array(temp_chg)*np.array(rho_halo)*np.array(cp_halo) ; # units J
-
-    # Correct all instances of NaN values and fix masks - applied before cdms variables are created otherwise names/ids/attributes are reset
-    temp                        = scrubNaNAndMask(temp,so)
-    temp_chg                    = scrubNaNAndMask(temp_chg,so)
-    rho                         = scrubNaNAndMask(rho,so)
-    cp                          = scrubNaNAndMask(cp,so)
-    rho_halo                    = scrubNaNAndMask(rho_halo,so)
-    cp_halo                     = scrubNaNAndMask(cp_halo,so)
-    rho_thermo                  = scrubNaNAndMask(rho_thermo,so)
-    cp_thermo                   = scrubNaNAndMask(cp_thermo,so)
-    steric_height               = scrubNaNAndMask(steric_height,so)
-    steric_height_anom          = scrubNaNAndMask(steric_height_anom,so)
-    steric_height_thermo_anom   = scrubNaNAndMask(steric_height_thermo_anom,so)
-    steric_height_halo_anom     = scrubNaNAndMask(steric_height_halo_anom,so)
-    steric_height_halo_anom2    = scrubNaNAndMask(steric_height_halo_anom2,so)
-    heat_content                = scrubNaNAndMask(heat_content,so)
-    heat_content_sanom          = scrubNaNAndMask(heat_content_sanom,so)
-    heat_content_tanom          = scrubNaNAndMask(heat_content_tanom,so)
-    heat_content_tsanom         = scrubNaNAndMask(heat_content_tsanom,so)
+    # Convert using python-seawater library (v3.3.1 - 130807) - numpy backend
+    fields = makeStericFields(so,so_chg,temp,temp_chg,pressure_levels,thetao)
+    temp                        = fields['temp']
+    temp_chg                    = fields['temp_chg']
+    rho                         = fields['rho']
+    cp                          = fields['cp']
+    rho_halo                    = fields['rho_halo']
+    cp_halo                     = fields['cp_halo']
+    rho_thermo                  = fields['rho_thermo']
+    cp_thermo                   = fields['cp_thermo']
+    steric_height               = fields['steric_height']
+    steric_height_anom          = fields['steric_height_anom']
+    steric_height_thermo_anom   = fields['steric_height_thermo_anom']
+    steric_height_halo_anom     = fields['steric_height_halo_anom']
+    steric_height_halo_anom2    = fields['steric_height_halo_anom2']
+    heat_content                = fields['heat_content']
+    heat_content_sanom          = fields['heat_content_sanom']
+    heat_content_tanom          = fields['heat_content_tanom']
+    heat_content_tsanom         = fields['heat_content_tsanom']
+    del(fields) ; gc.collect()
 
     # Recreate and redress variables
     so.id                           = 'so_mean'
@@ -442,7 +389,7 @@ def makeSteric(salinity,salinityChg,temp,tempChg,outFileName,thetao,pressure):
     filehandle.seawater_library_version = sw.__version__
     # Write makeSteric version
     makeStericPath = str(makeSteric.__code__).split(' ')[6]
-    makeStericPath = replace(replace(makeStericPath,'"',''),',','') ; # Clean scraped path
+    makeStericPath = makeStericPath.replace('"','').replace(',','') ; # Clean scraped path
     filehandle.makeSteric_version = ' '.join(getGitInfo(makeStericPath)[0:3])
     # Master variables
     filehandle.write(so.astype('float32'))
@@ -479,6 +426,94 @@ def makeSteric(salinity,salinityChg,temp,tempChg,outFileName,thetao,pressure):
     # Cleanup workspace
     del(outFileName) ; gc.collect()
 
+#%%
+def makeStericFields(salinity,salinityChg,temp,tempChg,pressureLevels,thetao=False):
+    """
+    The makeStericFields() function is the numeric core of makeSteric, taking
+    3D (not temporal) numpy or cdms2 arrays and returning density, heat
+    capacity, steric height and heat content fields as numpy masked arrays
+    (masked following salinity). Axis metadata is left to the caller, so no
+    CDAT installation is required
+
+    Author: Paul J. Durack : pauldurack@llnl.gov : @durack1.
+    Created on Sat Oct 18 2026.
+
+    Inputs:
+    ------
+    - salinity(lev,lat,lon) - 3D array for the climatological period.
+    - salinityChg(lev,lat,lon) - 3D array for the temporal change period.
+    - temp(lev,lat,lon) - 3D array for the climatological period either in-situ or potential temperature.
+    - tempChg(lev,lat,lon) - 3D array for the temporal change period as with temp.
+    - pressureLevels(lev,lat,lon) - 3D array of pressure (dbar).
+    - thetao(bool) - boolean value specifying potential temperature arrays provided.
+
+    Usage:
+    ------
+        >>> from oceanLib import makeStericFields
+        >>> fields = makeStericFields(so,soChg,thetao,thetaoChg,pressure,True)
+        >>> fields['steric_height_anom']
+
+    Notes:
+    -----
+    - PJD 18 Oct 2026 - Split from makeSteric so the calculation runs on plain numpy arrays
+    - thetao is not converted to in-situ temperature (see makeSteric notes, 3 May 2014)
+    """
+    so          = np.array(salinity)
+    so_chg      = np.array(salinityChg)
+    temp_chg    = np.array(tempChg) ; # units degrees C
+    temp        = np.array(temp) ; # units degrees C
+    pressure    = np.array(pressureLevels)
+    mask        = np.ma.masked_array(so,mask=np.ma.getmaskarray(salinity))
+
+    # Climatologies - rho,cp,steric_height
+    rho                         = sw.dens(so,temp,pressure) ; # units kg m-3
+    cp                          = sw.cp(so,temp,pressure) ; # units J kg-1 C-1
+    steric_height               = sw.gpan(so,temp,pressure) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+
+    # Halosteric - rho,cp
+    ss                          = so+so_chg
+    rho_halo                    = sw.dens(ss,temp,pressure) ; # units kg m-3
+    cp_halo                     = sw.cp(ss,temp,pressure) ; # units J kg-1 C-1
+    tmp                         = sw.gpan(ss,temp,pressure) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+    steric_height_halo_anom2    = tmp-steric_height ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+
+    # Full steric - steric_height
+    tt                          = temp+temp_chg
+    tmp                         = sw.gpan(ss,tt,pressure) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+    steric_height_anom          = tmp-steric_height ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+    del(ss,tmp) ; gc.collect()
+
+    # Thermosteric - rho,cp,steric_height
+    rho_thermo                  = sw.dens(so,tt,pressure) ; # units kg m-3
+    cp_thermo                   = sw.cp(so,tt,pressure) ; # units J kg-1 C-1
+    tmp                         = sw.gpan(so,tt,pressure) ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+    steric_height_thermo_anom   = tmp-steric_height ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+    del(tt,tmp) ; gc.collect()
+
+    # Halosteric - steric_height
+    steric_height_halo_anom     = steric_height_anom-steric_height_thermo_anom ; # units m3 kg-1 Pa == m2 s-2 == J kg-1 (dynamic decimeter)
+
+    # Create heat content
+    heat_content                = temp*rho*cp ; # units J
+    heat_content_sanom          = temp*rho_halo*cp_halo ; # units J
+    heat_content_tanom          = temp_chg*rho*cp ; # units J
+    #heat_content_tanom          = temp_chg*1020*4187 ; # units J - try hard-coded - AR5 numbers
+    heat_content_tsanom         = temp_chg*rho_halo*cp_halo ; # units J
+
+    # Correct all instances of NaN values and fix masks
+    fields = {'temp': temp,'temp_chg': temp_chg,'rho': rho,'cp': cp,
+              'rho_halo': rho_halo,'cp_halo': cp_halo,'rho_thermo': rho_thermo,'cp_thermo': cp_thermo,
+              'steric_height': steric_height,'steric_height_anom': steric_height_anom,
+              'steric_height_thermo_anom': steric_height_thermo_anom,
+              'steric_height_halo_anom': steric_height_halo_anom,
+              'steric_height_halo_anom2': steric_height_halo_anom2,
+              'heat_content': heat_content,'heat_content_sanom': heat_content_sanom,
+              'heat_content_tanom': heat_content_tanom,'heat_content_tsanom': heat_content_tsanom}
+    for key in fields.keys():
+        fields[key] = scrubNaNAndMask(fields[key],mask)
+
+    return fields
+
 #%%
 ## Heat content - quick plots to check we're on track - all look good
 '''
@@ -709,7 +744,7 @@ def makeHeatContent(salt,temp,destMask,thetao,pressure):
     del(count,data,latcounter,loncounter); gc.collect()
     valid = np.logical_not(tmp1.mask) ; # Get inverted-logic boolean mask from variable
     if valid.size == 1:
-        print '** No valid mask found, skipping **'
+        print('** No valid mask found, skipping **')
         return
     valid = valid.flatten() ; # Flatten 2D to 1D
 
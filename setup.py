@@ -1,15 +1,27 @@
+import os
 from setuptools import setup
 
 # Set package version
 Version='1.1.2'
 
+# Regenerate indexed branch time store from json database if json is newer
+jsonPath = os.path.join('data','CMIP5BranchTimes.json')
+storePath = os.path.join('data','CMIPBranchTimes.bts')
+if not os.path.exists(storePath) or os.path.getmtime(jsonPath) > os.path.getmtime(storePath):
+    try:
+        from durolib.durolib import makeBranchTimeStore
+        makeBranchTimeStore(jsonPath,storePath)
+    except ImportError as err:
+        print('** Unable to regenerate',storePath,'-',err,'**')
+
 # Call setup function - see https://setuptools.readthedocs.io/en/latest/setuptools.html#adding-setup-arguments
 setup(
       name = 'durolib',
       author = 'Paul J. Durack',
       author_email = 'durack1@llnl.gov',
       data_files = [('share/durolib/data',['data/CMIP5BranchTimes.json',
-                                           'data/CMIP5BranchTimes.pickle'])],
+                                           'data/CMIP5BranchTimes.pickle',
+                                           'data/CMIPBranchTimes.bts'])],
       description = 'Python utilities for climate',
       packages = ['durolib'],
       url = 'http://github.com/durack1/durolib',
@@ -0,0 +1,112 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+_source = {'model': {'description': 'test'},
+           'ACCESS1-0': {'historical': {'r1i1p1': {'branch_time_relative': 109207,
+                                                  'branch_time_comp': '0300-1-1 0:0:0.0',
+                                                  'branch_time_gregory': 300.5,
+                                                  'creation_date': '','parent_exp_rip': 'piControl.r1i1p1',
+                                                  'valid': 'Gregory','tracking_id': ''},
+                                       'r2i1p1': {'branch_time_relative': '',
+                                                  'branch_time_comp': '','branch_time_gregory': '',
+                                                  'creation_date': '','parent_exp_rip': '',
+                                                  'valid': '','tracking_id': ''}}}}
+
+@pytest.fixture
+def storePath(tmp_path):
+    jsonPath = tmp_path / 'branch.json'
+    jsonPath.write_text(json.dumps(_source))
+    path = str(tmp_path / 'branch.bts')
+    dd.makeBranchTimeStore(str(jsonPath),path)
+    return path
+
+def test_store_round_trip(storePath):
+    info = dd.cmipBranchTime('ACCESS1-0','historical','r1i1p1',storePath=storePath)['r1i1p1']
+    assert info['branch_time_relative'] == 109207. and isinstance(info['branch_time_relative'],float)
+    assert info['branch_time_gregory'] == 300.5
+    assert info['branch_time_comp'] == '0300-1-1 0:0:0.0'
+    assert info['parent_exp_rip'] == 'piControl.r1i1p1'
+    missing = dd.cmipBranchTime('ACCESS1-0','historical','r2i1p1',storePath=storePath)['r2i1p1']
+    assert missing['branch_time_relative'] == ''
+
+def test_store_historicalNat_alias(storePath):
+    assert dd.cmipBranchTime('ACCESS1-0','historicalNat','r1i1p1',storePath=storePath) is not None
+
+def test_long_names_rejected(storePath):
+    longRip = 'r1i1p1'+'x'*20
+    assert dd.cmipBranchTime('ACCESS1-0','historical',longRip,storePath=storePath) is None
+    bt = dd.cmipBranchTimes(['ACCESS1-0','ACCESS1-0'],'historical',['r1i1p1',longRip],storePath=storePath)
+    assert bt['valid'].tolist() == [True,False]
+    assert bt['rip'][1].decode() == longRip
+
+def test_bulk_matches_single(storePath):
+    bt = dd.cmipBranchTimes(['ACCESS1-0','ACCESS1-0','CCSM4'],'historical',['r1i1p1','r2i1p1','r1i1p1'],
+                            storePath=storePath)
+    assert bt['valid'].tolist() == [True,True,False]
+    assert bt['branch_time_relative'][0] == 109207.
+    assert np.isnan(bt['branch_time_relative'][1])
+
+def test_distributed_store():
+    info = dd.cmipBranchTime('ACCESS1-0','historical','r1i1p1')
+    assert info['r1i1p1']['branch_time_relative'] == 109207.
+
+def test_none_rips_returns_all(storePath):
+    bt = dd.cmipBranchTimes(['ACCESS1-0','CCSM4'],'historical',storePath=storePath)
+    assert [x.decode() for x in bt['rip']] == ['r1i1p1','r2i1p1','']
+    assert bt['valid'].tolist() == [True,True,False]
+    bt = dd.cmipBranchTimes('ACCESS1-0',rips='r1i1p1',experiments=None,storePath=storePath)
+    assert [x.decode() for x in bt['experiment']] == ['historical']
+
+def _writeMember(root,rip,branchTime,creationDate='2019-01-01T00:00:00Z'):
+    netCDF4 = pytest.importorskip('netCDF4')
+    d = root / rip
+    d.mkdir(parents=True,exist_ok=True)
+    f_h = netCDF4.Dataset(str(d / 'tas.nc'),'w',format='NETCDF4')
+    f_h.setncatts({'source_id': 'TEST-1','experiment_id': 'historical','variant_label': rip,
+                   'branch_time_in_parent': branchTime,'branch_time_in_child': 0.,
+                   'parent_experiment_id': 'piControl','parent_variant_label': 'r1i1p1f1',
+                   'creation_date': creationDate})
+    f_h.close()
+    return str(d / 'tas.nc')
+
+def test_update_store_netcdf4_workers(tmp_path):
+    root = tmp_path / 'CMIP6'
+    rips = [''.join(['r',str(i+1),'i1p1f1']) for i in range(8)]
+    for i,rip in enumerate(rips):
+        _writeMember(root,rip,float(i))
+    path = str(tmp_path / 'cmip6.bts')
+    counts = dd.updateBranchTimeStore(str(root),path,workers=4)
+    assert counts == {'scanned': 8,'updated': 8,'removed': 0}
+    bt = dd.cmipBranchTimes(['TEST-1']*8,'historical',rips,storePath=path)
+    assert bt['branch_time_relative'].tolist() == [float(i) for i in range(8)]
+    assert dd.cmipBranchTime('NOT-A-MODEL','historical','r1i1p1f1',storePath=path) is None
+
+def test_update_store_incremental(tmp_path):
+    root = tmp_path / 'CMIP6'
+    _writeMember(root,'r1i1p1f1',1.)
+    _writeMember(root,'r2i1p1f1',2.)
+    removed = _writeMember(root,'r3i1p1f1',3.)
+    path = str(tmp_path / 'cmip6.bts')
+    assert dd.updateBranchTimeStore(str(root),path,workers=2) == {'scanned': 3,'updated': 3,'removed': 0}
+    # Unchanged tree - nothing re-read
+    assert dd.updateBranchTimeStore(str(root),path) == {'scanned': 3,'updated': 0,'removed': 0}
+    changed = _writeMember(root,'r2i1p1f1',20.,'2020-01-01T00:00:00Z')
+    os.utime(changed,(1e9,2e9)) ; # Force an mtime change on coarse-mtime filesystems
+    os.remove(removed)
+    assert dd.updateBranchTimeStore(str(root),path) == {'scanned': 2,'updated': 1,'removed': 1}
+    dd._branchTimeStores.clear() ; # Store rewritten within the mtime resolution
+    bt = dd.cmipBranchTimes(['TEST-1']*3,'historical',['r1i1p1f1','r2i1p1f1','r3i1p1f1'],storePath=path)
+    assert bt['valid'].tolist() == [True,True,False]
+    assert bt['branch_time_relative'][0:2].tolist() == [1.,20.]
+
+def test_update_store_requires_path(tmp_path,monkeypatch):
+    monkeypatch.delenv('DUROLIB_BRANCHTIME_STORE',raising=False)
+    assert dd.updateBranchTimeStore(str(tmp_path)) is None
+    monkeypatch.setenv('DUROLIB_BRANCHTIME_STORE',str(tmp_path / 'env.bts'))
+    assert dd.updateBranchTimeStore(str(tmp_path)) == {'scanned': 0,'updated': 0,'removed': 0}
+    assert os.path.exists(str(tmp_path / 'env.bts'))
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+cftime = pytest.importorskip('cftime')
+
+# (durolib/CF calendar, cftime calendar, cdtime calendar attribute)
+_calendars = [('proleptic_gregorian','proleptic_gregorian','GregorianCalendar'),
+              ('gregorian','standard','MixedCalendar'),
+              ('julian','julian','JulianCalendar'),
+              ('noleap','noleap','NoLeapCalendar'),
+              ('360_day','360_day','Calendar360')]
+_dayValues = np.concatenate((np.arange(0.,60000.,37.25),[-100000.,-40000.5,-1.,59.,60.,365.,366.]))
+
+@pytest.mark.parametrize('calendar,cfCalendar,_',_calendars)
+def test_days_to_days_matches_cftime(calendar,cfCalendar,_):
+    # Day/sub-day conversions agree bit for bit with cftime
+    for units,newUnits in (('days since 1850-1-1','hours since 1500-3-1 6:00'),
+                           ('days since 1850-1-1','days since 1500-3-1'),
+                           ('hours since 1850-1-1 3:00','days since 1800-1-1'),
+                           ('days since 1850-1-1','minutes since 1850-1-1')):
+        dates = cftime.num2date(_dayValues,units,cfCalendar)
+        expected = cftime.date2num(dates,newUnits,cfCalendar)
+        assert np.array_equal(dd.convertRelTime(_dayValues,units,newUnits,calendar),expected)
+
+@pytest.mark.parametrize('calendar,cfCalendar,_',_calendars)
+def test_days_to_months_whole_months(calendar,cfCalendar,_):
+    # Month based output counts whole calendar months, the day is ignored
+    units = 'days since 1850-1-1'
+    dates = cftime.num2date(_dayValues,units,cfCalendar)
+    months = np.array([12*(x.year-1800)+(x.month-3) for x in dates],dtype=np.float64)
+    assert np.array_equal(dd.convertRelTime(_dayValues,units,'months since 1800-3-15',calendar),months)
+    assert np.array_equal(dd.convertRelTime(_dayValues,units,'years since 1800-3-1',calendar),months/12.)
+    assert np.array_equal(dd.convertRelTime(_dayValues,units,'seasons since 1800-3-1',calendar),months/3.)
+
+@pytest.mark.parametrize('calendar,cfCalendar,_',_calendars)
+def test_months_to_days_truncates(calendar,cfCalendar,_):
+    # Month based input is truncated to whole months from the base month
+    values = np.array([0.,1.,1.5,1.99,11.,12.,25.,-1.,-13.])
+    monthIndex = np.trunc(values).astype(int)+(1850*12+1) ; # Zero based months from year 0, base Feb 1850
+    dates = [cftime.datetime(x//12,x % 12+1,1,calendar=cfCalendar) for x in monthIndex]
+    expected = cftime.date2num(dates,'days since 1850-1-1',cfCalendar)
+    assert np.array_equal(dd.convertRelTime(values,'months since 1850-2-1','days since 1850-1-1',calendar),expected)
+
+def test_calendar_names():
+    with pytest.raises(ValueError):
+        dd.convertRelTime([0.],'days since 1850-1-1','days since 1800-1-1','lunar')
+
+@pytest.mark.parametrize('_,__,cdtimeCalendar',_calendars)
+def test_matches_cdtime(_,__,cdtimeCalendar):
+    cdtime = pytest.importorskip('cdtime')
+    calendar = getattr(cdtime,cdtimeCalendar)
+    for units,newUnits in (('days since 1850-1-1','hours since 1500-3-1 6:00'),
+                           ('days since 1850-1-1','months since 1800-3-15'),
+                           ('days since 1850-1-1','years since 1800-1-1'),
+                           ('months since 1850-2-1','days since 1850-1-1'),
+                           ('hours since 1850-1-1','seasons since 1850-1-1')):
+        values = _dayValues if not units.startswith('months') else np.arange(-30.,300.,0.75)
+        expected = [cdtime.reltime(x,units).torel(newUnits,calendar).value for x in values]
+        assert np.array_equal(dd.convertRelTime(values,units,newUnits,calendar),expected)
+
+@pytest.mark.parametrize('calendar,cfCalendar,_',_calendars)
+def test_daysBetween_matches_cftime(calendar,cfCalendar,_):
+    d1 = np.array(['1582-10-04','1850-01-01','1900-02-28','2000-02-28','2015-11-17'])
+    d2 = np.array(['1582-10-15','2015-12-25','1900-03-01','2001-02-28','2015-12-25'])
+    if calendar == '360_day':
+        d2[0] = '1582-10-30'
+    num = lambda dates: cftime.date2num([cftime.datetime(*[int(y) for y in x.split('-')],calendar=cfCalendar)
+                                         for x in dates],'days since 1-1-1',cfCalendar)
+    assert np.array_equal(dd.daysBetween(d1,d2,calendar),np.abs(num(d2)-num(d1)))
+    assert dd.daysBetween(d1[1],d2[1],calendar) == abs(num(d2[1:2])-num(d1[1:2]))[0]
+
+@pytest.mark.parametrize('date,calendar',[('2015-02-30',None),('2015-13-01',None),('2015-00-10',None),
+                                          ('2015-04-31','360_day'),('2016-02-29','noleap'),
+                                          ('1900-02-29','gregorian'),('1582-10-10','gregorian'),
+                                          ('2015-02-31','360_day')])
+def test_daysBetween_out_of_range(date,calendar):
+    with pytest.raises(ValueError):
+        dd.daysBetween(date,'2015-03-01',calendar)
+
+def test_daysBetween_leap_days_per_calendar():
+    assert dd.daysBetween('2015-02-30','2015-03-01','360_day') == 1
+    assert dd.daysBetween('1900-02-29','1900-03-01','julian') == 1
+    assert dd.daysBetween('1500-02-29','1500-03-01','gregorian') == 1
+    assert dd.daysBetween(np.datetime64('2016-02-29'),np.datetime64('2016-03-01')) == 1
+
+def _monthStarts(startYear,nMonths,cfCalendar,monthStart=1):
+    return cftime.date2num([cftime.datetime(startYear+(monthStart-1+i)//12,(monthStart-1+i) % 12+1,1,
+                                            calendar=cfCalendar) for i in range(nMonths+1)],
+                           ''.join(['days since ',str(startYear),'-1-1']),cfCalendar)
+
+@pytest.mark.parametrize('calendar,cfCalendar,_',_calendars)
+def test_makeCalendar_months_matches_cftime(calendar,cfCalendar,_):
+    times,bounds,units = dd.makeCalendar('1999','2002',calendar=calendar,asAxis=False)
+    edges = _monthStarts(1999,47,cfCalendar) ; # Final month (Dec 2002) excluded as before
+    assert units == 'days since 1999-1-1' and len(times) == 47
+    assert np.array_equal(bounds[:,0],edges[0:-1]) and np.array_equal(bounds[:,1],edges[1:])
+    assert np.array_equal(times,bounds.mean(axis=1))
+
+def test_makeCalendar_partial_years_and_days():
+    times,bounds,units = dd.makeCalendar('2000','2001',monthStart=3,monthEnd=5,calendar='noleap',asAxis=False)
+    assert np.array_equal(bounds[:,0],_monthStarts(2000,14,'noleap',monthStart=3)[0:-1])
+    times,bounds,units = dd.makeCalendar('2000','2001',calendarStep='days',calendar='noleap',asAxis=False)
+    assert len(times) == 729 and np.array_equal(bounds[:,1]-bounds[:,0],np.ones(729))
+    times,bounds,units = dd.makeCalendar('2000','2003',calendarStep='years',asAxis=False)
+    assert np.array_equal(bounds.ravel()[0::2],[0.,366.,731.])
+
+def test_calendar_cache_read_only():
+    first = dd.makeCalendar('1850','2014',calendar='360_day',asAxis=False)
+    second = dd.makeCalendar('1850','2014',calendar='360_day',asAxis=False)
+    assert np.array_equal(first[0],second[0]) and not second[0].flags.writeable
+    with pytest.raises(ValueError):
+        second[0].flags.writeable = True
+    dd.setCalendarCache(0)
+    try:
+        uncached = dd.makeCalendar('1850','2014',calendar='360_day',asAxis=False)
+        assert np.array_equal(uncached[1],first[1])
+    finally:
+        dd.setCalendarCache(128)
+
+def test_daysBetween_empty_and_nat():
+    empty = dd.daysBetween(np.array([],dtype=str),np.array([],dtype=str))
+    assert empty.shape == (0,) and empty.dtype == np.int64
+    assert dd.daysBetween(np.array([],dtype='datetime64[D]'),np.array([],dtype='datetime64[D]')).shape == (0,)
+    with pytest.raises(ValueError,match='NaT'):
+        dd.daysBetween(np.array(['2015-01-01','NaT'],dtype='datetime64[D]'),np.datetime64('2015-03-01'))
+    assert dd.daysBetween(np.datetime64('2015-01-01'),np.datetime64('2015-03-01')) == 59
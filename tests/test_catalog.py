@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from durolib import durolib as dd
+
+def _name(model,rip,var='tas'):
+    return ''.join(['CMIP6.CMIP.historical.INST.',model,'.',rip,'.mon.',var,
+                    '.atmos.glb-z1-gn.v20190101.0000000.0.xml'])
+
+@pytest.fixture
+def archive(tmp_path):
+    root = tmp_path / 'CMIP6'
+    names = {}
+    for var in ('tas','pr'):
+        d = root / 'CMIP' / 'historical' / 'atmos' / 'mon' / var
+        d.mkdir(parents=True)
+        names[var] = []
+        for model,rip in (('MODEL-A','r1i1p1f1'),('MODEL-A','r2i1p1f1'),('MODEL-B','r1i1p1f1')):
+            (d / _name(model,rip,var)).write_text('<dataset/>')
+            names[var].append(str(d / _name(model,rip,var)))
+        (d / 'notes.txt').write_text('')
+    return str(root),names
+
+def test_catalog_round_trip(archive,tmp_path):
+    root,names = archive
+    catalogPath = str(tmp_path / 'cmip6.sqlite')
+    assert dd.makeCatalog(root,catalogPath,workers=2) == 6
+    tasDir = os.path.dirname(names['tas'][0])
+    assert dd.globAndTrim(tasDir,catalog=catalogPath) == sorted(names['tas'])
+    assert dd.globAndTrim(tasDir,catalog=catalogPath) == dd.globAndTrim(tasDir)
+    assert dd.globAndTrim(variable='pr',catalog=catalogPath) == sorted(names['pr'])
+    assert dd.globAndTrim(variable='pr',experiment='piControl',catalog=catalogPath) == []
+
+def test_catalog_file_extension_checked(archive,tmp_path):
+    root,names = archive
+    catalogPath = str(tmp_path / 'cmip6.sqlite')
+    dd.makeCatalog(root,catalogPath)
+    with pytest.raises(ValueError):
+        dd.globAndTrim(os.path.dirname(names['tas'][0]),catalog=catalogPath,fileExt='.nc')
@@ -0,0 +1,22 @@
+from durolib import durolib as dd
+
+_cmip5Old = '/a/cmip5.ACCESS1-0.historical.r1i1p1.mo.atm.Amon.tas.ver-1.latestX.xml'
+_cmip6 = '/a/CMIP6.CMIP.historical.NOAA-GFDL.GFDL-CM4.r1i1p1f1.mon.tas.atmos.glb-z1-gr1.v20180301.0000000.0.xml'
+_cmip5 = '/a/CMIP5.CMIP.historical.CSIRO-BOM.ACCESS1-0.r1i1p1.mon.tas.atmos.glb-z1-gu.v20120727.0000000.0.xml'
+
+def test_parseDRS_layouts():
+    rec = dd.parseDRS(_cmip6)
+    assert (rec.mip_era,rec.model,rec.realisation,rec.grid,rec.version) == \
+        ('CMIP6','GFDL-CM4','r1i1p1f1','glb-z1-gr1','v20180301')
+    rec = dd.parseDRS(_cmip5Old)
+    assert (rec.mip_era,rec.table,rec.version,rec.suffix) == ('cmip5','Amon','1','latestX.xml')
+    assert dd.parseDRS('/a/notDRS.nc') is None
+
+def test_truncateVerInfo_keys():
+    assert dd.truncateVerInfo([_cmip5Old],'tas','cmip5')[1:] == \
+        [['ACCESS1-0.historical.r1i1p1.mo.atm.Amon.ver-1'],['ACCESS1-0.historical.r1i1p1.mo.atm.Amon'],
+         ['ACCESS1-0.historical.r1i1p1']]
+    assert dd.truncateVerInfo([_cmip6],'tas','CMIP6')[1:] == \
+        [['GFDL-CM4.historical.r1i1p1f1.mon.atmos.glb-z1-gr1.v20180301'],
+         ['GFDL-CM4.historical.r1i1p1f1.mon.atmos.glb-z1-gr1'],['GFDL-CM4.historical.r1i1p1f1']]
+    assert dd.truncateVerInfo([_cmip5],'tas','CMIP5')[3] == ['ACCESS1-0.historical.r1i1p1']
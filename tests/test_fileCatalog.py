@@ -0,0 +1,59 @@
+import os
+import sys
+import tracemalloc
+
+from durolib import durolib as dd
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','benchmarks'))
+from benchTrimModelList import syntheticListing
+
+_cmip5Old = '/a/cmip5.ACCESS1-0.historical.r1i1p1.mo.atm.Amon.tas.ver-1.latestX.xml'
+_cmip6 = '/b/CMIP6.CMIP.historical.NOAA-GFDL.GFDL-CM4.r1i1p1f1.mon.tas.atmos.glb-z1-gr1.v20180301.0000000.0.xml'
+
+def test_keys_match_truncateVerInfo():
+    fileList = syntheticListing(300)+['/c/notdrs.CMIP6.x.tas.v1.nc']
+    cat = dd.FileCatalog(fileList,'tas','CMIP6')
+    assert cat.asList() == dd.truncateVerInfo(fileList,'tas','CMIP6')
+    cmip5 = dd.FileCatalog([_cmip5Old],'tas','cmip5')
+    assert cmip5.asList() == dd.truncateVerInfo([_cmip5Old],'tas','cmip5')
+
+def test_trimModelList_through_catalog():
+    fileList = syntheticListing(300)[::-1]
+    expected = sorted(dd.trimModelList(list(fileList)))
+    assert sorted(dd.trimModelList(dd.FileCatalog(fileList).paths())) == expected
+
+def test_non_drs_names_without_varId():
+    # Only the extension is dropped, inner dots are kept
+    cat = dd.FileCatalog(['/d/notdrs.nc','/d/some.other.name.xml',_cmip6])
+    assert [x.noVar for x in cat] == ['notdrs','some.other.name',
+                                      'GFDL-CM4.historical.r1i1p1f1.mon.atmos.glb-z1-gr1.v20180301']
+    assert cat[0].path == '/d/notdrs.nc'
+    assert dd.truncateVerInfo(['/d/notdrs.nc'],'tas','CMIP6')[1] == ['notdrs.nc']
+
+def test_row_access_and_filter():
+    fileList = syntheticListing(120)+[_cmip6]
+    cat = dd.FileCatalog(fileList)
+    assert len(cat) == 121
+    assert cat.paths() == fileList
+    assert cat[-1].path == _cmip6 and cat[-1].institution == 'NOAA-GFDL'
+    assert cat[5].realisation == 'r6i1p1f1'
+    sub = cat.filter(model='MODEL-1',realisation=['r1i1p1f1','r3i1p1f1'])
+    assert sub.paths() == [fileList[50],fileList[52]]
+    assert list(cat.column('model')) == [dd.parseDRS(x).model for x in fileList]
+    assert not cat.mask('model','absent').any()
+
+def test_memory_below_list_path():
+    # Categorical codes, no fixed-width string matrix - peak stays below the list keys
+    fileList = syntheticListing(100000)
+    tracemalloc.start()
+    try:
+        dd.FileCatalog(fileList,'tas','CMIP6')
+        catalogPeak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        tracemalloc.clear_traces()
+        listKeys = dd.truncateVerInfo(fileList,'tas','CMIP6')
+        listPeak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del listKeys
+    assert catalogPeak < listPeak
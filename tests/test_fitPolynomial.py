@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+_time = np.arange(1850.,2015.)
+
+def _field(shape=(3,4),seed=0):
+    rng = np.random.RandomState(seed)
+    return rng.normal(size=(len(_time),)+shape)+np.linspace(0.,5.,len(_time))[:,None,None]
+
+@pytest.mark.parametrize('polyOrder',[0,1,3,5])
+def test_matches_polyfit(polyOrder):
+    field = _field()
+    fitted,coefs,residuals = dd.fitPolynomial(field,_time,polyOrder,full=True)
+    expected,expectedResiduals = np.polyfit(_time,field.reshape(len(_time),-1),polyOrder,full=True)[0:2]
+    assert coefs.shape == (polyOrder+1,3,4) and fitted.shape == field.shape
+    assert np.allclose(coefs.reshape(polyOrder+1,-1),expected,rtol=1e-6,atol=1e-12)
+    assert np.allclose(residuals.ravel(),expectedResiduals)
+    assert np.allclose(fitted.reshape(len(_time),-1),
+                       np.array([np.polyval(expected[:,i],_time) for i in range(12)]).T)
+
+def test_shapes_and_errors():
+    assert dd.fitPolynomial(_field()[:,0,0],_time,2).shape == _time.shape
+    assert dd.fitPolynomial(np.ones((len(_time),2,2,2)),_time,1).shape == (len(_time),2,2,2)
+    assert dd.fitPolynomial(_field(),_time,len(_time)) is None
+    assert dd.fitPolynomial(_field(),_time[1:],1) is None
+    assert dd.fitPolynomial(_field(),_time,1.5) is None
+
+def test_masked_points_match_polyfit_of_valid_times():
+    field = _field()
+    mask = np.zeros(field.shape,dtype=bool)
+    mask[0:10,0,0] = True ; mask[50::7,1,2] = True ; mask[:,2,3] = True ; mask[2:,2,2] = True
+    masked = np.ma.masked_array(field,mask=mask)
+    fitted,coefs,residuals = dd.fitPolynomial(masked,_time,2,full=True)
+    for i,j in ((0,0),(1,2),(0,1)):
+        valid = ~mask[:,i,j]
+        expected = np.polyfit(_time[valid],field[valid,i,j],2)
+        assert np.allclose(coefs[:,i,j],expected,rtol=1e-6)
+        assert np.allclose(residuals[i,j],((np.polyval(expected,_time[valid])-field[valid,i,j])**2).sum())
+    # Too few valid times - NaN coefficients and masked fit
+    assert np.isnan(coefs[:,2,3]).all() and np.isnan(coefs[:,2,2]).all() and np.isnan(residuals[2,3])
+    assert fitted.mask[:,2,3].all() and fitted.mask[0:10,0,0].all() and not fitted.mask[10:,0,0].any()
+
+def test_nan_values_excluded():
+    field = _field()
+    nanField = field.copy() ; nanField[4,1,1] = np.nan
+    coefs = dd.fitPolynomial(nanField,_time,1,full=True)[1]
+    valid = np.arange(len(_time)) != 4
+    assert np.allclose(coefs[:,1,1],np.polyfit(_time[valid],field[valid,1,1],1))
@@ -0,0 +1,62 @@
+import tracemalloc
+
+import numpy as np
+
+from durolib import durolib as dd
+
+_time = np.arange(200.)
+
+def _field():
+    rng = np.random.RandomState(0)
+    return (rng.normal(size=(len(_time),6,5))+0.01*_time[:,None,None]).astype(np.float32)
+
+def test_matches_fitPolynomial_in_small_tiles(tmp_path):
+    field = _field()
+    source = np.memmap(str(tmp_path / 'source.dat'),dtype=np.float32,mode='w+',shape=field.shape)
+    source[:] = field ; source.flush()
+    outFitted = np.memmap(str(tmp_path / 'fitted.dat'),dtype=np.float32,mode='w+',shape=field.shape)
+    # maxMemory forces several time blocks and spatial tiles
+    coefs,residuals = dd.fitPolynomialChunked(source,_time,2,outFitted=outFitted,maxMemory=2**14)
+    fitted,expected,expectedResiduals = dd.fitPolynomial(field.astype(np.float64),_time,2,full=True)
+    assert np.allclose(coefs,expected,rtol=1e-5,atol=1e-9)
+    assert np.allclose(residuals,expectedResiduals,rtol=1e-4)
+    assert np.allclose(outFitted,fitted,atol=1e-4)
+
+def test_missing_values():
+    field = _field().astype(np.float64)
+    field[0:50,0,0] = -999. ; field[5,1,1] = np.nan ; field[3:,2,2] = -999.
+    coefs,residuals = dd.fitPolynomialChunked(field,_time,1,missingValue=-999.,maxMemory=2**14)
+    masked = np.ma.masked_invalid(np.ma.masked_equal(field,-999.))
+    expected = dd.fitPolynomial(masked,_time,1,full=True)[1]
+    assert np.allclose(coefs,expected)
+    assert not np.isnan(coefs).any()
+    field[1:,2,2] = -999. ; # polyOrder or fewer valid times
+    coefs = dd.fitPolynomialChunked(field,_time,1,missingValue=-999.)[0]
+    assert np.isnan(coefs[:,2,2]).all()
+
+def test_tiles_span_flattened_points(tmp_path):
+    # A single dimension 1 row exceeds maxMemory, tiles must split the trailing dimensions
+    shape = (100,2,300,360)
+    source = np.memmap(str(tmp_path / 'source.dat'),dtype=np.float32,mode='w+',shape=shape)
+    source[:] = (0.5*np.arange(100.)+3.)[:,None,None,None] ; source.flush()
+    outCoefs = np.memmap(str(tmp_path / 'coefs.dat'),dtype=np.float64,mode='w+',shape=(2,)+shape[1:])
+    maxMemory = 8*2**20
+    tracemalloc.start()
+    try:
+        coefs,residuals = dd.fitPolynomialChunked(source,np.arange(100.),1,outCoefs=outCoefs,maxMemory=maxMemory)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < maxMemory
+    assert np.allclose(coefs[0],0.5) and np.allclose(coefs[1],3.)
+    assert residuals.shape == shape[1:]
+
+def test_solveNormal_singular_points_only(monkeypatch):
+    normal = np.array([np.diag([2.,4.]),[[1.,1.],[1.,1.]],np.diag([1.,8.])])
+    rhs = np.array([[2.,8.],[2.,2.],[3.,16.]])
+    calls = []
+    lstsq = np.linalg.lstsq
+    monkeypatch.setattr(np.linalg,'lstsq',lambda *args,**kwargs: calls.append(1) or lstsq(*args,**kwargs))
+    result = dd._solveNormal(normal,rhs)
+    assert len(calls) == 1
+    assert np.allclose(result,[[1.,2.],[1.,1.],[3.,2.]])
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+# Bare "import durolib" must stay cheap - heavy dependencies are deferred
+importBudget = 0.05 ; # seconds (50 ms target), measured ~5 ms
+
+def _importTime():
+    code = 'import time;t=time.perf_counter();import durolib;print(time.perf_counter()-t)'
+    env = dict(os.environ,PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.check_output([sys.executable,'-c',code],env=env)
+    return float(out.decode().strip())
+
+def test_import_budget():
+    assert min(_importTime() for _ in range(3)) < importBudget
+
+def test_import_defers_heavy_modules():
+    code = 'import sys,durolib;print(sorted(m for m in ("numpy","cdms2","pkg_resources","ssl") if m in sys.modules))'
+    env = dict(os.environ,PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.check_output([sys.executable,'-c',code],env=env)
+    assert out.decode().strip() == '[]'
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+stats = pytest.importorskip('scipy.stats')
+
+_years = np.arange(1950.,2015.)
+
+def _field(seed=0):
+    rng = np.random.RandomState(seed)
+    return 0.02*(_years-1950.)[:,None,None]+rng.normal(size=(len(_years),2,3))
+
+def test_matches_linregress():
+    field = _field()
+    trend = dd.linearTrend(field,time=_years)
+    for i in range(2):
+        for j in range(3):
+            fit = stats.linregress(_years,field[:,i,j])
+            assert np.isclose(trend['slope'][i,j],fit.slope)
+            assert np.isclose(trend['intercept'][i,j],fit.intercept)
+            resid = field[:,i,j]-fit.intercept-fit.slope*_years
+            r1 = (resid[1:]*resid[:-1]).sum()/(resid*resid).sum()
+            neff = min(len(_years)*(1.-r1)/(1.+r1),len(_years))
+            assert np.isclose(trend['r1'][i,j],r1) and np.isclose(trend['neff'][i,j],neff)
+            # linregress standard error with neff-2 rather than n-2 degrees of freedom
+            stderr = fit.stderr*np.sqrt((len(_years)-2.)/(neff-2.))
+            assert np.isclose(trend['stderr'][i,j],stderr)
+            assert np.isclose(trend['pvalue'][i,j],2.*stats.t.sf(abs(fit.slope/stderr),neff-2.))
+
+def test_time_units_per_year():
+    field = _field()[:,0,0]
+    days = dd.convertRelTime(_years-1950.,'years since 1950-1-1','days since 1950-1-1','noleap')+180.
+    trend = dd.linearTrend(field,time=days,units='days since 1950-1-1',calendar='noleap')
+    assert np.isclose(trend['slope'],stats.linregress(_years,field).slope,rtol=1e-6)
+
+def test_masked_and_unfittable_points():
+    field = _field()
+    masked = np.ma.masked_array(field,mask=np.zeros(field.shape,dtype=bool))
+    masked[0:20,0,0] = np.ma.masked ; masked[2:,1,2] = np.ma.masked
+    trend = dd.linearTrend(masked,time=_years)
+    assert np.isclose(trend['slope'][0,0],stats.linregress(_years[20:],field[20:,0,0]).slope)
+    assert all(np.isnan(trend[key][1,2]) for key in trend)
+
+def test_autocorrelated_residuals_keep_fit():
+    # neff <= 2 leaves slope/intercept/r1 as polyfit, only stderr/pvalue are NaN
+    t = np.arange(30.)
+    y = 0.5*t+5*np.cos(2*np.pi*t/30)
+    trend = dd.linearTrend(y,time=t)
+    slope,intercept = np.polyfit(t,y,1)
+    assert np.isclose(trend['slope'],slope) and np.isclose(trend['slope'],0.467,atol=5e-4)
+    assert np.isclose(trend['intercept'],intercept)
+    assert trend['neff'] <= 2. and np.isfinite(trend['r1'])
+    assert np.isnan(trend['stderr']) and np.isnan(trend['pvalue'])
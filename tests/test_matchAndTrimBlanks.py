@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+def _baselineMatchAndTrimBlanks(varList,listFilesList,newVarId):
+    # matchAndTrimBlanks as it was before dictionary indexing (list.index per file)
+    masterVar = varList[0]
+    outSlots = len(varList)+1
+    varMatchList = [[None]*outSlots for i in range(len(listFilesList[0][0]))]
+    for x,modelNoRealm in enumerate(listFilesList[0][3]):
+        varMatchList[x][0] = listFilesList[0][0][x]
+        for y in range(len(varList)):
+            if varList[y] in ['areacella','areacello','basin','deptho','orog','sftlf','sftof','volcello']:
+                masterTest = modelNoRealm.split('.')[0]
+                modTest = [z.split('.')[0] for z in listFilesList[y][3]]
+            else:
+                masterTest = modelNoRealm
+                modTest = listFilesList[y][3]
+            try:
+                varMatchList[x][y] = listFilesList[y][0][modTest.index(masterTest)]
+            except ValueError:
+                pass
+        tmpStr = varMatchList[x][0].split('/')[-1]
+        tmpStr = tmpStr.replace(''.join(['.',masterVar,'.']),''.join(['.',newVarId,'.'])).replace('.latestX.xml','.nc')
+        varMatchList[x][outSlots-1] = tmpStr
+    return varMatchList
+
+def _cmip6(model,rip,var,table='mon',realm='ocean'):
+    return ''.join(['/a/',var,'/CMIP6.CMIP.historical.INST.',model,'.',rip,'.',table,'.',var,'.',realm,
+                    '.glb-z1-gn.v20190101.0000000.0.xml'])
+
+def _cmip5(model,rip,var,table='Omon',realm='ocn'):
+    return ''.join(['/a/',var,'/cmip5.',model,'.historical.',rip,'.mo.',realm,'.',table,'.',var,
+                    '.ver-1.latestX.xml'])
+
+@pytest.mark.parametrize('make,suite',[(_cmip6,'CMIP6'),(_cmip5,'cmip5')])
+def test_matches_baseline(make,suite):
+    models = ['MODEL-%d' % i for i in range(6)]
+    so = [make(m,r,'so') for m in models for r in ('r1i1p1f1','r2i1p1f1')]
+    tos = [make(m,'r1i1p1f1','tos') for m in models[1:]]+[make(models[0],'r2i1p1f1','tos')]
+    tas = [make(m,r,'tas','Amon' if suite == 'cmip5' else 'mon','atmos') for m in models[::2] for r in ('r1i1p1f1',)]
+    fx = [make(m,'r0i0p0f0','areacello','fx') for m in models[2:]]+[make(models[2],'r0i0p0f0','areacello','fx')]
+    varList = ['so','tos','tas','areacello']
+    listFilesList = [dd.truncateVerInfo(files,var,suite) for files,var in zip([so,tos,tas,fx],varList)]
+    expected = _baselineMatchAndTrimBlanks(varList,listFilesList,'soMatch')
+    assert dd.matchAndTrimBlanks(varList,listFilesList,'soMatch') == expected
+    matches = dd.matchAndTrimBlanks(varList,listFilesList,'soMatch',asArray=True)
+    assert matches.dtype.names == ('so','tos','tas','areacello','outFile')
+    assert [list(row) for row in matches.tolist()] == [[x or '' for x in row] for row in expected]
+    assert np.array_equal(matches[matches['areacello'] != '']['so'],
+                          [row[0] for row in expected if row[3] is not None])
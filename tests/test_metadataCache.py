@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+netCDF4 = pytest.importorskip('netCDF4')
+
+@pytest.fixture
+def cacheDir(tmp_path):
+    path = str(tmp_path / 'cache')
+    dd.setMetadataCache(path,maxEntries=1000)
+    yield path
+    dd.setMetadataCache(None)
+
+def _writeFile(path,creationDate,fileFormat='NETCDF4'):
+    f_h = netCDF4.Dataset(str(path),'w',format=fileFormat)
+    f_h.setncatts({'creation_date': creationDate,'realization_index': np.int32(1),
+                   'levels': np.array([1.,2.5]),'title': 'test'})
+    f_h.close()
+    return str(path)
+
+def _rows(cacheDir):
+    import sqlite3
+    conn = sqlite3.connect(os.path.join(cacheDir,'metadata.sqlite'))
+    try:
+        return conn.execute('SELECT count(*) FROM attributes').fetchone()[0]
+    finally:
+        conn.close()
+
+def _assertSame(atts,expected):
+    assert sorted(atts) == sorted(expected)
+    for name,value in expected.items():
+        assert type(atts[name]) is type(value),name
+        assert np.array_equal(np.asarray(atts[name]),np.asarray(value)),name
+        assert np.asarray(atts[name]).dtype == np.asarray(value).dtype,name
+
+@pytest.mark.parametrize('fileFormat',['NETCDF4','NETCDF3_CLASSIC'])
+def test_hit_matches_miss(tmp_path,cacheDir,fileFormat):
+    path = _writeFile(tmp_path / 'a.nc','2018-01-01T00:00:00Z',fileFormat)
+    miss = dd.readGlobalAttributes(path)
+    assert _rows(cacheDir) == 1
+    hit = dd.readGlobalAttributes(path)
+    dd.setMetadataCache(None)
+    direct = dd.readGlobalAttributes(path)
+    _assertSame(miss,direct)
+    _assertSame(hit,direct)
+
+def test_invalidated_on_change(tmp_path,cacheDir):
+    path = _writeFile(tmp_path / 'a.nc','2018-01-01T00:00:00Z')
+    assert dd.readGlobalAttributes(path,['creation_date']) == {'creation_date': '2018-01-01T00:00:00Z'}
+    _writeFile(tmp_path / 'a.nc','2019-01-01T00:00:00Z')
+    os.utime(path,(1e9,2e9)) ; # Force an mtime change on coarse-mtime filesystems
+    assert dd.readGlobalAttributes(path,['creation_date']) == {'creation_date': '2019-01-01T00:00:00Z'}
+    assert _rows(cacheDir) == 1
+
+def test_lru_bound(tmp_path,cacheDir):
+    dd.setMetadataCache(cacheDir,maxEntries=2)
+    paths = [_writeFile(tmp_path / ''.join([str(i),'.nc']),'2018-01-01T00:00:00Z') for i in range(5)]
+    for path in paths:
+        dd.readGlobalAttributes(path)
+        assert _rows(cacheDir) <= 2
+    assert _rows(cacheDir) == 2
@@ -0,0 +1,60 @@
+import numpy as np
+
+from durolib import durolib as dd
+
+_times = np.arange(40,dtype=np.float64)
+_index = np.sin(_times/3.)
+
+def _field():
+    rng = np.random.RandomState(0)
+    coefs = rng.normal(size=(4,6))
+    field = coefs[0]+coefs[1]*_times[:,None]+coefs[2]*_index[:,None]+coefs[3]*(_times*_index)[:,None]
+    return field,coefs
+
+def test_recovers_coefficients():
+    field,coefs = _field()
+    fitCoefs,terms = dd.multiPolyFit(field,[_times,_index],order=2)
+    assert terms[0:3] == [(0,0),(1,0),(0,1)] and len(terms) == 6
+    assert np.allclose(fitCoefs[terms.index((1,1))],coefs[3])
+    assert np.allclose(fitCoefs[terms.index((2,0))],0.,atol=1e-8)
+    noCross,terms = dd.multiPolyFit(field,[_times,_index],order=2,interactions=False)
+    assert (1,1) not in terms and len(terms) == 5
+
+def test_matches_lstsq_and_predictor_layouts():
+    field,_ = _field()
+    field = field+np.random.RandomState(1).normal(size=field.shape)
+    basis = np.column_stack([np.ones_like(_times),_times,_index])
+    expected = np.linalg.lstsq(basis,field,rcond=None)[0]
+    for predictors in ([_times,_index],np.column_stack([_times,_index]),np.vstack([_times,_index])):
+        coefs,_ = dd.multiPolyFit(field,predictors)
+        assert np.allclose(coefs,expected)
+
+def test_missing_predictor_and_values():
+    field,_ = _field()
+    index = _index.copy() ; index[5] = np.nan
+    masked = np.ma.masked_array(field,mask=np.zeros(field.shape,dtype=bool))
+    masked[7,0] = np.ma.masked
+    coefs,terms,fitted,residuals = dd.multiPolyFit(masked,[_times,index],order=2,full=True)
+    clean = dd.multiPolyFit(np.delete(field,[5],axis=0),[np.delete(_times,5),np.delete(index,5)],order=2)[0]
+    assert np.allclose(coefs[:,1:],clean[:,1:])
+    assert fitted.mask[5].all() and fitted.mask[7,0] and not fitted.mask[8].any()
+    assert np.allclose(residuals,0.,atol=1e-12)
+    plain = dd.multiPolyFit(field,[_times,index],full=True)[2]
+    assert np.isnan(plain[5]).all() and np.isfinite(np.delete(plain,5,axis=0)).all()
+
+def test_masked_predictor_is_missing():
+    field,coefs = _field()
+    field = coefs[0]+3.*_index[:,None]
+    index = np.ma.masked_array(np.where(np.arange(len(_index)) == 4,1e20,_index),
+                               mask=np.arange(len(_index)) == 4,fill_value=1e20)
+    for predictors in ([_times,index],np.ma.column_stack([_times,index])):
+        fitCoefs,terms,fitted,_ = dd.multiPolyFit(field,predictors,full=True)
+        assert np.allclose(fitCoefs[terms.index((0,1))],3.)
+        assert np.allclose(fitCoefs[terms.index((1,0))],0.,atol=1e-8)
+        assert np.isnan(fitted[4]).all()
+
+def test_invalid_order():
+    field,_ = _field()
+    assert dd.multiPolyFit(field,[_times,_index],order=-1) is None
+    assert dd.multiPolyFit(field,[_times,_index],order=1.5) is None
+    assert len(dd.multiPolyFit(field,[_times,_index],order=0)[1]) == 1
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+netCDF4 = pytest.importorskip('netCDF4')
+
+_atts = {'creation_date': '2018-03-14T12:00:00Z','institution': 'IPSL (Institut Pierre Simon Laplace)',
+         'branch_time_in_parent': 21915.,'realization_index': np.int32(3),
+         'levels': np.array([1,2,3],dtype=np.int16),'scale': np.float32(0.5),
+         'weights': np.array([0.25,0.75])}
+
+def _writeFile(path,fileFormat):
+    f_h = netCDF4.Dataset(path,'w',format=fileFormat)
+    f_h.createDimension('time',None) ; f_h.createDimension('lat',3)
+    var = f_h.createVariable('tas','f4',('time','lat'))
+    var.units = 'K'
+    f_h.setncatts(_atts)
+    var[0:2] = np.ones((2,3))
+    f_h.close()
+
+def _netcdf4Attributes(path):
+    f_h = netCDF4.Dataset(path)
+    try:
+        return dict((x,f_h.getncattr(x)) for x in f_h.ncattrs())
+    finally:
+        f_h.close()
+
+@pytest.mark.parametrize('fileFormat,magic',[('NETCDF3_CLASSIC',b'CDF\x01'),('NETCDF3_64BIT_OFFSET',b'CDF\x02'),
+                                             ('NETCDF3_64BIT_DATA',b'CDF\x05'),('NETCDF4',b'\x89HDF')])
+def test_netcdf_headers_match_netcdf4(tmp_path,fileFormat,magic):
+    path = str(tmp_path / 'tas.nc')
+    _writeFile(path,fileFormat)
+    with open(path,'rb') as f:
+        assert f.read(4) == magic
+    atts = dd.readGlobalAttributes(path)
+    expected = _netcdf4Attributes(path)
+    assert sorted(atts) == sorted(expected)
+    for name,value in expected.items():
+        assert np.array_equal(np.asarray(atts[name]),np.asarray(value)),name
+    assert dd.readGlobalAttributes(path,['creation_date','missing']) == {'creation_date': _atts['creation_date']}
+
+def test_cdml_header(tmp_path):
+    path = tmp_path / 'tas.xml'
+    path.write_text('\n'.join(['<?xml version="1.0"?>',
+                               '<!DOCTYPE dataset SYSTEM "http://www-pcmdi.llnl.gov/software/cdms/cdml.dtd">',
+                               '<dataset id="CMIP6.tas" cdms_filemap="[[[tas],[[0,12,-,-,-,tas.nc]]]]"',
+                               '   Conventions="CF-1.7" creation_date="2018-03-14T12:00:00Z">',
+                               ' <attr datatype="String" name="institution">IPSL</attr>',
+                               ' <attr datatype="Double" name="branch_time_in_parent">21915.0</attr>',
+                               ' <axis id="time" units="days since 1850-1-1" length="12">[0 1]</axis>',
+                               ' <attr datatype="String" name="notAGlobal">x</attr>',
+                               '</dataset>']))
+    atts = dd.readGlobalAttributes(str(path))
+    assert atts == {'id': 'CMIP6.tas','cdms_filemap': '[[[tas],[[0,12,-,-,-,tas.nc]]]]','Conventions': 'CF-1.7',
+                    'creation_date': '2018-03-14T12:00:00Z','institution': 'IPSL',
+                    'branch_time_in_parent': '21915.0'}
+    assert dd.readGlobalAttributes(str(path),['creation_date']) == {'creation_date': '2018-03-14T12:00:00Z'}
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from durolib import durolib as dd
+
+def _name(model,rip,version='v20190101'):
+    return ''.join(['CMIP6.CMIP.historical.INST.',model,'.',rip,'.mon.tas.atmos.glb-z1-gn.',version,
+                    '.0000000.0.xml'])
+
+def _write(path,creationDate='2019-01-01T00:00:00Z'):
+    with open(path,'w') as f:
+        f.write(''.join(['<?xml version="1.0"?>\n<dataset id="tas" creation_date="',creationDate,
+                         '">\n<axis id="time"/>\n</dataset>\n']))
+    return path
+
+def _touch(dirPath):
+    os.utime(dirPath,(1e9,os.stat(dirPath).st_mtime+10.)) ; # Force an mtime change on coarse-mtime filesystems
+
+@pytest.fixture
+def catalog(tmp_path):
+    root = tmp_path / 'CMIP6'
+    tasDir = root / 'CMIP' / 'historical' / 'atmos' / 'mon' / 'tas'
+    tasDir.mkdir(parents=True)
+    files = [_write(str(tasDir / _name(model,rip))) for model,rip in
+             (('MODEL-A','r1i1p1f1'),('MODEL-A','r2i1p1f1'),('MODEL-B','r1i1p1f1'))]
+    catalogPath = str(tmp_path / 'cmip6.sqlite')
+    dd.makeCatalog(str(root),catalogPath,workers=2)
+    return str(root),str(tasDir),files,catalogPath
+
+def test_refresh_added_and_removed(catalog):
+    root,tasDir,files,catalogPath = catalog
+    os.remove(files[1])
+    newFile = _write(os.path.join(tasDir,_name('MODEL-C','r1i1p1f1')))
+    _touch(tasDir)
+    counts = dd.refreshCatalog(catalogPath)
+    assert counts['added'] == 1 and counts['removed'] == 1
+    assert dd.globAndTrim(tasDir,catalog=catalogPath) == sorted([files[0],files[2],newFile])
+
+def test_refresh_resolves_new_version(catalog):
+    root,tasDir,files,catalogPath = catalog
+    newer = _write(os.path.join(tasDir,_name('MODEL-A','r1i1p1f1','v20200101')),'2020-01-01T00:00:00Z')
+    _touch(tasDir)
+    assert dd.refreshCatalog(catalogPath,workers=2)['groups'] == 1
+    assert dd.globAndTrim(tasDir,catalog=catalogPath) == sorted([newer,files[1],files[2]])
+    # Removing the newer version restores the older one as latest
+    os.remove(newer)
+    _touch(tasDir)
+    dd.refreshCatalog(catalogPath)
+    assert dd.globAndTrim(tasDir,catalog=catalogPath) == sorted(files)
+
+def test_refresh_new_and_removed_directories(catalog):
+    root,tasDir,files,catalogPath = catalog
+    prDir = os.path.join(os.path.dirname(tasDir),'pr')
+    os.mkdir(prDir)
+    prFile = _write(os.path.join(prDir,_name('MODEL-A','r1i1p1f1').replace('.tas.','.pr.')))
+    _touch(os.path.dirname(tasDir))
+    dd.refreshCatalog(catalogPath)
+    assert dd.globAndTrim(variable='pr',catalog=catalogPath) == [prFile]
+    for filePath in files:
+        os.remove(filePath)
+    os.rmdir(tasDir)
+    _touch(os.path.dirname(prDir))
+    assert dd.refreshCatalog(catalogPath)['removed'] == 3
+    assert dd.globAndTrim(variable='tas',catalog=catalogPath) == []
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from durolib import durolib as dd
+
+_units = 'days since 1850-1-1'
+
+@pytest.fixture
+def monthly():
+    # Mid-month noleap times, Jan 1850 to Dec 2020
+    times = dd.convertRelTime(np.arange(171*12,dtype=np.float64),'months since 1850-1-1',_units,'noleap')+14.5
+    return np.arange(times.size),times
+
+@pytest.mark.parametrize('start,end',[('1979','2014'),('1979-1','2014-12'),('1979-1-1','2014-12-31'),
+                                      ('1979-01-01 00:00:00','2014-12-15 12'),
+                                      ('1979-1-15 12:00:00','2014-12-15 12:00:00')])
+def test_end_covers_period(monthly,start,end):
+    data,times = monthly
+    subset = dd.timeSlice(data,start,end,times=times,units=_units,calendar='noleap')
+    assert subset[0] == (1979-1850)*12 and subset[-1] == (2014-1850)*12+11 and subset.size == 36*12
+
+def test_end_excludes_next_period(monthly):
+    data,times = monthly
+    for end in ('2014-11','2014-12-14','2014-12-15 11','2014-12-15 11:59:59'):
+        assert dd.timeSlice(data,'1979',end,times=times,units=_units,calendar='noleap')[-1] == (2014-1850)*12+10
+
+def test_numeric_bounds_inclusive(monthly):
+    data,times = monthly
+    assert dd.timeSlice(data,times[3],times[6],times=times,units=_units,calendar='noleap',asSlice=True) == slice(3,7)
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+
+import pytest
+
+from durolib import durolib as dd
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','benchmarks'))
+from benchTrimModelList import syntheticListing
+
+def test_version_tie_break_numeric():
+    # Published integer versions compare numerically, not as strings
+    assert dd._versionTieBreak([0,1,2],['9','10','2']) == 1
+    assert dd._versionTieBreak([0,1],['v20120101','v20130101']) == 1
+
+def test_trimModelList_unique_keys():
+    fileList = syntheticListing(200)
+    assert sorted(dd.trimModelList(fileList[::-1])) == sorted(fileList)
+
+def _bestTime(fileList,repeats=3):
+    best = None
+    for _ in range(repeats):
+        startTime = time.perf_counter()
+        dd.trimModelList(fileList)
+        elapsed = time.perf_counter()-startTime
+        best = elapsed if best is None else min(best,elapsed)
+    return best
+
+def test_trimModelList_scales_linearly():
+    # 30x more files - quadratic grouping would be ~900x slower
+    small,large = syntheticListing(2000),syntheticListing(60000)
+    assert _bestTime(large) < 150*_bestTime(small)
+
+def test_creation_dates_concurrent(tmp_path):
+    filePaths = []
+    for i in range(12):
+        filePath = tmp_path / ''.join(['f',str(i),'.xml'])
+        filePath.write_text(''.join(['<?xml version="1.0"?>\n<dataset id="tas" creation_date="2018-01-',
+                                     '%02d' % (i+1),'T00:00:00Z">\n<axis id="time"/>\n</dataset>\n']))
+        filePaths.append(str(filePath))
+    expected = [''.join(['2018-01-','%02d' % (i+1),'T00:00:00Z']) for i in range(12)]
+    assert dd._mapWorkers(dd._readCreationDate,filePaths,4) == expected
+
+def test_iterTrimModelList_unsorted_matches_trimModelList(tmp_path):
+    names = [x.split('/')[-1] for x in syntheticListing(20)]
+    older = names[3].replace('v20190101','v20180101')
+    # Interleaved duplicate versions of one member, as os.scandir may return them
+    unsorted = [older]+names[::-1]
+    for name in unsorted:
+        (tmp_path / name).write_text(''.join(['<?xml version="1.0"?>\n<dataset id="tas" creation_date="',
+                                              '2018' if name == older else '2019',
+                                              '-01-01T00:00:00Z">\n<axis id="time"/>\n</dataset>\n']))
+    unsorted = [str(tmp_path / x) for x in unsorted]
+    expected = sorted(unsorted[1:])
+    assert sorted(dd.iterTrimModelList(iter(unsorted))) == expected
+    assert sorted(dd.trimModelList(list(unsorted))) == expected
+
+def test_iterTrimModelList_unsorted_unique():
+    fileList = syntheticListing(120)
+    assert list(dd.iterTrimModelList(iter(fileList[::-1]))) == dd.trimModelList(fileList)
+
+def _writeCdml(path,creationDate):
+    path.write_text(''.join(['<?xml version="1.0"?>\n<dataset id="tas" creation_date="',creationDate,
+                             '">\n<axis id="time"/>\n</dataset>\n']))
+    return str(path)
+
+def test_creation_date_key():
+    assert dd._creationDateKey('2012-07-27T12:34:56Z') == dd._creationDateKey('2012-7-27 12:34:56')
+    assert dd._creationDateKey('2012-07-27T12:34:56Z') < dd._creationDateKey('2012-07-27T12:35:00Z')
+    assert dd._creationDateKey('2012-12-01') < dd._creationDateKey('2013-1-1 0:0:0')
+    assert dd._creationDateKey('unknown') < dd._creationDateKey('1850-01-01')
+
+def test_trimModelList_duplicates(tmp_path):
+    name = syntheticListing(2)[0].split('/')[-1]
+    # Latest creation_date wins over a later version
+    newer = _writeCdml(tmp_path / name.replace('v20190101','v20180101'),'2019-6-1 0:0:0')
+    older = _writeCdml(tmp_path / name,'2019-01-01T00:00:00Z')
+    # Equal creation_dates - published integer version, 10 beats 9
+    other = syntheticListing(2)[1].split('/')[-1]
+    v9 = _writeCdml(tmp_path / other.replace('v20190101','9'),'2019-01-01T00:00:00Z')
+    v10 = _writeCdml(tmp_path / other.replace('v20190101','10'),'2019-01-01T00:00:00Z')
+    for workers in (None,4):
+        assert dd.trimModelList([older,newer,v9,v10],workers=workers) == [newer,v10]
+
+def test_invalid_file_name_contract():
+    fileList = syntheticListing(10)
+    invalid = fileList[4].replace('r5i1p1f1','rXi1p1f1')
+    assert dd.trimModelList(fileList+[invalid]) == ''
+    iterator = dd.iterTrimModelList(iter(fileList+[invalid]))
+    with pytest.raises(ValueError):
+        next(iterator) ; # Directory is validated before any of its files are yielded
+    assert list(dd.iterTrimModelList(iter(fileList))) == dd.trimModelList(list(fileList))
@@ -0,0 +1,24 @@
+import numpy as np
+
+from durolib import durolib as dd
+
+def test_packed_round_trip():
+    data = np.linspace(-2.,30.,1001)
+    packed,scale_factor,add_offset = dd.writePacked(data,None)
+    assert packed.dtype == np.int16
+    assert packed.min() == -2**15 and packed.max() == 2**15-1
+    assert np.isclose(scale_factor,32./(2**16-1))
+    # Rounded packing - error within half a packed level
+    assert np.abs(packed*scale_factor+add_offset-data).max() <= scale_factor/2*1.001
+
+def test_packed_masked_values_filled():
+    data = np.ma.masked_array([0.,1.,2.,1e20],mask=[False,False,False,True])
+    packed,scale_factor,add_offset = dd.writePacked(data,None)
+    assert packed.mask.tolist() == [False,False,False,True]
+    assert packed.data[-1] == -2**15 and packed.fill_value == -2**15
+    assert packed.min() == -2**15+1 and packed.max() == 2**15-1
+    assert np.allclose(packed[:3]*scale_factor+add_offset,[0.,1.,2.],atol=scale_factor)
+
+def test_packed_constant_field():
+    packed,scale_factor,add_offset = dd.writePacked(np.full(4,5.),None)
+    assert packed.tolist() == [0,0,0,0] and add_offset == 5.